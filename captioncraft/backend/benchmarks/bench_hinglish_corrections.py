@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Throughput of Hinglish corrections: original per-word calls vs the compiled engine.
+
+    python benchmarks/bench_hinglish_corrections.py [--words 2000] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hinglish_corrections import get_corrector
+from models import Word
+from test_hinglish_corrections import legacy_correct, make_corpus
+
+
+def make_transcript(word_count: int) -> list:
+    tokens = " ".join(make_corpus(seed=1, sentences=word_count)).split()[:word_count]
+    return [Word(text=t, start=i * 300, end=i * 300 + 250, confidence=0.9) for i, t in enumerate(tokens)]
+
+
+def legacy_pass(words: list):
+    """What process_video did before: one call per word, then the full text."""
+    corrected = [
+        Word(text=legacy_correct(w.text), start=w.start, end=w.end, confidence=w.confidence)
+        for w in words
+    ]
+    text = legacy_correct(" ".join(w.text for w in words))
+    return corrected, text
+
+
+def engine_pass(words: list):
+    corrector = get_corrector()
+    return corrector.correct_words(words), corrector.correct(" ".join(w.text for w in words))
+
+
+def best_of(func, words: list, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(words)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    words = make_transcript(args.words)
+    get_corrector()  # Build outside the timed region, as at steady state
+
+    legacy = best_of(legacy_pass, words, args.repeat)
+    engine = best_of(engine_pass, words, args.repeat)
+
+    print(f"📊 Hinglish corrections, {len(words)} words (best of {args.repeat})")
+    print(f"  Original:  {legacy * 1000:8.2f} ms  {len(words) / legacy:12,.0f} words/s")
+    print(f"  Compiled:  {engine * 1000:8.2f} ms  {len(words) / engine:12,.0f} words/s")
+    print(f"  Speedup:   {legacy / engine:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
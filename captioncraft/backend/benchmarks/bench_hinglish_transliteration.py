@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Uncached per-word Devanagari -> Hinglish conversion: ITRANS round trip vs direct tables.
+
+    python benchmarks/bench_hinglish_transliteration.py [--words 5000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from hinglish_transliterator import _convert_segment_direct, _process_devanagari_segment
+from test_hinglish_cache import zipf_transcript
+from test_hinglish_direct import legacy_hinglish, random_word
+
+
+def make_words(count: int) -> list:
+    """Half common transcript words, half random syllables the direct path handles."""
+    rng = random.Random(18)
+    common = zipf_transcript(words=count // 2, seed=18)
+    generated = []
+    while len(generated) < count - len(common):
+        word = random_word(rng)
+        if _convert_segment_direct(word) is not None:
+            generated.append(word)
+    return common + generated
+
+
+def best_of(func, words: list, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for word in words:
+            func(word)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    words = make_words(args.words)
+    long_words = ["प्रतिनिधित्वकरनेवालोंकेसाथबातचीतकरतेहुए" * n for n in (1, 4, 16)]
+    convert = _process_devanagari_segment.__wrapped__  # Bypass the word cache
+
+    print(f"📊 Devanagari -> Hinglish, {len(words)} words, uncached (best of {args.repeat})")
+    legacy = best_of(legacy_hinglish, words, args.repeat)
+    direct = best_of(convert, words, args.repeat)
+    print(f"  ITRANS:    {legacy * 1000:8.2f} ms  {len(words) / legacy:12,.0f} words/s")
+    print(f"  Direct:    {direct * 1000:8.2f} ms  {len(words) / direct:12,.0f} words/s")
+    print(f"  Speedup:   {legacy / direct:8.1f}x")
+
+    print("\n📏 Long unspaced runs (medial schwa pass)")
+    for word in long_words:
+        legacy = best_of(legacy_hinglish, [word], args.repeat)
+        direct = best_of(convert, [word], args.repeat)
+        print(f"  {len(word):5d} chars: ITRANS {legacy * 1000:8.2f} ms, direct {direct * 1000:7.3f} ms ({legacy / direct:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
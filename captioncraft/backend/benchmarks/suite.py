@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Offline benchmarks for the caption text pipeline, with JSON baselines.
+
+    python benchmarks/suite.py run [--sizes 1m,10m,2h] [--repeat 5] [--save NAME]
+    python benchmarks/suite.py compare BASELINE [CURRENT] [--threshold 0.15]
+
+`run --save NAME` writes benchmarks/baselines/NAME.json. `compare` checks a
+fresh run (or a second saved file) against a baseline and exits 1 if any
+case got slower by more than the threshold. Baselines are only comparable
+on the same machine.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, TextIO
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from hinglish_transliterator import clear_cache, devanagari_to_hinglish, transliterate_batch
+from models import Word
+from sarvam_transcriber import correct_common_hinglish_misspellings
+from subtitles import generate_ass_subtitle, group_words_into_lines, ms_to_ass_time, write_ass_subtitle
+from word_timeline import WordTimeline
+
+BASELINES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+SEED_WORDS_FILE = os.path.join(BACKEND_DIR, "data", "hinglish_seed_words.txt")
+
+SIZES = {"1m": 60, "10m": 600, "2h": 7200}  # Transcript length in seconds
+WORDS_PER_MINUTE = 150  # Conversational Hindi
+MIN_SAMPLE_SECONDS = 0.2  # Fast cases are looped until a sample takes this long
+
+CONSONANTS = "कखगघचछजझटठडढणतथदधनपफबभमयरलवशसह"
+MATRAS = ["", "", "ा", "ि", "ी", "ु", "ू", "े", "ै", "ो", "ौ", "ं", "्"]
+
+
+def make_vocabulary(size: int, rng: random.Random) -> List[str]:
+    """Real frequent words first, then made-up words for the long tail."""
+    with open(SEED_WORDS_FILE, encoding="utf-8") as f:
+        words = [line.split()[0] for line in f if line.strip() and not line.startswith("#")]
+    seen = set(words)
+    while len(words) < size:
+        word = "".join(
+            rng.choice(CONSONANTS) + rng.choice(MATRAS) for _ in range(rng.randint(1, 4))
+        ).rstrip("्")
+        if word not in seen:
+            seen.add(word)
+            words.append(word)
+    return words
+
+
+def make_transcript(seconds: int, seed: int = 0) -> List[Word]:
+    """A synthetic Devanagari transcript with Zipfian vocabulary and word timings."""
+    rng = random.Random(seed)
+    count = seconds * WORDS_PER_MINUTE // 60
+    vocabulary = make_vocabulary(max(200, count // 4), rng)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+
+    words = []
+    step = seconds * 1000 // count
+    for i, text in enumerate(rng.choices(vocabulary, weights=weights, k=count)):
+        if rng.random() < 0.05:
+            text += "।"
+        start = i * step
+        words.append(Word(text=text, start=start, end=start + step - rng.randint(20, 120)))
+    return words
+
+
+def make_cases(seconds: int, devnull: TextIO) -> Dict[str, Callable[[], object]]:
+    """Benchmark name -> zero-argument callable, for one transcript length. Writers write to `devnull`."""
+    words = make_transcript(seconds)
+    texts = [w.text for w in words]
+    full_text = " ".join(texts)
+
+    hinglish = [w.model_copy(update={"text": text}) for w, text in zip(words, transliterate_batch(texts))]
+    hinglish_text = " ".join(w.text for w in hinglish)
+    timeline = WordTimeline.from_words(hinglish)
+    times = [w.start for w in words] + [w.end for w in words]
+
+    def cold(func, *args):
+        # Transliteration is measured with an empty word cache, as for a new vocabulary
+        def run():
+            clear_cache()
+            return func(*args)
+        return run
+
+    return {
+        "ms_to_ass_time": lambda: [ms_to_ass_time(ms) for ms in times],
+        "group_words_into_lines": lambda: group_words_into_lines(hinglish),
+        "generate_ass_subtitle": lambda: generate_ass_subtitle(hinglish),
+        "write_ass_subtitle": lambda: write_ass_subtitle(devnull, hinglish),
+        "group_words_into_lines:timeline": lambda: group_words_into_lines(timeline),
+        "write_ass_subtitle:timeline": lambda: write_ass_subtitle(devnull, timeline),
+        "devanagari_to_hinglish": cold(devanagari_to_hinglish, full_text),
+        "transliterate_batch": cold(transliterate_batch, texts + [full_text]),
+        "correct_common_hinglish_misspellings": lambda: correct_common_hinglish_misspellings(hinglish_text),
+    }
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    """Best seconds per call over `repeat` samples, with GC off as in timeit."""
+    func()  # Warm up (imports, compiled patterns)
+
+    def sample(number: int) -> float:
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+            return time.perf_counter() - started
+        finally:
+            gc.enable()
+
+    number = 1
+    while (elapsed := sample(number)) < MIN_SAMPLE_SECONDS:
+        number *= 2
+    return min([elapsed] + [sample(number) for _ in range(repeat - 1)]) / number
+
+
+def run_suite(sizes: List[str], repeat: int) -> dict:
+    results = {}
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for size in sizes:
+            for name, func in make_cases(SIZES[size], devnull).items():
+                key = f"{name}/{size}"
+                results[key] = {"seconds": measure(func, repeat)}
+                print(f"  {key:48} {format_seconds(results[key]['seconds'])}")
+    clear_cache()
+    return {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float) -> List[str]:
+    """Print a comparison table; return the cases slower than baseline by more than `threshold`."""
+    regressions = []
+    for key, base in baseline["results"].items():
+        now = current["results"].get(key)
+        if now is None:
+            print(f"  ⚪ {key:48} missing from current run")
+            continue
+        ratio = now["seconds"] / base["seconds"]
+        if ratio > 1 + threshold:
+            mark = "🔴"
+            regressions.append(key)
+        elif ratio < 1 - threshold:
+            mark = "🟢"
+        else:
+            mark = "⚪"
+        print(f"  {mark} {key:48} {format_seconds(base['seconds'])} → {format_seconds(now['seconds'])}  {ratio:5.2f}x")
+    return regressions
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def baseline_path(name: str) -> str:
+    """A path as given, or a name under benchmarks/baselines/."""
+    if os.sep in name or name.endswith(".json"):
+        return name
+    return os.path.join(BASELINES_DIR, f"{name}.json")
+
+
+def load_results(name: str) -> dict:
+    with open(baseline_path(name), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(results: dict, name: str) -> str:
+    path = baseline_path(name)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run the benchmarks")
+    compare = commands.add_parser("compare", help="Compare against a baseline")
+    compare.add_argument("baseline", help="Baseline name or JSON path")
+    compare.add_argument("current", nargs="?", help="Saved run to compare (default: run now)")
+    compare.add_argument("--threshold", type=float, default=0.15, help="Allowed slowdown (0.15 = 15%%)")
+    for command in (run, compare):
+        command.add_argument("--sizes", default=",".join(SIZES), help="Transcript lengths to run")
+        command.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--save", metavar="NAME", help="Write results to benchmarks/baselines/NAME.json")
+
+    args = parser.parse_args(argv)
+    sizes = args.sizes.split(",")
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"unknown size(s) {', '.join(unknown)}; choose from {', '.join(SIZES)}")
+
+    if args.command == "run":
+        print(f"📊 Caption text pipeline ({', '.join(sizes)}, best of {args.repeat})")
+        results = run_suite(sizes, args.repeat)
+        if args.save:
+            print(f"💾 Saved {save_results(results, args.save)}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if args.current:
+        current = load_results(args.current)
+    else:
+        print(f"📊 Running ({', '.join(sizes)}, best of {args.repeat})")
+        current = run_suite(sizes, args.repeat)
+        baseline["results"] = {
+            key: value for key, value in baseline["results"].items() if key.rsplit("/", 1)[1] in sizes
+        }
+
+    print(f"\n📈 Against {args.baseline} (threshold {args.threshold:.0%})")
+    regressions = compare_results(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
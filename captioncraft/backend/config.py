@@ -12,9 +12,35 @@ class Settings(BaseSettings):
     
     # AssemblyAI
     assemblyai_api_key: str = ""
+    assemblyai_webhook_url: str = ""  # Public URL of /webhooks/assemblyai; empty = poll only
+    assemblyai_webhook_secret: str = ""  # Sent back by AssemblyAI on webhook calls
+    assemblyai_poll_min_interval: float = 1.0  # Seconds
+    assemblyai_poll_max_interval: float = 30.0  # Seconds; also the poll interval with webhooks
+    assemblyai_expected_rtf: float = 0.15  # Expected processing time / audio duration
+    assemblyai_upload_codec: str = "flac"  # "flac", "opus" or "wav" (upload as extracted)
     
     # Sarvam AI (for Hinglish transcription)
     sarvam_api_key: str = ""
+    sarvam_chunk_seconds: float = 25.0  # Longer audio is split at silences; 0 = one request
+    sarvam_max_concurrency: int = 4  # Chunk requests in flight per job
+    sarvam_chunk_retries: int = 3
+    hinglish_corrections_file: str = ""  # JSON word -> correction table; empty = bundled data file
+    hinglish_cache_size: int = 50000  # Devanagari words kept in the transliteration cache
+    hinglish_seed_words_file: str = ""  # Word frequency list to pre-warm the cache at startup
+    hinglish_processes: int = 0  # Worker processes for bulk transliteration; 0 = in-process
+    hinglish_pool_min_words: int = 20000  # Distinct words needed before using worker processes
+    
+    # Provider HTTP client (shared, pooled keep-alive connections)
+    assemblyai_base_url: str = ""  # Empty = https://api.assemblyai.com/v2
+    sarvam_base_url: str = ""  # Empty = https://api.sarvam.ai
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry: float = 30.0  # Seconds an idle connection stays pooled
+    http2: bool = False  # Needs the h2 package
+    http_connect_timeout: float = 10.0
+    assemblyai_timeout: float = 30.0
+    assemblyai_upload_timeout: float = 300.0
+    sarvam_timeout: float = 300.0
     
     # Anthropic (for Hinglish transliteration)
     anthropic_api_key: str = ""
@@ -25,6 +51,14 @@ class Settings(BaseSettings):
     r2_secret_access_key: str = ""
     r2_bucket_name: str = "captioncraft"
     r2_public_url: str = ""
+    r2_endpoint_url: str = ""  # Empty = https://<account id>.r2.cloudflarestorage.com (set for MinIO etc.)
+    r2_max_pool_connections: int = 32  # Pooled connections of the shared client
+    r2_multipart_threshold_mb: int = 16  # Larger files are transferred in parallel parts
+    r2_part_size_mb: int = 16
+    r2_max_concurrency: int = 8  # Parts in flight per transfer
+    r2_max_attempts: int = 5  # Per request, including the first
+    r2_publish_outputs: bool = True  # Upload finished videos (when R2 is configured); downloads redirect there
+    r2_download_url_expiry: int = 3600  # Seconds a presigned download link stays valid
     
     # Processing
     max_file_size_mb: int = 100
@@ -32,6 +66,34 @@ class Settings(BaseSettings):
     output_dir: str = "output"
     fonts_dir: str = "fonts"
     cleanup_after_hours: int = 24
+    local_output_hot_seconds: int = 900  # Published outputs stay on local disk this long; 0 = delete once uploaded
+    transcript_cache_dir: str = "cache/transcripts"
+    transcript_cache_max_mb: int = 512
+    probe_cache_size: int = 256  # Probed media files (stream info, keyframes) kept in memory
+    
+    # Event loop (blocking calls are offloaded; lag is monitored)
+    io_threads: int = 16  # Threads for file and storage I/O
+    cpu_processes: int = 0  # Worker processes for CPU-bound work; 0 = threads (keeps caches warm)
+    loop_monitor_interval: float = 0.1  # Seconds between lag samples; 0 = monitor off
+    loop_block_threshold: float = 0.25  # Print the stack of anything blocking the loop this long; 0 = off
+    
+    # Provider rate limits (shared by all jobs; 429s are retried, not failed)
+    assemblyai_rate_limit: float = 50.0  # Requests per second
+    assemblyai_burst: int = 100
+    assemblyai_max_in_flight: int = 32
+    sarvam_rate_limit: float = 2.0
+    sarvam_burst: int = 4
+    sarvam_max_in_flight: int = 8
+    provider_max_retries: int = 5
+    
+    # Job scheduling
+    cpu_workers: int = 0  # Concurrent FFmpeg stages; 0 = one per CPU core
+    network_workers: int = 32  # Concurrent transcription waits
+    max_queue_depth: int = 100  # Jobs admitted (running + waiting) before rejecting
+    queue_full_status_code: int = 503  # 429 or 503
+    queue_retry_after_seconds: int = 30
+    parallel_burn_min_duration: float = 120.0  # Seconds; shorter videos burn in one pass
+    parallel_burn_segments: int = 0  # Segments encoded concurrently, at most the CPU worker count; 0 = that count
     
     class Config:
         env_file = ".env"
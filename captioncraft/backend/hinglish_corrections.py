@@ -0,0 +1,78 @@
+"""Hinglish spelling corrections, compiled once and applied in batches."""
+import json
+import os
+import re
+from functools import lru_cache
+from typing import Dict, List
+
+from config import get_settings
+from models import Word
+
+DEFAULT_CORRECTIONS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "hinglish_corrections.json"
+)
+
+# Joins texts for batch correction. No correction key contains it and it is
+# not a word character, so matches never span two texts and \b behaves as at
+# the start/end of each text.
+BATCH_SEPARATOR = "\x00"
+
+
+def load_corrections(path: str = DEFAULT_CORRECTIONS_FILE) -> Dict[str, str]:
+    """
+    Load a correction table: a JSON object of lowercase word -> replacement.
+
+    Key order matters. Keys are tried in file order, so when one key is a
+    prefix of another (e.g. "baad" and "baad mein") the earlier one wins.
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class HinglishCorrector:
+    """Whole-word, case-insensitive corrections that keep the original casing."""
+
+    def __init__(self, corrections: Dict[str, str]):
+        self.corrections = corrections
+        self.pattern = re.compile(
+            r'\b(' + '|'.join(re.escape(k) for k in corrections) + r')\b',
+            re.IGNORECASE,
+        )
+
+    def _replace(self, match: re.Match) -> str:
+        word = match.group(0)
+        corrected = self.corrections.get(word.lower())
+        if corrected is None:
+            return word
+        # Preserve original case pattern
+        if word.isupper():
+            return corrected.upper()
+        elif word[0].isupper():
+            return corrected.capitalize()
+        return corrected
+
+    def correct(self, text: str) -> str:
+        return self.pattern.sub(self._replace, text)
+
+    def correct_texts(self, texts: List[str]) -> List[str]:
+        """Correct many texts with one scan; same result as correcting each on its own."""
+        if not texts:
+            return []
+        if any(BATCH_SEPARATOR in text for text in texts):
+            return [self.correct(text) for text in texts]
+        return self.correct(BATCH_SEPARATOR.join(texts)).split(BATCH_SEPARATOR)
+
+    def correct_words(self, words: List[Word]) -> List[Word]:
+        """Correct the text of every word, keeping timings."""
+        texts = self.correct_texts([word.text for word in words])
+        return [
+            word if text == word.text else word.model_copy(update={"text": text})
+            for word, text in zip(words, texts)
+        ]
+
+
+@lru_cache()
+def get_corrector() -> HinglishCorrector:
+    """The shared corrector, built from `hinglish_corrections_file` (or the bundled table)."""
+    path = get_settings().hinglish_corrections_file or DEFAULT_CORRECTIONS_FILE
+    return HinglishCorrector(load_corrections(path))
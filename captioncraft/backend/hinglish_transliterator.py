@@ -1,8 +1,9 @@
 """
 Permanent Hinglish Transliteration: Devanagari → Natural WhatsApp-style Roman Hindi.
 
-Uses indic-transliteration library (ITRANS scheme) as base, then applies
-Hindi phonological rules to produce output matching how Indians type on WhatsApp.
+Maps Devanagari codepoints through lookup tables (falling back to the
+indic-transliteration ITRANS scheme for rare ones), then applies Hindi
+phonological rules to produce output matching how Indians type on WhatsApp.
 
 Key insight: ITRANS uses uppercase for long vowels (A=आ, I=ई, U=ऊ) and 
 lowercase 'a' for schwa. We use markers to distinguish them, apply schwa 
@@ -10,10 +11,14 @@ deletion only on true schwas, then convert markers to casual vowels.
 """
 
 import re
-from typing import List
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
 from indic_transliteration import sanscript
 from indic_transliteration.sanscript import transliterate as _transliterate
 
+from config import get_settings
+
 
 def is_devanagari(text: str) -> bool:
     return bool(re.search(r'[\u0900-\u097F]', text))
@@ -68,47 +73,65 @@ def _process_itrans_word(w: str) -> str:
     for c in 'TDNKG':
         w = w.replace(c, c.lower())
     
+    return _casual_word(w) + punct
+
+
+_CONSONANT_LETTERS = frozenset('bcdfghjklmnpqrstvwxyz')
+_VOWEL_LETTERS = frozenset('aeiou§£¥')
+
+
+def _delete_medial_schwas(w: str) -> str:
+    """
+    Delete 'a' between consonants C₁aC₂ when a vowel comes before C₁ and after C₂.
+    
+    This prevents "chalo" → "chlo" but allows "chalate" → "chalte". One
+    left-to-right pass: a deleted 'a' still counts as a prior vowel, and
+    deleting never creates a new C₁aC₂V match, so a second pass finds nothing.
+    """
+    out = []
+    seen_vowel = False
+    n = len(w)
+    i = 0
+    while i < n:
+        c = w[i]
+        out.append(c)
+        if (seen_vowel and c in _CONSONANT_LETTERS and i + 3 < n and w[i + 1] == 'a'
+                and w[i + 2] in _CONSONANT_LETTERS and w[i + 3] in _VOWEL_LETTERS):
+            i += 2  # skip the schwa
+            continue
+        if c in _VOWEL_LETTERS:
+            seen_vowel = True
+        i += 1
+    return ''.join(out)
+
+
+_OVERRIDES = {
+    'yeh': 'yeh', 'yah': 'yeh',
+    'woh': 'woh', 'vah': 'woh', 'voh': 'woh',
+    'ham': 'hum', 'hum': 'hum',
+    'nahi': 'nahi', 'nahin': 'nahi',
+    'theek': 'theek', 'thik': 'theek',
+    'accha': 'accha', 'acchi': 'acchi',
+    'party': 'party', 'parti': 'party', 'paarti': 'party',
+    'film': 'film',
+    'bhai': 'bhai', 'bhaai': 'bhai',
+    'men': 'mein',
+    'dhanyvad': 'dhanyavaad', 'dhnyvad': 'dhanyavaad',
+    'to': 'toh',
+}
+
+
+def _casual_word(w: str) -> str:
+    """Steps 3-7 on a word with long vowels marked (§£¥) and consonants romanised."""
     # ── 3. Schwa deletion ──
     # Only delete lowercase 'a' (schwa), never markers (§£¥)
     
-    consonants = set('bcdfghjklmnpqrstvwxyz')
-    vowels_all = set('aeiou§£¥')
-    
     # 3a. Word-final schwa
-    if len(w) > 1 and w[-1] == 'a' and w[-2] in consonants:
+    if len(w) > 1 and w[-1] == 'a' and w[-2] in _CONSONANT_LETTERS:
         w = w[:-1]
     
     # 3b. Medial schwa deletion
-    # Rule: delete 'a' between consonants C₁aC₂ when:
-    #   - There's already a vowel before C₁ (not first syllable)
-    #   - Followed by a vowel sound (next syllable exists)
-    # This prevents "chalo" → "chlo" but allows "chalate" → "chalte"
-    
-    changed = True
-    while changed:
-        changed = False
-        chars = list(w)
-        new = []
-        i = 0
-        while i < len(chars):
-            if (chars[i] in consonants and
-                i + 1 < len(chars) and chars[i+1] == 'a' and
-                i + 2 < len(chars) and chars[i+2] in consonants and
-                i + 3 < len(chars) and chars[i+3] in vowels_all):
-                # Check: is there already a vowel before this position?
-                preceding = ''.join(chars[:i])
-                has_prior_vowel = any(c in vowels_all for c in preceding)
-                if has_prior_vowel:
-                    new.append(chars[i])
-                    i += 2  # skip the schwa
-                    changed = True
-                else:
-                    new.append(chars[i])
-                    i += 1
-            else:
-                new.append(chars[i])
-                i += 1
-        w = ''.join(new)
+    w = _delete_medial_schwas(w)
     
     # ── 4. Convert markers to casual Hinglish vowels ──
     
@@ -156,33 +179,115 @@ def _process_itrans_word(w: str) -> str:
         w = w[:-2] + 'iye'
     
     # ── 7. Word override dictionary ──
-    overrides = {
-        'yeh': 'yeh', 'yah': 'yeh',
-        'woh': 'woh', 'vah': 'woh', 'voh': 'woh',
-        'ham': 'hum', 'hum': 'hum',
-        'nahi': 'nahi', 'nahin': 'nahi',
-        'theek': 'theek', 'thik': 'theek',
-        'accha': 'accha', 'acchi': 'acchi',
-        'party': 'party', 'parti': 'party', 'paarti': 'party',
-        'film': 'film',
-        'bhai': 'bhai', 'bhaai': 'bhai',
-        'men': 'mein',
-        'dhanyvad': 'dhanyavaad', 'dhnyvad': 'dhanyavaad',
-        'to': 'toh',
-    }
-    w_lower = w.lower()
-    if w_lower in overrides:
-        w = overrides[w_lower]
-    
-    return w + punct
+    return _OVERRIDES.get(w.lower(), w)
 
 
+# Segments are runs of Devanagari with no spaces, i.e. single words. Transcript
+# vocabulary is Zipfian ("hai", "ki", "mein", "ke"...), so a bounded per-word
+# cache answers most lookups.
+@lru_cache(maxsize=get_settings().hinglish_cache_size)
 def _process_devanagari_segment(text: str) -> str:
+    direct = _convert_segment_direct(text)
+    if direct is not None:
+        return direct
+    return _process_itrans_segment(text)
+
+
+def _process_itrans_segment(text: str) -> str:
+    """Reference path: Devanagari → ITRANS → casual Hinglish."""
     itrans = _transliterate(text, sanscript.DEVANAGARI, sanscript.ITRANS)
     words = itrans.split()
     return ' '.join(_process_itrans_word(w) for w in words)
 
 
+# ── Direct conversion tables ──
+# Each entry is what the ITRANS path holds after steps 1-2 (long vowels as
+# §£¥, ITRANS capitals and dots already rewritten), so both paths share
+# steps 3-7. Codepoints missing here (ळ, ॐ, ऽ, vocalic L, ॅ/ॉ, Vedic
+# signs...) are rare in transcripts and go through the ITRANS path.
+
+_CONSONANTS = {
+    'क': 'k', 'ख': 'kh', 'ग': 'g', 'घ': 'gh', 'ङ': 'n',
+    'च': 'ch', 'छ': 'chh', 'ज': 'j', 'झ': 'jh', 'ञ': '~n',
+    'ट': 't', 'ठ': 'th', 'ड': 'd', 'ढ': 'dh', 'ण': 'n',
+    'त': 't', 'थ': 'th', 'द': 'd', 'ध': 'dh', 'न': 'n',
+    'प': 'p', 'फ': 'ph', 'ब': 'b', 'भ': 'bh', 'म': 'm',
+    'य': 'y', 'र': 'r', 'ल': 'l', 'व': 'v', 'ऴ': 'zh',
+    'श': 'sh', 'ष': 'sh', 'स': 's', 'ह': 'h',
+    # Precomposed nukta forms
+    '\u0958': 'q', '\u0959': 'k', '\u095a': 'g', '\u095b': 'z', '\u095c': 'd', '\u095e': 'f',
+}
+
+# Consonant + combining nukta (़)
+_NUKTA_CONSONANTS = {'क': 'q', 'ख': 'k', 'ग': 'g', 'ज': 'z', 'ड': 'd', 'ढ': 'dh', 'फ': 'f'}
+
+_VOWELS = {
+    'अ': 'a', 'आ': '§', 'इ': 'i', 'ई': '£', 'उ': 'u', 'ऊ': '¥', 'ऋ': 'ri',
+    'ए': 'e', 'ऐ': 'ai', 'ओ': 'o', 'औ': 'au',
+}
+
+_MATRAS = {
+    'ा': '§', 'ि': 'i', 'ी': '£', 'ु': 'u', 'ू': '¥', 'ृ': 'ri',
+    'े': 'e', 'ै': 'ai', 'ो': 'o', 'ौ': 'au',
+}
+
+_SIGNS = {'ँ': 'n', 'ः': 'h', **{chr(0x966 + d): str(d) for d in range(10)}}
+
+_NUKTA = '\u093c'
+_VIRAMA = '\u094d'
+_ANUSVARA = 'ं'
+_LABIALS = frozenset('पफबभम')  # Anusvara before these is 'm'
+_DANDAS = {'।': '|', '॥': '||'}
+
+
+def _convert_segment_direct(text: str) -> Optional[str]:
+    """
+    Convert one Devanagari segment in a single pass over its codepoints.
+    
+    Returns None for anything outside the tables (unknown codepoints, a
+    matra or nukta with no consonant, a danda mid-word) so the caller can
+    fall back to the ITRANS path; otherwise the result is the same.
+    """
+    punct = ''
+    while text and text[-1] in _DANDAS:
+        punct = _DANDAS[text[-1]] + punct
+        text = text[:-1]
+    if not text:
+        return punct
+    
+    out = []
+    n = len(text)
+    i = 0
+    while i < n:
+        c = text[i]
+        i += 1
+        base = _CONSONANTS.get(c)
+        if base is not None:
+            if i < n and text[i] == _NUKTA:
+                base = _NUKTA_CONSONANTS.get(c)
+                if base is None:
+                    return None
+                i += 1
+            if i < n and text[i] == _VIRAMA:
+                out.append(base)
+                i += 1
+            elif i < n and text[i] in _MATRAS:
+                out.append(base + _MATRAS[text[i]])
+                i += 1
+            else:
+                out.append(base + 'a')
+        elif c in _VOWELS:
+            out.append(_VOWELS[c])
+        elif c == _ANUSVARA:
+            labial = i < n and text[i] in _LABIALS and text[i:i + 2] != 'फ' + _NUKTA
+            out.append('m' if labial else 'n')
+        elif c in _SIGNS:
+            out.append(_SIGNS[c])
+        else:
+            return None
+    return _casual_word(''.join(out)) + punct
+
+
 def devanagari_to_hinglish(text: str) -> str:
     """Convert Devanagari (or mixed) text to natural Hinglish."""
     if not text or not text.strip():
@@ -202,11 +307,105 @@ def devanagari_to_hinglish(text: str) -> str:
     return ''.join(parts)
 
 
+_SEGMENT_PATTERN = re.compile(r'[\u0900-\u097F\u0964\u0965]+')
+
+# Unique words per task sent to a worker process
+POOL_CHUNK_SIZE = 2000
+
+
+def _convert_words(segments: List[str]) -> List[str]:
+    return [_process_devanagari_segment(seg) for seg in segments]
+
+
+def _convert_unique(segments: List[str], processes: int) -> Dict[str, str]:
+    if processes > 1 and len(segments) >= get_settings().hinglish_pool_min_words:
+        chunks = [segments[i:i + POOL_CHUNK_SIZE] for i in range(0, len(segments), POOL_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=min(processes, len(chunks))) as pool:
+            converted = [word for chunk in pool.map(_convert_words, chunks) for word in chunk]
+    else:
+        converted = _convert_words(segments)
+    return dict(zip(segments, converted))
+
+
+def transliterate_batch(texts: List[str], processes: Optional[int] = None) -> List[str]:
+    """
+    Convert many texts, transliterating each distinct Devanagari word once.
+    
+    Same output as devanagari_to_hinglish on each text. Pass a transcript's
+    words and its full text together so shared words are only converted
+    once. With `processes` > 1 (default: `hinglish_processes` setting) and at
+    least `hinglish_pool_min_words` distinct words, the words are converted
+    across a process pool; worker results skip this process's cache.
+    """
+    if processes is None:
+        processes = get_settings().hinglish_processes
+    
+    unique = {}
+    for text in texts:
+        if text:
+            unique.update(dict.fromkeys(_SEGMENT_PATTERN.findall(text)))
+    if not unique:
+        return list(texts)
+    
+    converted = _convert_unique(list(unique), processes)
+    return [
+        _SEGMENT_PATTERN.sub(lambda m: converted[m.group(0)], text) if text else text
+        for text in texts
+    ]
+
+
+# Hits/misses to exclude from stats (lookups made while seeding)
+_stats_baseline = (0, 0)
+
+
+def clear_cache():
+    """Empty the per-word cache and reset its statistics."""
+    global _stats_baseline
+    _process_devanagari_segment.cache_clear()
+    _stats_baseline = (0, 0)
+
+
+def cache_stats() -> dict:
+    info = _process_devanagari_segment.cache_info()
+    hits = info.hits - _stats_baseline[0]
+    misses = info.misses - _stats_baseline[1]
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
+
+
+def seed_cache(path: str, limit: Optional[int] = None) -> int:
+    """
+    Pre-warm the cache from a word frequency list, most frequent first.
+    
+    One word per line, optionally followed by whitespace and a count; blank
+    lines and lines starting with # are skipped. Statistics are reset
+    afterwards so the hit rate reflects real traffic. Returns words seeded.
+    """
+    global _stats_baseline
+    limit = limit or _process_devanagari_segment.cache_info().maxsize
+    
+    with open(path, encoding="utf-8") as f:
+        words = (line.split()[0] for line in f if line.strip() and not line.startswith("#"))
+        top = [w for w in words if is_devanagari(w)][:limit]
+    
+    # Seed least frequent first so the most frequent words end up most recent
+    for word in reversed(top):
+        devanagari_to_hinglish(word)
+    
+    info = _process_devanagari_segment.cache_info()
+    _stats_baseline = (info.hits, info.misses)
+    return len(top)
+
+
 # Backward compat
-transliterate_batch = lambda texts: [devanagari_to_hinglish(t) for t in texts]
 transliterate_with_llm = devanagari_to_hinglish
 transliterate_char_by_char = devanagari_to_hinglish
-def clear_cache(): pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+"""Process-wide pooled HTTP client for transcription providers."""
+import asyncio
+from typing import Optional
+
+import httpx
+
+from config import get_settings
+
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_client() -> httpx.AsyncClient:
+    settings = get_settings()
+
+    http2 = settings.http2 and HTTP2_AVAILABLE
+    if settings.http2 and not HTTP2_AVAILABLE:
+        print("⚠️ HTTP2 enabled but the h2 package is not installed; using HTTP/1.1")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(30.0),
+    )
+
+
+async def startup():
+    """Create the shared client. Called from the app startup hook."""
+    global _client, _client_loop
+    if _client is None:
+        _client = _create_client()
+        _client_loop = asyncio.get_running_loop()
+
+
+async def shutdown():
+    """Close the shared client and its pooled connections."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared client, so provider calls reuse pooled keep-alive connections.
+
+    Outside the app (scripts, tests) the client is created on first use. Pooled
+    connections belong to one event loop, so a new loop gets a new client.
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+
+    if _client is None or _client_loop is not loop:
+        _client = _create_client()
+        _client_loop = loop
+
+    return _client
+
+
+def provider_timeout(provider: str, upload: bool = False) -> httpx.Timeout:
+    """Per-provider request timeout; uploads get the longer budget."""
+    settings = get_settings()
+
+    if provider == "assemblyai":
+        seconds = settings.assemblyai_upload_timeout if upload else settings.assemblyai_timeout
+    elif provider == "sarvam":
+        seconds = settings.sarvam_timeout
+    else:
+        seconds = 30.0
+
+    return httpx.Timeout(seconds, connect=settings.http_connect_timeout)
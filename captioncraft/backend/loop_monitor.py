@@ -0,0 +1,118 @@
+"""Event-loop lag monitor: scheduling delay percentiles and stacks of blocking callbacks."""
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional
+
+from config import get_settings
+
+
+class LoopMonitor:
+    """
+    Measures how late the event loop runs a timer, and catches what blocks it.
+
+    A sampler task sleeps `interval` seconds at a time and records how much
+    later than asked it woke up: the scheduling delay every other callback
+    (e.g. a /status request) sees. A watchdog thread notices when the
+    sampler hasn't run for `block_threshold` seconds and prints the event
+    loop thread's stack while it is still blocked, naming the culprit.
+    """
+
+    def __init__(self, interval: float, block_threshold: float, window: int = 1000):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.blocks = 0
+        self.last_block: Optional[dict] = None
+        self._lags: deque = deque(maxlen=window)  # Seconds, most recent samples
+        self._heartbeat = time.monotonic()
+        self._reported_heartbeat: Optional[float] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start sampling on the running loop (and the watchdog, if a threshold is set)."""
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        if self.block_threshold > 0:
+            self._stop.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    async def _sample(self):
+        while True:
+            started = time.monotonic()
+            self._heartbeat = started
+            await asyncio.sleep(self.interval)
+            self._lags.append(max(time.monotonic() - started - self.interval, 0.0))
+
+    def _watch(self):
+        while not self._stop.wait(min(self.interval, self.block_threshold) / 2):
+            heartbeat = self._heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            # One report per stall
+            if blocked < self.block_threshold or heartbeat == self._reported_heartbeat:
+                continue
+            self._reported_heartbeat = heartbeat
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.format_stack(frame) if frame is not None else []
+            self.blocks += 1
+            self.last_block = {"blocked_ms": round(blocked * 1000, 1), "stack": stack}
+            print(f"🐢 Event loop blocked for over {blocked * 1000:.0f}ms, in:\n{''.join(stack[-8:])}")
+
+    def percentile(self, q: float) -> float:
+        """Scheduling delay (seconds) at quantile `q` of the recent samples."""
+        lags = sorted(self._lags)
+        if not lags:
+            return 0.0
+        return lags[min(int(q * len(lags)), len(lags) - 1)]
+
+    def stats(self) -> dict:
+        return {
+            "samples": len(self._lags),
+            "p50_ms": round(self.percentile(0.5) * 1000, 2),
+            "p99_ms": round(self.percentile(0.99) * 1000, 2),
+            "max_ms": round(max(self._lags, default=0.0) * 1000, 2),
+            "blocks": self.blocks,
+            "last_block_stack": self.last_block["stack"][-8:] if self.last_block else [],
+        }
+
+
+_monitor: Optional[LoopMonitor] = None
+
+
+async def start():
+    """Start monitoring the running loop. Called from the app startup hook."""
+    global _monitor
+    settings = get_settings()
+    if _monitor is None and settings.loop_monitor_interval > 0:
+        _monitor = LoopMonitor(settings.loop_monitor_interval, settings.loop_block_threshold)
+        _monitor.start()
+
+
+async def stop():
+    global _monitor
+    if _monitor is not None:
+        await _monitor.stop()
+    _monitor = None
+
+
+def stats() -> Optional[dict]:
+    """Lag percentiles and blocking reports, or None when the monitor is off."""
+    return _monitor.stats() if _monitor else None
@@ -2,23 +2,43 @@
 import os
 import uuid
 import asyncio
+import secrets
 import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
 
 from config import get_settings
 from models import (
-    ProcessRequest, ProcessResponse, UploadResponse, JobStatus,
+    ProcessRequest, ProcessResponse, UploadResponse, JobStatus, RestyleRequest,
+    UploadSessionCreate, UploadSessionStatus,
     CaptionStyle, FontFamily, CaptionPosition, ProcessingStatus
 )
-from processor import process_video, create_job, get_job, update_job_status
+from processor import (
+    process_video, restyle_video, create_job, get_job, get_job_artifacts,
+    update_job_status, get_scheduler, subscribe_job, unsubscribe_job, get_download_name, OUTPUT_MEDIA_TYPES,
+)
 from subtitles import AVAILABLE_STYLES
+from transcript_cache import get_transcript_cache
+from media_probe import get_media_probe
+from offload import run_io
+from provider_governor import governor_stats
+from transcriber import WEBHOOK_AUTH_HEADER, notify_transcript
+import http_clients
+import loop_monitor
+import offload
 import storage
+import uploads
+
+# Needs indic-transliteration; only used for cache warm-up and stats here
+try:
+    import hinglish_transliterator
+except ImportError:
+    hinglish_transliterator = None
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -38,6 +58,8 @@ app.add_middleware(
 
 settings = get_settings()
 
+ALLOWED_VIDEO_TYPES = ["video/mp4", "video/quicktime", "video/x-msvideo", "video/x-matroska", "video/webm"]
+
 # Ensure directories exist
 os.makedirs(settings.temp_dir, exist_ok=True)
 os.makedirs(settings.output_dir, exist_ok=True)
@@ -66,6 +88,13 @@ async def health_check():
             "temp_dir": os.path.isdir(settings.temp_dir),
             "output_dir": os.path.isdir(settings.output_dir),
         },
+        "scheduler": get_scheduler().stats(),
+        "transcript_cache": get_transcript_cache().stats(),
+        "media_probe": get_media_probe().stats(),
+        "providers": governor_stats(),
+        "transliteration_cache": hinglish_transliterator.cache_stats() if hinglish_transliterator else None,
+        "event_loop": loop_monitor.stats(),
+        "offload": offload.stats(),
         "timestamp": datetime.utcnow().isoformat(),
     }
 
@@ -89,11 +118,17 @@ async def upload_video(file: UploadFile = File(...)):
     Supported formats: MP4, MOV, AVI, MKV, WebM
     """
     # Validate file type
-    allowed_types = ["video/mp4", "video/quicktime", "video/x-msvideo", "video/x-matroska", "video/webm"]
-    if file.content_type not in allowed_types:
+    if file.content_type not in ALLOWED_VIDEO_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_VIDEO_TYPES)}"
+        )
+    
+    max_bytes = settings.max_file_size_mb * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_types)}"
+            detail=f"File too large. Max size: {settings.max_file_size_mb}MB"
         )
     
     # Generate unique video ID
@@ -106,31 +141,116 @@ async def upload_video(file: UploadFile = File(...)):
     
     try:
         # Read file in chunks to handle large files
-        with open(file_path, "wb") as buffer:
+        written = 0
+        buffer = await run_io(open, file_path, "wb")
+        try:
             while chunk := await file.read(1024 * 1024):  # 1MB chunks
-                buffer.write(chunk)
+                written += len(chunk)
                 
                 # Check file size limit
-                if os.path.getsize(file_path) > settings.max_file_size_mb * 1024 * 1024:
-                    os.remove(file_path)
+                if written > max_bytes:
                     raise HTTPException(
                         status_code=400,
                         detail=f"File too large. Max size: {settings.max_file_size_mb}MB"
                     )
+                
+                await run_io(buffer.write, chunk)
+        finally:
+            await run_io(buffer.close)
         
         return UploadResponse(
             video_id=video_id,
             message=f"Video uploaded successfully. ID: {video_id}",
         )
         
-    except HTTPException:
-        raise
     except Exception as e:
         if os.path.exists(file_path):
             os.remove(file_path)
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
+@app.post("/upload/sessions", response_model=UploadSessionStatus)
+async def create_upload_session(body: UploadSessionCreate):
+    """
+    Start a resumable upload.
+    
+    The declared size is checked against the limit before any bytes are sent.
+    Then PUT byte ranges to /upload/sessions/{session_id}?offset=N and call
+    /upload/sessions/{session_id}/complete once all bytes are received.
+    """
+    if body.content_type not in ALLOWED_VIDEO_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(ALLOWED_VIDEO_TYPES)}"
+        )
+    
+    try:
+        session = await uploads.create_session(body.filename, body.content_type, body.size)
+    except uploads.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    return session.to_dict()
+
+
+@app.get("/upload/sessions/{session_id}", response_model=UploadSessionStatus)
+async def get_upload_session(session_id: str):
+    """Get the received offset of a resumable upload, to resume after a drop."""
+    try:
+        return uploads.get_session(session_id).to_dict()
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@app.put("/upload/sessions/{session_id}", response_model=UploadSessionStatus)
+async def put_upload_chunk(session_id: str, request: Request, offset: int = Query(..., ge=0)):
+    """
+    Upload a byte range starting at `offset` as the raw request body.
+    
+    The body is streamed straight to disk without multipart parsing. Offsets
+    may overlap bytes already received but must not skip ahead (409 returns
+    the received offset to resume from).
+    """
+    try:
+        session = await uploads.write_chunk(session_id, offset, request.stream())
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except uploads.UploadOffsetError as e:
+        raise HTTPException(
+            status_code=409,
+            detail=str(e),
+            headers={"Upload-Offset": str(e.received)},
+        )
+    except uploads.UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    
+    return session.to_dict()
+
+
+@app.post("/upload/sessions/{session_id}/complete", response_model=UploadResponse)
+async def complete_upload_session(session_id: str):
+    """Finalize a fully received upload and get its video ID for /process."""
+    try:
+        session = uploads.finalize_session(session_id)
+    except uploads.UploadNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except uploads.UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return UploadResponse(
+        video_id=session.video_id,
+        message=f"Video uploaded successfully. ID: {session.video_id}",
+    )
+
+
+@app.delete("/upload/sessions/{session_id}")
+async def abort_upload_session(session_id: str):
+    """Abort a resumable upload and discard the received bytes."""
+    uploads.delete_session(session_id)
+    return {"message": "Upload session deleted"}
+
+
 @app.post("/upload/presigned", response_model=UploadResponse)
 async def get_presigned_upload_url(filename: str, content_type: str = "video/mp4"):
     """
@@ -142,7 +262,7 @@ async def get_presigned_upload_url(filename: str, content_type: str = "video/mp4
     key = f"uploads/{video_id}{extension}"
     
     try:
-        upload_url = storage.generate_presigned_upload_url(key, content_type)
+        upload_url = await storage.generate_presigned_upload_url_async(key, content_type)
         
         return UploadResponse(
             video_id=video_id,
@@ -154,11 +274,12 @@ async def get_presigned_upload_url(filename: str, content_type: str = "video/mp4
 
 
 @app.post("/process", response_model=ProcessResponse)
-async def start_processing(request: ProcessRequest, background_tasks: BackgroundTasks):
+async def start_processing(request: ProcessRequest):
     """
     Start processing a video with captions.
     
     The video will be processed in the background. Use /status/{job_id} to check progress.
+    Returns 503 (or 429, see QUEUE_FULL_STATUS_CODE) when the job queue is full.
     """
     # Find the uploaded video file
     video_path = None
@@ -174,16 +295,20 @@ async def start_processing(request: ProcessRequest, background_tasks: Background
             detail=f"Video not found. Please upload first with /upload"
         )
     
+    # Reject before creating the job if there is no room in the queue
+    scheduler = get_scheduler()
+    if scheduler.is_full():
+        raise HTTPException(
+            status_code=settings.queue_full_status_code,
+            detail="Too many jobs in progress. Please retry shortly.",
+            headers={"Retry-After": str(settings.queue_retry_after_seconds)},
+        )
+    
     # Create job
     job = create_job(request.video_id)
     
     # Start processing in background
-    background_tasks.add_task(
-        process_video,
-        job.job_id,
-        video_path,
-        request,
-    )
+    scheduler.submit(process_video, job.job_id, video_path, request)
     
     return ProcessResponse(
         job_id=job.job_id,
@@ -191,6 +316,60 @@ async def start_processing(request: ProcessRequest, background_tasks: Background
     )
 
 
+@app.post("/job/{job_id}/restyle", response_model=ProcessResponse)
+async def restyle_job(job_id: str, restyle: RestyleRequest):
+    """
+    Re-render a finished job with a new style, font, position or words per line.
+    
+    Reuses the original transcript, so only subtitle generation and caption
+    burning run. Returns a new job ID; the original result stays available.
+    Fields that any of the job's variants set for themselves are rejected.
+    """
+    job = get_job(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status != ProcessingStatus.COMPLETED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Processing not complete. Status: {job.status.value}"
+        )
+    
+    artifacts = get_job_artifacts(job_id)
+    if not artifacts or not os.path.exists(artifacts["video_path"]):
+        raise HTTPException(status_code=404, detail="Source video no longer available")
+    
+    scheduler = get_scheduler()
+    if scheduler.is_full():
+        raise HTTPException(
+            status_code=settings.queue_full_status_code,
+            detail="Too many jobs in progress. Please retry shortly.",
+            headers={"Retry-After": str(settings.queue_retry_after_seconds)},
+        )
+    
+    changes = restyle.model_dump(exclude_none=True)
+    # A variant's own caption fields win over the job's, so changing them here would do nothing
+    overridden = sorted({
+        field for variant in artifacts["request"].variants
+        for field in changes if getattr(variant, field) is not None
+    })
+    if overridden:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Set by this job's variants, which override it: {', '.join(overridden)}",
+        )
+    
+    request = artifacts["request"].model_copy(update=changes)
+    new_job = create_job(job.video_id)
+    scheduler.submit(restyle_video, new_job.job_id, job_id, request)
+    
+    return ProcessResponse(
+        job_id=new_job.job_id,
+        message="Restyle started. Check status with /status/{job_id}",
+    )
+
+
 @app.get("/status/{job_id}", response_model=JobStatus)
 async def get_processing_status(job_id: str):
     """Get the status of a processing job."""
@@ -202,6 +381,94 @@ async def get_processing_status(job_id: str):
     return job
 
 
+@app.get("/status/{job_id}/events")
+async def stream_processing_status(job_id: str):
+    """
+    Stream job status as Server-Sent Events.
+    
+    Sends the current status, then every status transition and live FFmpeg
+    progress (frames, fps, speed, ETA) until the job completes or fails.
+    """
+    job = get_job(job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    queue = subscribe_job(job_id)
+    
+    async def events():
+        try:
+            snapshot = job
+            while True:
+                yield f"event: status\ndata: {snapshot.model_dump_json()}\n\n"
+                
+                if snapshot.status in (ProcessingStatus.COMPLETED, ProcessingStatus.FAILED):
+                    break
+                
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    snapshot = get_job(job_id) or snapshot
+        finally:
+            unsubscribe_job(job_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.post("/webhooks/assemblyai")
+async def assemblyai_webhook(request: Request):
+    """AssemblyAI completion callback; wakes the job waiting on the transcript."""
+    if settings.assemblyai_webhook_secret:
+        # Compared as bytes: compare_digest rejects non-ASCII str
+        token = request.headers.get(WEBHOOK_AUTH_HEADER, "").encode()
+        if not secrets.compare_digest(token, settings.assemblyai_webhook_secret.encode()):
+            raise HTTPException(status_code=401, detail="Invalid webhook credentials")
+    
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON")
+    if not isinstance(body, dict):
+        raise HTTPException(status_code=400, detail="Body must be a JSON object")
+    
+    transcript_id = body.get("transcript_id")
+    if not transcript_id:
+        raise HTTPException(status_code=400, detail="Missing transcript_id")
+    
+    # Unknown IDs are acknowledged anyway so AssemblyAI doesn't retry them
+    return {"transcript_id": transcript_id, "waiting": notify_transcript(transcript_id)}
+
+
+async def serve_output(path: Optional[str], object_key: Optional[str], filename: str):
+    """
+    Redirect to an output's published copy in R2, or stream the local file.
+    
+    Either way it is saved as `filename`. The local file is the fallback for
+    unpublished outputs, and for published ones still in their hot window if
+    a download URL can't be made.
+    """
+    if object_key:
+        try:
+            url = await storage.get_download_url_async(object_key, settings.r2_download_url_expiry, filename)
+            return RedirectResponse(url, status_code=307)
+        except Exception as e:
+            print(f"⚠️ Could not create a download URL for {object_key}: {e}")
+    
+    if not path or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="Output file not found")
+    
+    return FileResponse(
+        path,
+        media_type=OUTPUT_MEDIA_TYPES.get(Path(path).suffix, "video/mp4"),
+        filename=filename,
+    )
+
+
 @app.get("/download/{job_id}")
 async def download_result(job_id: str):
     """
@@ -220,13 +487,33 @@ async def download_result(job_id: str):
             detail=f"Processing not complete. Status: {job.status.value}"
         )
     
-    if not job.result_url or not os.path.exists(job.result_url):
-        raise HTTPException(status_code=404, detail="Output file not found")
+    filename = get_download_name(job.video_id, job.output_key or job.result_url or "")
+    return await serve_output(job.result_url, job.output_key, filename)
+
+
+@app.get("/download/{job_id}/{variant}")
+async def download_variant(job_id: str, variant: str):
+    """Download one output variant of a job started with `variants`."""
+    job = get_job(job_id)
     
-    return FileResponse(
-        job.result_url,
-        media_type="video/mp4",
-        filename=f"captioned_{job.video_id}.mp4",
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if job.status != ProcessingStatus.COMPLETED:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Processing not complete. Status: {job.status.value}"
+        )
+    
+    artifacts = get_job_artifacts(job_id) or {}
+    if variant not in artifacts.get("outputs", {}):
+        raise HTTPException(status_code=404, detail=f"Variant not found: {variant}")
+    
+    path = artifacts["outputs"][variant]
+    return await serve_output(
+        path,
+        artifacts.get("output_keys", {}).get(variant),
+        get_download_name(job.video_id, path, variant),
     )
 
 
@@ -247,9 +534,17 @@ async def delete_job(job_id: str):
     if job.result_url and os.path.exists(job.result_url):
         os.remove(job.result_url)
     
+    artifacts = get_job_artifacts(job_id) or {}
+    for path in artifacts.get("outputs", {}).values():
+        if os.path.exists(path):
+            os.remove(path)
+    for key in artifacts.get("output_keys", {}).values():
+        await storage.delete_file_async(key)
+    
     # Remove from jobs dict
-    from processor import jobs
+    from processor import jobs, job_artifacts
     del jobs[job_id]
+    job_artifacts.pop(job_id, None)
     
     return {"message": "Job and files deleted"}
 
@@ -262,12 +557,20 @@ async def startup_event():
     print(f"   Temp dir: {settings.temp_dir}")
     print(f"   Output dir: {settings.output_dir}")
     print(f"   Fonts dir: {settings.fonts_dir}")
+    await http_clients.startup()
+    await loop_monitor.start()
+    if hinglish_transliterator and settings.hinglish_seed_words_file:
+        seeded = hinglish_transliterator.seed_cache(settings.hinglish_seed_words_file)
+        print(f"   Transliteration cache: seeded {seeded} words")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     print("🎬 CaptionCraft API shutting down...")
+    await http_clients.shutdown()
+    await loop_monitor.stop()
+    offload.shutdown()
 
 
 # Run with uvicorn
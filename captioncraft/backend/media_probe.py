@@ -0,0 +1,231 @@
+"""Async, cached media probing: stream info and keyframes via FFmpeg."""
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import get_settings
+
+
+class ProbeError(Exception):
+    """The file could not be opened or read as media."""
+    pass
+
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+_STREAM_RE = re.compile(r"^\s*Stream #\d+:\d+.*?: (\w+): ", re.MULTILINE)
+_VIDEO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+).*?, (\d{2,5})x(\d{2,5})")
+_AUDIO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Audio: (\w+)")
+_ROTATION_RE = re.compile(r"displaymatrix: rotation of (-?\d+(?:\.\d+)?) degrees|\brotate\s*: (-?\d+)")
+
+ProbeKey = Tuple[str, int, int]  # (real path, size, mtime_ns)
+
+
+def parse_duration(text: str) -> Optional[float]:
+    """Duration in seconds from an FFmpeg `Duration: HH:MM:SS.cc` line, if present."""
+    match = _DURATION_RE.search(text)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def parse_media_info(stderr: str) -> dict:
+    """
+    Parse stream info from FFmpeg's input banner.
+
+    Width and height are the displayed size: FFmpeg applies rotation
+    metadata when filtering, so a 1920x1080 phone clip rotated by 90 degrees
+    is rendered (and captioned) as 1080x1920. Without a video stream,
+    width, height and codec are None; without audio, audio_codec is None.
+    """
+    # Only look at the input section; output streams are listed after it
+    input_section = stderr.split("\nOutput #", 1)[0]
+    stream_types = _STREAM_RE.findall(input_section)
+    audio_match = _AUDIO_STREAM_RE.search(input_section)
+
+    info = {
+        "width": None,
+        "height": None,
+        "duration": parse_duration(input_section) or 0.0,
+        "codec": None,
+        "rotation": 0,
+        "has_video": False,
+        "has_audio": "Audio" in stream_types,
+        "audio_codec": audio_match.group(1) if audio_match else None,
+    }
+
+    video_match = _VIDEO_STREAM_RE.search(input_section)
+    if not video_match:
+        return info
+
+    # Side data and metadata of the video stream come before the next stream line
+    next_stream = input_section.find("Stream #", video_match.end())
+    video_block = input_section[video_match.end():next_stream if next_stream != -1 else None]
+    rotation = 0
+    rotation_match = _ROTATION_RE.search(video_block)
+    if rotation_match:
+        display_matrix, rotate_tag = rotation_match.groups()
+        # The display matrix turns counter-clockwise, the legacy rotate tag clockwise
+        rotation = round(float(display_matrix)) % 360 if display_matrix else -int(rotate_tag) % 360
+
+    width, height = int(video_match.group(2)), int(video_match.group(3))
+    if rotation in (90, 270):
+        width, height = height, width
+
+    info.update(
+        width=width,
+        height=height,
+        codec=video_match.group(1),
+        rotation=rotation,
+        has_video=True,
+    )
+    return info
+
+
+async def _run(cmd: List[str]) -> Tuple[int, bytes, str]:
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout, stderr.decode(errors="replace")
+
+
+async def probe_media_info(path: str) -> dict:
+    """Read stream info from FFmpeg's banner, without decoding anything."""
+    # With no output FFmpeg exits 1 after printing the input banner
+    _, _, log = await _run(["ffmpeg", "-hide_banner", "-nostdin", "-i", path])
+    if "Input #0" not in log:
+        raise ProbeError(f"Could not read media: {log.strip().splitlines()[-1] if log.strip() else path}")
+    return parse_media_info(log)
+
+
+async def probe_keyframes(path: str) -> List[float]:
+    """
+    Keyframe timestamps (seconds) of the first video stream.
+
+    The stream is copied into FFmpeg's framecrc muxer, which lists every
+    packet with its pts and flags, so only the container is read.
+    """
+    cmd = [
+        "ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error",
+        "-i", path,
+        "-map", "0:v:0",
+        "-c", "copy",
+        "-f", "framecrc", "-",
+    ]
+    returncode, stdout, log = await _run(cmd)
+    if returncode != 0:
+        raise ProbeError(f"Keyframe scan failed: {log}")
+
+    time_base = None
+    keyframes = []
+    for line in stdout.decode(errors="replace").splitlines():
+        if line.startswith("#tb 0:"):
+            num, den = line.split(":", 1)[1].strip().split("/")
+            time_base = int(num) / int(den)
+            continue
+        if line.startswith("#") or time_base is None:
+            continue
+        # stream, dts, pts, duration, size, checksum[, F=0x<flags>] (flags omitted when just "key")
+        fields = [field.strip() for field in line.split(",")]
+        flags = next((int(f[2:], 16) for f in fields[6:] if f.startswith("F=")), 1)
+        if flags & 1:
+            keyframes.append(int(fields[2]) * time_base)
+
+    return sorted(keyframes)
+
+
+class MediaProbe:
+    """
+    LRU cache of probe results keyed by (path, size, mtime).
+
+    A file is probed once per version: later stages (and restyles) get the
+    cached info, and a re-upload to the same path is probed again because
+    its size or mtime changed. Concurrent probes of the same file share one
+    FFmpeg run.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[ProbeKey, dict]" = OrderedDict()  # key -> {"info": ..., "keyframes": ...}
+        self._pending: Dict[Tuple[ProbeKey, str], asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(path: str) -> ProbeKey:
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            raise ProbeError(f"Could not read media: {e}")
+        return os.path.realpath(path), stat.st_size, stat.st_mtime_ns
+
+    async def info(self, path: str) -> dict:
+        """Width, height, duration, codec, rotation, has_video and has_audio of a file."""
+        return dict(await self._get(path, "info", probe_media_info))
+
+    async def keyframes(self, path: str) -> List[float]:
+        """Keyframe timestamps (seconds) of a file's first video stream."""
+        return list(await self._get(path, "keyframes", probe_keyframes))
+
+    def seed(self, path: str, info: dict):
+        """Store info parsed elsewhere (e.g. from the ingest FFmpeg run) so it isn't probed again."""
+        self._store((self.make_key(path), "info"), dict(info))
+
+    async def _get(self, path: str, field: str, probe: Callable[[str], Awaitable]):
+        key = self.make_key(path)
+        entry = self._entries.get(key)
+        if entry is not None and field in entry:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[field]
+
+        pending_key = (key, field)
+        task = self._pending.get(pending_key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(probe(path))
+            self._pending[pending_key] = task
+            task.add_done_callback(lambda done: self._finish(pending_key, done))
+        else:
+            self.hits += 1  # Joined a probe already running
+
+        # Shielded so a cancelled caller doesn't cancel the probe for the others
+        return await asyncio.shield(task)
+
+    def _finish(self, pending_key: Tuple[ProbeKey, str], task: asyncio.Future):
+        self._pending.pop(pending_key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._store(pending_key, task.result())
+
+    def _store(self, pending_key: Tuple[ProbeKey, str], value):
+        key, field = pending_key
+        self._entries.setdefault(key, {})[field] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+
+@lru_cache()
+def get_media_probe() -> MediaProbe:
+    return MediaProbe(max_entries=get_settings().probe_cache_size)
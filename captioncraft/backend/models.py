@@ -31,6 +31,48 @@ class FontFamily(str, Enum):
     ARCHIVO_BLACK = "Archivo Black"
 
 
+class OutputMode(str, Enum):
+    BURN = "burn"  # Captions rendered into the video frames (re-encode)
+    SOFT = "soft"  # Captions muxed as a player-toggleable track (stream copy)
+
+
+class OutputContainer(str, Enum):
+    MP4 = "mp4"    # mov_text subtitle track
+    MKV = "mkv"    # ASS subtitle track (keeps styling)
+    WEBM = "webm"  # WebVTT subtitle track (VP8/VP9/AV1 sources only)
+
+
+class AspectRatio(str, Enum):
+    SOURCE = "source"      # Keep the source frame
+    VERTICAL = "9:16"      # Reels, Shorts, TikTok
+    SQUARE = "1:1"         # Feed
+    PORTRAIT = "4:5"       # Feed (tall)
+    LANDSCAPE = "16:9"     # YouTube
+
+
+class FrameFit(str, Enum):
+    CROP = "crop"  # Fill the frame, cropping the centre of the source
+    PAD = "pad"    # Fit the whole source, with black bars
+
+
+MAX_OUTPUT_VARIANTS = 6
+
+
+class OutputVariant(BaseModel):
+    """One rendition of a job. Caption fields left unset use the request's value."""
+    name: Optional[str] = Field(default=None, pattern=r'^[A-Za-z0-9_-]{1,32}$')  # Default from ratio/style
+    aspect_ratio: AspectRatio = AspectRatio.SOURCE
+    fit: FrameFit = FrameFit.CROP
+    style: Optional[CaptionStyle] = None
+    font: Optional[FontFamily] = None
+    position: Optional[CaptionPosition] = None
+    words_per_line: Optional[int] = Field(default=None, ge=1, le=10)
+    
+    def default_name(self) -> str:
+        name = self.aspect_ratio.value.replace(":", "x")
+        return f"{name}-{self.style.value}" if self.style else name
+
+
 class ProcessingStatus(str, Enum):
     PENDING = "pending"
     EXTRACTING_AUDIO = "extracting_audio"
@@ -65,6 +107,9 @@ class ProcessRequest(BaseModel):
     position: CaptionPosition = CaptionPosition.BOTTOM
     language: str = "hi"  # hi, en, or hinglish
     words_per_line: int = Field(default=4, ge=1, le=10)
+    output_mode: OutputMode = OutputMode.BURN
+    container: OutputContainer = OutputContainer.MP4  # Soft mode only; burned output is MP4
+    variants: List[OutputVariant] = Field(default_factory=list, max_length=MAX_OUTPUT_VARIANTS)  # Burn mode; one encode
     
     def get_transcription_language(self) -> str:
         """Get language for AssemblyAI API."""
@@ -76,6 +121,67 @@ class ProcessRequest(BaseModel):
         if v not in ['hi', 'en', 'hinglish']:
             raise ValueError('Language must be hi, en, or hinglish')
         return v
+    
+    @validator('container')
+    def validate_container(cls, v, values):
+        if v != OutputContainer.MP4 and values.get('output_mode') != OutputMode.SOFT:
+            raise ValueError('Burned captions are always MP4; use output_mode "soft" for mkv or webm')
+        return v
+    
+    @validator('variants')
+    def validate_variants(cls, v, values):
+        if v and values.get('output_mode') == OutputMode.SOFT:
+            raise ValueError('Output variants are rendered with burned captions; use output_mode "burn"')
+        
+        named = [variant.name for variant in v if variant.name]
+        if len(named) != len(set(named)):
+            raise ValueError('Variant names must be unique')
+        
+        # Fill in missing names, numbering repeats: 9x16, 9x16-2...
+        taken = set(named)
+        for variant in v:
+            if not variant.name:
+                base = name = variant.default_name()
+                n = 1
+                while name in taken:
+                    n += 1
+                    name = f"{base}-{n}"
+                variant.name = name
+                taken.add(name)
+        return v
+
+
+class RestyleRequest(BaseModel):
+    """Request to re-render a finished job with a new caption look.
+    
+    Fields left unset keep the value used by the original job. Fields a
+    variant of that job sets for itself can't be restyled.
+    """
+    style: Optional[CaptionStyle] = None
+    font: Optional[FontFamily] = None
+    position: Optional[CaptionPosition] = None
+    words_per_line: Optional[int] = Field(default=None, ge=1, le=10)
+
+
+class EncodeProgress(BaseModel):
+    """Live FFmpeg progress for the current stage, from its `-progress` output."""
+    frame: int = 0
+    fps: float = 0.0
+    speed: Optional[float] = None  # Multiple of realtime
+    out_time_ms: int = 0
+    duration_ms: int = 0
+    percent: float = 0.0
+    eta_seconds: Optional[float] = None
+
+
+class VariantResult(BaseModel):
+    """A rendered output variant and where to download it."""
+    name: str
+    aspect_ratio: AspectRatio
+    width: int
+    height: int
+    download_url: str
+    object_key: Optional[str] = None  # Set once published to R2
 
 
 class JobStatus(BaseModel):
@@ -85,7 +191,10 @@ class JobStatus(BaseModel):
     status: ProcessingStatus
     progress: int = 0  # 0-100
     message: str = ""
+    encode: Optional[EncodeProgress] = None  # Set while an FFmpeg stage is running
     result_url: Optional[str] = None
+    output_key: Optional[str] = None  # R2 object key of the published output
+    variants: List[VariantResult] = []  # One per requested output variant
     created_at: datetime
     updated_at: datetime
     error: Optional[str] = None
@@ -98,6 +207,22 @@ class UploadResponse(BaseModel):
     message: str
 
 
+class UploadSessionCreate(BaseModel):
+    """Request to start a resumable upload."""
+    filename: str
+    content_type: str = "video/mp4"
+    size: int = Field(gt=0)  # Declared total length in bytes
+
+
+class UploadSessionStatus(BaseModel):
+    """Progress of a resumable upload."""
+    session_id: str
+    video_id: str
+    size: int
+    received: int  # Next byte offset to send
+    complete: bool
+
+
 class ProcessResponse(BaseModel):
     """Response after starting processing."""
     job_id: str
@@ -0,0 +1,106 @@
+"""Shared executors for blocking work, so it runs off the event loop."""
+import asyncio
+import functools
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Optional, TypeVar
+
+from config import get_settings
+
+T = TypeVar("T")
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_cpu_executor: Optional[Executor] = None
+
+# Calls submitted and not yet finished, and calls finished, per pool
+_in_flight = {"io": 0, "cpu": 0}
+_completed = {"io": 0, "cpu": 0}
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Thread pool for blocking I/O: file reads and writes, storage SDK calls."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=get_settings().io_threads, thread_name_prefix="io")
+    return _io_executor
+
+
+def get_cpu_executor() -> Executor:
+    """
+    Pool for CPU-bound work (transliteration, subtitle generation).
+
+    Worker processes when `cpu_processes` is set, so the work doesn't hold
+    the GIL the event loop needs; otherwise threads, which keep in-process
+    caches (e.g. transliteration) warm.
+    """
+    global _cpu_executor
+    if _cpu_executor is None:
+        processes = get_settings().cpu_processes
+        if processes > 0:
+            _cpu_executor = ProcessPoolExecutor(max_workers=processes)
+        else:
+            _cpu_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="cpu")
+    return _cpu_executor
+
+
+async def _run(kind: str, executor: Executor, func: Callable[..., T], *args, **kwargs) -> T:
+    loop = asyncio.get_running_loop()
+    _in_flight[kind] += 1
+    try:
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+    finally:
+        _in_flight[kind] -= 1
+        _completed[kind] += 1
+
+
+async def run_io(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run a blocking I/O call on the I/O thread pool."""
+    return await _run("io", get_io_executor(), func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run CPU-bound work on the CPU pool. With worker processes, `func` and its arguments must pickle."""
+    return await _run("cpu", get_cpu_executor(), func, *args, **kwargs)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+async def read_file(path: str) -> bytes:
+    """Read a whole file off the event loop."""
+    return await run_io(_read_bytes, path)
+
+
+async def iter_file(path: str, chunk_size: int) -> AsyncIterator[bytes]:
+    """Read a file in chunks, each read off the event loop."""
+    f = await run_io(open, path, "rb")
+    try:
+        while chunk := await run_io(f.read, chunk_size):
+            yield chunk
+    finally:
+        f.close()
+
+
+def shutdown():
+    """Stop the pools. Called from the app shutdown hook; they are recreated on next use."""
+    global _io_executor, _cpu_executor
+    for executor in (_io_executor, _cpu_executor):
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    _io_executor = None
+    _cpu_executor = None
+
+
+def stats() -> dict:
+    """Pool sizes and call counts."""
+    settings = get_settings()
+    return {
+        "io": {"threads": settings.io_threads, "in_flight": _in_flight["io"], "completed": _completed["io"]},
+        "cpu": {
+            "processes": settings.cpu_processes,
+            "in_flight": _in_flight["cpu"],
+            "completed": _completed["cpu"],
+        },
+    }
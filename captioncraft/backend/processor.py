@@ -1,27 +1,38 @@
 """Video processing pipeline with FFmpeg."""
 import os
 import asyncio
-import subprocess
 import uuid
-import json
-from typing import Optional, Tuple
+import io
+import bisect
+import re
+import shutil
+import time
+import wave
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from pathlib import Path
 
 from config import get_settings
 from models import (
     ProcessRequest, JobStatus, ProcessingStatus,
-    Word, CaptionStyle, CaptionPosition, FontFamily
+    Word, CaptionStyle, CaptionPosition, FontFamily,
+    OutputMode, OutputContainer, EncodeProgress,
+    AspectRatio, FrameFit, OutputVariant, VariantResult,
 )
-from subtitles import generate_ass_subtitle
+from subtitles import save_ass_subtitle
+from word_timeline import WordTimeline
 from transcriber import transcribe_audio
+from transcript_cache import get_transcript_cache
+from media_probe import ProbeError, get_media_probe, parse_duration, parse_media_info
+from offload import run_cpu, run_io
+import storage
 
 # Import Sarvam AI transcriber for Hinglish
 try:
-    from sarvam_transcriber import (
-        transcribe_audio_sarvam,
-        correct_common_hinglish_misspellings,
-    )
+    from sarvam_transcriber import transcribe_audio_sarvam_chunked
+    from hinglish_corrections import get_corrector
     SARVAM_AVAILABLE = True
 except ImportError:
     SARVAM_AVAILABLE = False
@@ -39,46 +50,232 @@ class ProcessingError(Exception):
     pass
 
 
+class QueueFullError(ProcessingError):
+    """The scheduler has no room for another job."""
+    pass
+
+
 # In-memory job storage (use Redis in production)
 jobs: dict[str, JobStatus] = {}
 
+# Live status subscribers (e.g. SSE streams), one queue per listener
+job_subscribers: dict[str, set[asyncio.Queue]] = {}
 
-def get_video_info(video_path: str) -> dict:
-    """Get video dimensions and duration using FFprobe."""
-    cmd = [
-        "ffprobe",
-        "-v", "quiet",
-        "-print_format", "json",
-        "-show_format",
-        "-show_streams",
-        video_path
-    ]
+# Transcript and video info of finished jobs, kept so they can be restyled
+# without re-extracting or re-transcribing
+job_artifacts: dict[str, dict] = {}
+
+
+# Output name of a job rendered without variants
+DEFAULT_OUTPUT = "default"
+
+
+CPU_STAGE = "cpu"
+NETWORK_STAGE = "network"
+
+
+class JobScheduler:
+    """
+    Stage-aware scheduler for processing jobs.
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise ProcessingError(f"FFprobe failed: {result.stderr}")
+    FFmpeg stages (audio extraction, caption burning) share a CPU pool sized
+    to the core count. Transcription waits use a separate, larger network
+    pool, so a job gives up its encode slot while the STT provider works.
+    """
     
-    info = json.loads(result.stdout)
+    def __init__(self, cpu_workers: int, network_workers: int, max_queue_depth: int):
+        self.max_queue_depth = max_queue_depth
+        self._workers = {CPU_STAGE: cpu_workers, NETWORK_STAGE: network_workers}
+        self._free = dict(self._workers)
+        self._released = {CPU_STAGE: asyncio.Condition(), NETWORK_STAGE: asyncio.Condition()}
+        self._turnstile = {CPU_STAGE: asyncio.Lock(), NETWORK_STAGE: asyncio.Lock()}  # FIFO line per stage
+        self._active = {CPU_STAGE: 0, NETWORK_STAGE: 0}
+        self._waiting = {CPU_STAGE: 0, NETWORK_STAGE: 0}
+        self._wait_seconds = {CPU_STAGE: 0.0, NETWORK_STAGE: 0.0}
+        self._tasks: set[asyncio.Task] = set()
     
-    # Find video stream
-    video_stream = None
-    for stream in info.get("streams", []):
-        if stream.get("codec_type") == "video":
-            video_stream = stream
-            break
+    def is_full(self) -> bool:
+        """Whether a new job would exceed the queue depth."""
+        return len(self._tasks) >= self.max_queue_depth
+    
+    def submit(self, func, *args) -> asyncio.Task:
+        """Admit a job coroutine function and start it as a task."""
+        if self.is_full():
+            raise QueueFullError(f"Job queue is full ({self.max_queue_depth} jobs)")
+        
+        task = asyncio.create_task(func(*args))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+        return task
+    
+    def _on_task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        # Failures are recorded on the job; retrieve to silence asyncio warnings
+        if not task.cancelled():
+            task.exception()
     
-    if not video_stream:
+    def workers(self, kind: str) -> int:
+        """Size of a stage pool."""
+        return self._workers[kind]
+    
+    @asynccontextmanager
+    async def stage(self, kind: str, slots: int = 1):
+        """
+        Hold `slots` slots in the given stage pool for the duration of the block.
+        
+        Multi-slot holds (e.g. a segment-parallel encode) are acquired
+        atomically, so two jobs can never deadlock on partial holds. Requests
+        are served in arrival order: the head of the line waits for all its
+        slots while later ones, even single-slot, queue behind it, so a
+        steady stream of small jobs can't starve a parallel encode.
+        """
+        slots = max(1, min(slots, self._workers[kind]))
+        released = self._released[kind]
+        
+        started = time.monotonic()
+        self._waiting[kind] += 1
+        try:
+            async with self._turnstile[kind]:
+                async with released:
+                    await released.wait_for(lambda: self._free[kind] >= slots)
+                    self._free[kind] -= slots
+        finally:
+            self._waiting[kind] -= 1
+        self._wait_seconds[kind] += time.monotonic() - started
+        
+        self._active[kind] += 1
+        try:
+            yield
+        finally:
+            self._active[kind] -= 1
+            async with released:
+                self._free[kind] += slots
+                released.notify_all()
+    
+    def stats(self) -> dict:
+        """Queue depth and per-stage concurrency."""
+        return {
+            "jobs": len(self._tasks),
+            "max_queue_depth": self.max_queue_depth,
+            "stages": {
+                kind: {
+                    "workers": self._workers[kind],
+                    "free": self._free[kind],
+                    "active": self._active[kind],
+                    "waiting": self._waiting[kind],
+                    "wait_seconds": round(self._wait_seconds[kind], 3),
+                }
+                for kind in self._workers
+            },
+        }
+
+
+@lru_cache()
+def get_scheduler() -> JobScheduler:
+    settings = get_settings()
+    return JobScheduler(
+        cpu_workers=settings.cpu_workers or os.cpu_count() or 1,
+        network_workers=settings.network_workers,
+        max_queue_depth=settings.max_queue_depth,
+    )
+
+
+async def get_video_info(video_path: str) -> dict:
+    """Get video dimensions, duration and codec (cached per file version)."""
+    try:
+        info = await get_media_probe().info(video_path)
+    except ProbeError as e:
+        raise ProcessingError(str(e))
+    
+    if not info["has_video"]:
         raise ProcessingError("No video stream found")
+    return info
+
+
+AUDIO_SAMPLE_RATE = 16000  # 16kHz mono, optimal for speech
+
+
+ProgressCallback = Callable[[dict], None]
+
+_PROGRESS_LINE_RE = re.compile(r"^([a-z0-9_]+)=(\S*)$")
+
+
+def _parse_progress(fields: dict, duration_ms: Optional[int]) -> dict:
+    """Turn one block of FFmpeg `-progress` key=value pairs into a snapshot."""
+    def number(key, cast, default):
+        try:
+            return cast(fields.get(key, "").rstrip("x"))
+        except ValueError:
+            return default
     
     return {
-        "width": int(video_stream.get("width", 1080)),
-        "height": int(video_stream.get("height", 1920)),
-        "duration": float(info.get("format", {}).get("duration", 0)),
-        "codec": video_stream.get("codec_name", "unknown"),
+        "frame": number("frame", int, 0),
+        "fps": number("fps", float, 0.0),
+        "speed": number("speed", float, None),
+        "out_time_ms": max(number("out_time_us", int, 0), 0) // 1000,
+        "duration_ms": duration_ms,
+        "done": fields.get("progress") == "end",
     }
 
 
-async def extract_audio(video_path: str, output_path: str) -> str:
+async def run_ffmpeg(
+    cmd: List[str],
+    error_message: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[bytes, str]:
+    """
+    Run an FFmpeg command and return (stdout, stderr log).
+    
+    With `on_progress`, FFmpeg writes `-progress` reports to stderr; each
+    report is parsed (frame, fps, speed, out_time) and passed to the callback
+    as it arrives, and progress lines are left out of the returned log.
+    """
+    if on_progress:
+        cmd = [cmd[0], "-progress", "pipe:2", "-nostats", *cmd[1:]]
+    
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    
+    log_lines = []
+    
+    async def read_stderr():
+        fields = {}
+        duration_ms = None
+        
+        while line := await process.stderr.readline():
+            text = line.decode(errors="replace").rstrip("\r\n")
+            match = _PROGRESS_LINE_RE.match(text) if on_progress else None
+            
+            if not match:
+                log_lines.append(text)
+                if duration_ms is None and (duration := parse_duration(text)) is not None:
+                    duration_ms = int(duration * 1000)
+                continue
+            
+            key, value = match.groups()
+            fields[key] = value
+            if key == "progress":
+                on_progress(_parse_progress(fields, duration_ms))
+                fields = {}
+    
+    stdout, _ = await asyncio.gather(process.stdout.read(), read_stderr())
+    await process.wait()
+    
+    log = "\n".join(log_lines)
+    if process.returncode != 0:
+        raise ProcessingError(f"{error_message}: {log}")
+    
+    return stdout, log
+
+
+async def extract_audio(
+    video_path: str,
+    output_path: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> str:
     """Extract audio from video using FFmpeg."""
     cmd = [
         "ffmpeg",
@@ -91,25 +288,68 @@ async def extract_audio(video_path: str, output_path: str) -> str:
         output_path
     ]
     
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
+    await run_ffmpeg(cmd, "Audio extraction failed", on_progress)
+    
+    return output_path
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = AUDIO_SAMPLE_RATE) -> bytes:
+    """Wrap raw 16-bit mono PCM in an in-memory WAV container."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def parse_ffmpeg_input_info(stderr: str) -> dict:
+    """Parse video dimensions, duration, rotation and audio presence from FFmpeg's input banner."""
+    info = parse_media_info(stderr)
+    if not info["has_video"]:
+        raise ProcessingError("No video stream found")
+    return info
+
+
+async def ingest_media(
+    video_path: str,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Tuple[dict, bytes]:
+    """
+    Probe a video and extract its audio in a single FFmpeg run.
     
-    stdout, stderr = await process.communicate()
+    Stream metadata is parsed from FFmpeg's input banner and the 16kHz mono
+    audio is read from stdout, so nothing is written to disk. Returns the
+    same info dict as get_video_info() and the audio as WAV bytes; the info
+    is also cached for every later stage that probes this file.
+    """
+    cmd = [
+        "ffmpeg",
+        "-hide_banner",
+        "-nostdin",
+        "-i", video_path,
+        "-vn",                    # No video
+        "-acodec", "pcm_s16le",
+        "-ar", str(AUDIO_SAMPLE_RATE),
+        "-ac", "1",               # Mono
+        "-f", "s16le",            # Raw PCM; the WAV header is added in memory
+        "pipe:1",
+    ]
     
-    if process.returncode != 0:
-        raise ProcessingError(f"Audio extraction failed: {stderr.decode()}")
+    pcm, log = await run_ffmpeg(cmd, "Audio extraction failed", on_progress)
     
-    return output_path
+    video_info = parse_ffmpeg_input_info(log)
+    get_media_probe().seed(video_path, video_info)
+    return video_info, pcm_to_wav(pcm)
 
 
 async def burn_captions(
     video_path: str,
     subtitle_path: str,
     output_path: str,
-    fonts_dir: str = "/fonts"
+    fonts_dir: str = "/fonts",
+    on_progress: Optional[ProgressCallback] = None,
 ) -> str:
     """Burn ASS subtitles onto video using FFmpeg."""
     
@@ -125,29 +365,244 @@ async def burn_captions(
         output_path
     ]
     
-    process = await asyncio.create_subprocess_exec(
-        *cmd,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
+    await run_ffmpeg(cmd, "Caption burning failed", on_progress)
     
-    stdout, stderr = await process.communicate()
+    return output_path
+
+
+async def burn_variants(
+    video_path: str,
+    branches: List[Tuple[str, str, str]],
+    on_progress: Optional[ProgressCallback] = None,
+) -> List[str]:
+    """
+    Burn captions into several outputs from a single decode.
     
-    if process.returncode != 0:
-        raise ProcessingError(f"Caption burning failed: {stderr.decode()}")
+    `branches` are (frame filter, subtitle path, output path). The decoded
+    video is split once per branch, reshaped by its frame filter (crop/pad,
+    or "" to keep the frame), captioned and encoded; audio is copied into
+    every output.
+    """
+    labels = "".join(f"[in{i}]" for i in range(len(branches)))
+    graph = [f"[0:v]split={len(branches)}{labels}"]
+    for i, (frame_filter, subtitle_path, _) in enumerate(branches):
+        filters = ",".join(f for f in (frame_filter, f"ass={subtitle_path}") if f)
+        graph.append(f"[in{i}]{filters}[out{i}]")
+    
+    cmd = ["ffmpeg", "-y", "-i", video_path, "-filter_complex", ";".join(graph)]
+    for i, (_, _, output_path) in enumerate(branches):
+        cmd += [
+            "-map", f"[out{i}]",
+            "-map", "0:a?",
+            "-c:a", "copy",
+            "-c:v", "libx264",
+            "-preset", "fast",
+            output_path
+        ]
+    
+    await run_ffmpeg(cmd, "Caption burning failed", on_progress)
+    
+    return [output_path for _, _, output_path in branches]
+
+
+# Subtitle codec per container for soft (muxed) captions
+SOFT_SUBTITLE_CODECS = {
+    OutputContainer.MP4: "mov_text",
+    OutputContainer.MKV: "ass",
+    OutputContainer.WEBM: "webvtt",
+}
+
+WEBM_VIDEO_CODECS = {"vp8", "vp9", "av1"}
+WEBM_AUDIO_CODECS = {"opus", "vorbis"}
+
+# ISO 639-2 tags for the subtitle track
+SUBTITLE_LANGUAGE_TAGS = {"hi": "hin", "en": "eng", "hinglish": "hin"}
+
+
+async def mux_subtitles(
+    video_path: str,
+    subtitle_path: str,
+    output_path: str,
+    container: OutputContainer = OutputContainer.MP4,
+    language: Optional[str] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    audio_codec: Optional[str] = None,
+) -> str:
+    """
+    Add the subtitles as a toggleable track, copying the video as-is.
+    
+    Audio is copied too, except into WebM when it isn't Opus or Vorbis
+    (e.g. AAC from a phone): WebM can't hold it, so it is encoded to Opus.
+    """
+    if container == OutputContainer.WEBM and audio_codec not in WEBM_AUDIO_CODECS:
+        audio_args = ["-c:a", "libopus", "-b:a", "128k"]
+    else:
+        audio_args = ["-c:a", "copy"]
+    
+    cmd = [
+        "ffmpeg",
+        "-y",
+        "-i", video_path,
+        "-i", subtitle_path,
+        "-map", "0:v",
+        "-map", "0:a?",
+        "-map", "1:0",
+        "-c:v", "copy",
+        *audio_args,
+        "-c:s", SOFT_SUBTITLE_CODECS[container],
+    ]
+    if language in SUBTITLE_LANGUAGE_TAGS:
+        cmd += ["-metadata:s:s:0", f"language={SUBTITLE_LANGUAGE_TAGS[language]}"]
+    cmd.append(output_path)
+    
+    await run_ffmpeg(cmd, "Subtitle muxing failed", on_progress)
     
     return output_path
 
 
+async def get_keyframes(video_path: str) -> List[float]:
+    """List keyframe timestamps (seconds) of the first video stream (cached per file version)."""
+    try:
+        return await get_media_probe().keyframes(video_path)
+    except ProbeError as e:
+        raise ProcessingError(str(e))
+
+
+def plan_segments(
+    keyframes: List[float],
+    duration: float,
+    count: int,
+) -> List[Tuple[float, float]]:
+    """
+    Split [0, duration] into up to `count` roughly equal segments that each
+    start on a keyframe, so segments can be cut without re-encoding drift.
+    """
+    boundaries = [0.0]
+    
+    for i in range(1, count):
+        target = duration * i / count
+        pos = bisect.bisect_left(keyframes, target)
+        candidates = keyframes[max(pos - 1, 0):pos + 1]
+        if not candidates:
+            break
+        nearest = min(candidates, key=lambda t: abs(t - target))
+        if boundaries[-1] < nearest < duration:
+            boundaries.append(nearest)
+    
+    boundaries.append(duration)
+    return list(zip(boundaries, boundaries[1:]))
+
+
+async def burn_captions_parallel(
+    video_path: str,
+    segments: List[Tuple[float, float]],
+    subtitle_paths: List[str],
+    output_path: str,
+    fonts_dir: str = "/fonts",
+    on_progress: Optional[ProgressCallback] = None,
+) -> str:
+    """
+    Burn captions segment by segment with concurrent FFmpeg encoders.
+    
+    Each keyframe-aligned segment is encoded with its own time-shifted ASS
+    file, then the segments are concatenated with stream copy and the
+    original audio is muxed back in untouched. Progress from the encoders
+    is summed into one report.
+    """
+    work_dir = f"{output_path}.parts"
+    os.makedirs(work_dir, exist_ok=True)
+    
+    threads = max(1, (os.cpu_count() or 1) // len(segments))
+    segment_paths = []
+    segment_progress = [_parse_progress({}, None) for _ in segments]
+    
+    def segment_reporter(index: int) -> Optional[ProgressCallback]:
+        if not on_progress:
+            return None
+        
+        def report(progress: dict):
+            segment_progress[index] = progress
+            speeds = [p["speed"] for p in segment_progress if p["speed"]]
+            on_progress({
+                "frame": sum(p["frame"] for p in segment_progress),
+                "fps": sum(p["fps"] for p in segment_progress),
+                "speed": sum(speeds) if speeds else None,
+                "out_time_ms": sum(p["out_time_ms"] for p in segment_progress),
+                "duration_ms": None,
+                "done": False,
+            })
+        
+        return report
+    
+    try:
+        commands = []
+        for i, ((start, end), subtitle_path) in enumerate(zip(segments, subtitle_paths)):
+            segment_path = os.path.join(work_dir, f"segment_{i:03d}.mp4")
+            segment_paths.append(segment_path)
+            
+            cmd = ["ffmpeg", "-y", "-ss", f"{start:.6f}", "-i", video_path]
+            if i < len(segments) - 1:
+                cmd += ["-t", f"{end - start:.6f}"]
+            cmd += [
+                "-vf", f"ass={subtitle_path}",
+                "-an",
+                "-c:v", "libx264",
+                "-preset", "fast",
+                "-threads", str(threads),
+                segment_path
+            ]
+            commands.append(cmd)
+        
+        # Wait for every encoder before reporting, so none is left running
+        results = await asyncio.gather(
+            *(
+                run_ffmpeg(cmd, "Caption burning failed", segment_reporter(i))
+                for i, cmd in enumerate(commands)
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        
+        concat_list = os.path.join(work_dir, "segments.txt")
+        with open(concat_list, "w", encoding="utf-8") as f:
+            for segment_path in segment_paths:
+                f.write(f"file '{os.path.basename(segment_path)}'\n")
+        
+        cmd = [
+            "ffmpeg",
+            "-y",
+            "-f", "concat",
+            "-safe", "0",
+            "-i", concat_list,
+            "-i", video_path,
+            "-map", "0:v",
+            "-map", "1:a?",
+            "-c", "copy",
+            output_path
+        ]
+        
+        await run_ffmpeg(cmd, "Segment concatenation failed")
+        
+        return output_path
+    
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
 def update_job_status(
     job_id: str,
     status: ProcessingStatus,
     progress: int = 0,
     message: str = "",
     result_url: Optional[str] = None,
-    error: Optional[str] = None
+    error: Optional[str] = None,
+    encode: Optional[EncodeProgress] = None,
+    variants: Optional[List[VariantResult]] = None,
+    output_key: Optional[str] = None,
 ):
-    """Update job status in storage."""
+    """Update job status in storage and notify subscribers."""
     if job_id not in jobs:
         return
     
@@ -155,12 +610,391 @@ def update_job_status(
     job.status = status
     job.progress = progress
     job.message = message
+    job.encode = encode
     job.updated_at = datetime.utcnow()
     
     if result_url:
         job.result_url = result_url
     if error:
         job.error = error
+    if variants:
+        job.variants = variants
+    if output_key:
+        job.output_key = output_key
+    
+    for queue in job_subscribers.get(job_id, ()):
+        if queue.full():
+            queue.get_nowait()  # Slow listener: drop the oldest update
+        queue.put_nowait(job.model_copy(deep=True))
+
+
+def subscribe_job(job_id: str) -> asyncio.Queue:
+    """Get a queue that receives a JobStatus snapshot on every update."""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+    job_subscribers.setdefault(job_id, set()).add(queue)
+    return queue
+
+
+def unsubscribe_job(job_id: str, queue: asyncio.Queue):
+    """Stop delivering updates to a queue from subscribe_job()."""
+    subscribers = job_subscribers.get(job_id)
+    if subscribers:
+        subscribers.discard(queue)
+        if not subscribers:
+            del job_subscribers[job_id]
+
+
+def encode_progress_reporter(
+    job_id: str,
+    status: ProcessingStatus,
+    start: int,
+    end: int,
+    message: str,
+    duration: float = 0.0,
+) -> ProgressCallback:
+    """
+    Build an FFmpeg progress callback that moves the job from `start` to
+    `end` percent as the encode advances through `duration` seconds.
+    """
+    def report(progress: dict):
+        total_ms = int(duration * 1000) or progress["duration_ms"] or 0
+        fraction = min(progress["out_time_ms"] / total_ms, 1.0) if total_ms else 0.0
+        
+        eta_seconds = None
+        if progress["speed"] and total_ms:
+            remaining_ms = max(total_ms - progress["out_time_ms"], 0)
+            eta_seconds = round(remaining_ms / 1000 / progress["speed"], 1)
+        
+        update_job_status(
+            job_id,
+            status,
+            start + int(fraction * (end - start)),
+            message,
+            encode=EncodeProgress(
+                frame=progress["frame"],
+                fps=progress["fps"],
+                speed=progress["speed"],
+                out_time_ms=progress["out_time_ms"],
+                duration_ms=total_ms,
+                percent=round(fraction * 100, 1),
+                eta_seconds=eta_seconds,
+            ),
+        )
+    
+    return report
+
+
+ASPECT_RATIOS = {
+    AspectRatio.VERTICAL: (9, 16),
+    AspectRatio.SQUARE: (1, 1),
+    AspectRatio.PORTRAIT: (4, 5),
+    AspectRatio.LANDSCAPE: (16, 9),
+}
+
+
+def variant_frame(width: int, height: int, variant: OutputVariant) -> Tuple[int, int, str]:
+    """Output size of a variant and the FFmpeg filter that reshapes the source frame to it."""
+    if variant.aspect_ratio == AspectRatio.SOURCE:
+        return width, height, ""
+    
+    num, den = ASPECT_RATIOS[variant.aspect_ratio]
+    source_is_wider = width * den > height * num
+    crop = variant.fit == FrameFit.CROP
+    if crop == source_is_wider:
+        out_width, out_height = height * num // den, height
+    else:
+        out_width, out_height = width, width * den // num
+    
+    # H.264 needs even sizes: round in, to stay inside a crop, or out, to cover a pad
+    if crop:
+        out_width -= out_width % 2
+        out_height -= out_height % 2
+        return out_width, out_height, f"crop={out_width}:{out_height}"
+    out_width += out_width % 2
+    out_height += out_height % 2
+    return out_width, out_height, f"pad={out_width}:{out_height}:(ow-iw)/2:(oh-ih)/2"
+
+
+def get_output_path(video_path: str, job_id: str, request: ProcessRequest) -> str:
+    """Output location for a job; unique per job so restyles don't overwrite each other."""
+    settings = get_settings()
+    base_name = Path(video_path).stem
+    extension = request.container.value if request.output_mode == OutputMode.SOFT else "mp4"
+    return os.path.join(settings.output_dir, f"{base_name}_{job_id}_captioned.{extension}")
+
+
+async def render_captions(
+    job_id: str,
+    video_path: str,
+    words: WordTimeline,
+    video_info: dict,
+    request: ProcessRequest,
+    output_path: str,
+) -> str:
+    """
+    Generate the ASS file for a transcript and burn it onto the video.
+    
+    Long videos are split at keyframes and burned in parallel, holding one
+    CPU slot per segment. In soft mode the subtitles are muxed as a track
+    instead, without re-encoding.
+    """
+    settings = get_settings()
+    scheduler = get_scheduler()
+    subtitle_base = os.path.join(settings.temp_dir, f"{Path(video_path).stem}_{job_id}")
+    
+    soft = request.output_mode == OutputMode.SOFT
+    if soft and request.container == OutputContainer.WEBM and video_info["codec"] not in WEBM_VIDEO_CODECS:
+        raise ProcessingError(
+            f"WebM output needs a VP8/VP9/AV1 source (got {video_info['codec']}); use mp4 or mkv"
+        )
+    
+    segments = [(0.0, video_info["duration"])]
+    # One encoder per segment, and never more encoders than the CPU slots a job can hold
+    segment_count = min(settings.parallel_burn_segments or scheduler.workers(CPU_STAGE), scheduler.workers(CPU_STAGE))
+    if not soft and segment_count > 1 and video_info["duration"] >= settings.parallel_burn_min_duration:
+        segments = plan_segments(await get_keyframes(video_path), video_info["duration"], segment_count)
+    
+    # Use local fonts dir or /fonts in Docker
+    fonts_dir = settings.fonts_dir
+    if os.path.isdir("/fonts"):
+        fonts_dir = "/fonts"
+    
+    subtitle_paths = []
+    
+    try:
+        async with scheduler.stage(CPU_STAGE, slots=len(segments)):
+            update_job_status(job_id, ProcessingStatus.GENERATING_SUBTITLES, 60, "Generating captions...")
+            
+            for i, (start, end) in enumerate(segments):
+                is_last = i == len(segments) - 1
+                subtitle_path = f"{subtitle_base}.ass" if len(segments) == 1 else f"{subtitle_base}_{i:03d}.ass"
+                subtitle_paths.append(subtitle_path)
+                await run_cpu(
+                    save_ass_subtitle,
+                    subtitle_path,
+                    words,
+                    style=request.style,
+                    font=request.font,
+                    position=request.position,
+                    words_per_line=request.words_per_line,
+                    video_width=video_info["width"],
+                    video_height=video_info["height"],
+                    offset_ms=round(start * 1000),
+                    end_ms=None if is_last else round(end * 1000),
+                )
+            
+            if soft:
+                message = "Adding caption track..."
+                update_job_status(job_id, ProcessingStatus.BURNING_CAPTIONS, 80, message)
+                await mux_subtitles(
+                    video_path, subtitle_paths[0], output_path, request.container, request.language,
+                    on_progress=encode_progress_reporter(
+                        job_id, ProcessingStatus.BURNING_CAPTIONS, 80, 99, message, video_info["duration"]
+                    ),
+                    audio_codec=video_info.get("audio_codec"),
+                )
+                return output_path
+            
+            message = "Burning captions onto video..."
+            update_job_status(job_id, ProcessingStatus.BURNING_CAPTIONS, 80, message)
+            on_progress = encode_progress_reporter(
+                job_id, ProcessingStatus.BURNING_CAPTIONS, 80, 99, message, video_info["duration"]
+            )
+            
+            if len(segments) == 1:
+                await burn_captions(video_path, subtitle_paths[0], output_path, fonts_dir, on_progress)
+            else:
+                await burn_captions_parallel(video_path, segments, subtitle_paths, output_path, fonts_dir, on_progress)
+    finally:
+        for subtitle_path in subtitle_paths:
+            if os.path.exists(subtitle_path):
+                os.remove(subtitle_path)
+    
+    return output_path
+
+
+def get_variant_output_path(video_path: str, job_id: str, name: str) -> str:
+    settings = get_settings()
+    return os.path.join(settings.output_dir, f"{Path(video_path).stem}_{job_id}_{name}.mp4")
+
+
+async def render_variants(
+    job_id: str,
+    video_path: str,
+    words: WordTimeline,
+    video_info: dict,
+    request: ProcessRequest,
+) -> Dict[str, str]:
+    """
+    Render every output variant of a request, decoding the source once per batch.
+    
+    Each variant gets its own ASS file, generated at its output frame size
+    so captions are sized and placed for that shape. A run encodes one
+    variant per CPU slot it holds, so with more variants than CPU workers
+    they are rendered in several runs. Returns variant name -> output path.
+    """
+    settings = get_settings()
+    scheduler = get_scheduler()
+    subtitle_base = os.path.join(settings.temp_dir, f"{Path(video_path).stem}_{job_id}")
+    batch_size = scheduler.workers(CPU_STAGE)
+    batches = [request.variants[i:i + batch_size] for i in range(0, len(request.variants), batch_size)]
+    
+    outputs = {}
+    subtitle_paths = []
+    
+    try:
+        for number, batch in enumerate(batches, 1):
+            async with scheduler.stage(CPU_STAGE, slots=len(batch)):
+                update_job_status(job_id, ProcessingStatus.GENERATING_SUBTITLES, 60, "Generating captions...")
+                
+                branches = []
+                for variant in batch:
+                    width, height, frame_filter = variant_frame(video_info["width"], video_info["height"], variant)
+                    subtitle_path = f"{subtitle_base}_{variant.name}.ass"
+                    subtitle_paths.append(subtitle_path)
+                    await run_cpu(
+                        save_ass_subtitle,
+                        subtitle_path,
+                        words,
+                        style=variant.style or request.style,
+                        font=variant.font or request.font,
+                        position=variant.position or request.position,
+                        words_per_line=variant.words_per_line or request.words_per_line,
+                        video_width=width,
+                        video_height=height,
+                    )
+                    
+                    output_path = get_variant_output_path(video_path, job_id, variant.name)
+                    branches.append((frame_filter, subtitle_path, output_path))
+                    outputs[variant.name] = output_path
+                
+                message = f"Burning captions onto {len(branches)} variants..."
+                if len(batches) > 1:
+                    message = f"Burning captions onto {len(branches)} variants (run {number} of {len(batches)})..."
+                update_job_status(job_id, ProcessingStatus.BURNING_CAPTIONS, 80, message)
+                await burn_variants(
+                    video_path, branches,
+                    on_progress=encode_progress_reporter(
+                        job_id, ProcessingStatus.BURNING_CAPTIONS, 80, 99, message, video_info["duration"]
+                    ),
+                )
+    finally:
+        for subtitle_path in subtitle_paths:
+            if os.path.exists(subtitle_path):
+                os.remove(subtitle_path)
+    
+    return outputs
+
+
+def variant_results(
+    job_id: str,
+    request: ProcessRequest,
+    video_info: dict,
+    output_keys: Optional[Dict[str, str]] = None,
+) -> List[VariantResult]:
+    """Download links, frame sizes and R2 object keys of a request's variants."""
+    results = []
+    for variant in request.variants:
+        width, height, _ = variant_frame(video_info["width"], video_info["height"], variant)
+        results.append(VariantResult(
+            name=variant.name,
+            aspect_ratio=variant.aspect_ratio,
+            width=width,
+            height=height,
+            download_url=f"/download/{job_id}/{variant.name}",
+            object_key=(output_keys or {}).get(variant.name),
+        ))
+    return results
+
+
+async def render_outputs(
+    job_id: str,
+    video_path: str,
+    words: WordTimeline,
+    video_info: dict,
+    request: ProcessRequest,
+) -> Dict[str, str]:
+    """Render a job's variants, or its single output (named "default"). Returns name -> path."""
+    if request.variants:
+        return await render_variants(job_id, video_path, words, video_info, request)
+    
+    output_path = get_output_path(video_path, job_id, request)
+    await render_captions(job_id, video_path, words, video_info, request, output_path)
+    return {DEFAULT_OUTPUT: output_path}
+
+
+# Content type of each output container
+OUTPUT_MEDIA_TYPES = {
+    ".mp4": "video/mp4",
+    ".mkv": "video/x-matroska",
+    ".webm": "video/webm",
+}
+
+# Pending removals of local copies of published outputs
+_expiring_outputs: set[asyncio.Task] = set()
+
+
+def get_output_key(job_id: str, output_path: str) -> str:
+    return f"outputs/{job_id}/{Path(output_path).name}"
+
+
+def get_download_name(video_id: str, output_path: str, variant: Optional[str] = None) -> str:
+    """Filename an output is saved as: captioned_<video_id>[_<variant>].<ext>"""
+    suffix = f"_{variant}" if variant and variant != DEFAULT_OUTPUT else ""
+    return f"captioned_{video_id}{suffix}{Path(output_path).suffix}"
+
+
+async def _remove_later(paths: List[str], delay: float):
+    await asyncio.sleep(delay)
+    for path in paths:
+        if os.path.exists(path):
+            await run_io(os.remove, path)
+
+
+def expire_local_outputs(paths: List[str], delay: float):
+    """Delete local copies of published outputs once their hot window has passed."""
+    task = asyncio.get_running_loop().create_task(_remove_later(paths, delay))
+    _expiring_outputs.add(task)
+    task.add_done_callback(_expiring_outputs.discard)
+
+
+async def publish_outputs(job_id: str, outputs: Dict[str, str]) -> Dict[str, str]:
+    """
+    Upload a job's outputs to R2 so downloads are served from there.
+    
+    Returns output name -> object key, or nothing when R2 isn't configured,
+    publishing is off or any upload fails (the outputs are then served from
+    local disk, and the objects that did upload are removed). Local copies
+    are kept for `local_output_hot_seconds`.
+    """
+    settings = get_settings()
+    if not settings.r2_publish_outputs or not storage.is_configured():
+        return {}
+    
+    update_job_status(job_id, ProcessingStatus.UPLOADING, 99, "Uploading to storage...")
+    output_keys = {name: get_output_key(job_id, path) for name, path in outputs.items()}
+    video_id = jobs[job_id].video_id
+    
+    async with get_scheduler().stage(NETWORK_STAGE):
+        results = await asyncio.gather(*(
+            storage.upload_file_async(
+                path,
+                output_keys[name],
+                OUTPUT_MEDIA_TYPES.get(Path(path).suffix, "video/mp4"),
+                get_download_name(video_id, path, name),
+            )
+            for name, path in outputs.items()
+        ), return_exceptions=True)
+    
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        print(f"⚠️ Publishing job {job_id} to storage failed, serving it locally: {errors[0]}")
+        uploaded = [key for key, result in zip(output_keys.values(), results) if not isinstance(result, BaseException)]
+        await asyncio.gather(*(storage.delete_file_async(key) for key in uploaded))
+        return {}
+    
+    expire_local_outputs(list(outputs.values()), settings.local_output_hot_seconds)
+    return output_keys
 
 
 async def process_video(
@@ -170,95 +1004,95 @@ async def process_video(
 ) -> str:
     """
     Complete video processing pipeline:
-    1. Extract audio from video
+    1. Probe video and extract audio (single FFmpeg pass, in memory)
     2. Transcribe audio with AssemblyAI
     3. Generate ASS subtitle file
     4. Burn captions onto video
+    5. Publish to R2 (when configured)
     
     Returns the path to the processed video.
     """
-    settings = get_settings()
-    
-    # Create unique filenames
-    base_name = Path(video_path).stem
-    audio_path = os.path.join(settings.temp_dir, f"{base_name}_audio.wav")
-    subtitle_path = os.path.join(settings.temp_dir, f"{base_name}.ass")
-    output_path = os.path.join(settings.output_dir, f"{base_name}_captioned.mp4")
+    scheduler = get_scheduler()
     
     try:
-        # Step 1: Get video info
-        video_info = get_video_info(video_path)
+        update_job_status(job_id, ProcessingStatus.PENDING, 0, "Waiting for a worker...")
         
-        # Step 2: Extract audio
-        update_job_status(job_id, ProcessingStatus.EXTRACTING_AUDIO, 10, "Extracting audio...")
-        await extract_audio(video_path, audio_path)
+        # Step 1-2: Get video info and extract audio in one FFmpeg pass
+        async with scheduler.stage(CPU_STAGE):
+            message = "Extracting audio..."
+            update_job_status(job_id, ProcessingStatus.EXTRACTING_AUDIO, 10, message)
+            video_info, audio = await ingest_media(
+                video_path,
+                on_progress=encode_progress_reporter(job_id, ProcessingStatus.EXTRACTING_AUDIO, 10, 29, message),
+            )
         
         # Step 3: Transcribe
         update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 30, "Transcribing audio...")
         
+        # Re-runs of the same audio (e.g. a new caption style) reuse the cached transcript
+        cache = get_transcript_cache()
+        
         # Use Sarvam AI for Hinglish, AssemblyAI for other languages
         if request.language == 'hinglish':
             if not SARVAM_AVAILABLE:
                 raise ProcessingError("Sarvam AI not available. Please check SARVAM_API_KEY configuration.")
             
-            update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 32, "Using Sarvam AI for Hinglish...")
-            try:
-                transcript = await transcribe_audio_sarvam(audio_path, language_code="hi-IN", output_script="hinglish")
-            except Exception as e:
-                raise ProcessingError(f"Sarvam transcription failed: {str(e)}")
+            # Hashing releases the GIL, so it runs on the I/O pool with the cache read
+            cache_key = await run_io(cache.make_key, audio, "sarvam:hinglish", "hi-IN")
+            transcript = await run_io(cache.get, cache_key)
+            
+            if transcript is None:
+                update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 32, "Using Sarvam AI for Hinglish...")
+                try:
+                    async with scheduler.stage(NETWORK_STAGE):
+                        transcript = await transcribe_audio_sarvam_chunked(audio, language_code="hi-IN", output_script="hinglish")
+                except Exception as e:
+                    raise ProcessingError(f"Sarvam transcription failed: {str(e)}")
+                await run_io(cache.put, cache_key, transcript)
             
-            # Apply misspelling correction
+            # Apply misspelling correction (once per distinct word)
             update_job_status(job_id, ProcessingStatus.TRANSCRIBING, 38, "Applying Hinglish corrections...")
-            corrected_words = []
-            for word in transcript.words:
-                corrected_text = correct_common_hinglish_misspellings(word.text)
-                corrected_words.append(Word(
-                    text=corrected_text,
-                    start=word.start,
-                    end=word.end,
-                    confidence=word.confidence
-                ))
-            transcript.words = corrected_words
-            transcript.text = correct_common_hinglish_misspellings(transcript.text)
+            corrector = get_corrector()
+            words = WordTimeline.from_words(transcript.words).map_text(corrector.correct_texts)
+            transcript.text = corrector.correct(transcript.text)
             
         else:
             # Use AssemblyAI for other languages
-            transcript = await transcribe_audio(audio_path, request.get_transcription_language())
+            language = request.get_transcription_language()
+            cache_key = await run_io(cache.make_key, audio, "assemblyai", language)
+            transcript = await run_io(cache.get, cache_key)
+            
+            if transcript is None:
+                async with scheduler.stage(NETWORK_STAGE):
+                    transcript = await transcribe_audio(
+                        audio, language, audio_duration=video_info["duration"]
+                    )
+                await run_io(cache.put, cache_key, transcript)
+            words = WordTimeline.from_words(transcript.words)
         
-        if not transcript.words:
+        if not len(words):
             raise ProcessingError("No speech detected in video")
         
-        # Step 4: Generate subtitles
-        update_job_status(job_id, ProcessingStatus.GENERATING_SUBTITLES, 60, "Generating captions...")
-        ass_content = generate_ass_subtitle(
-            words=transcript.words,
-            style=request.style,
-            font=request.font,
-            position=request.position,
-            words_per_line=request.words_per_line,
-            video_width=video_info["width"],
-            video_height=video_info["height"],
-        )
-        
-        with open(subtitle_path, "w", encoding="utf-8") as f:
-            f.write(ass_content)
-        
-        # Step 5: Burn captions
-        update_job_status(job_id, ProcessingStatus.BURNING_CAPTIONS, 80, "Burning captions onto video...")
-        
-        # Use local fonts dir or /fonts in Docker
-        fonts_dir = settings.fonts_dir
-        if os.path.isdir("/fonts"):
-            fonts_dir = "/fonts"
+        # Step 4-5: Generate subtitles and burn captions
+        outputs = await render_outputs(job_id, video_path, words, video_info, request)
+        output_path = next(iter(outputs.values()))
         
-        await burn_captions(video_path, subtitle_path, output_path, fonts_dir)
+        # Step 6: Publish to R2, so downloads don't go through this server
+        output_keys = await publish_outputs(job_id, outputs)
         
-        # Cleanup temp files
-        for temp_file in [audio_path, subtitle_path]:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-        
-        update_job_status(job_id, ProcessingStatus.COMPLETED, 100, "Processing complete!", output_path)
+        job_artifacts[job_id] = {
+            "video_path": video_path,
+            "video_info": video_info,
+            "words": words,
+            "request": request,
+            "outputs": outputs,
+            "output_keys": output_keys,
+        }
+        update_job_status(
+            job_id, ProcessingStatus.COMPLETED, 100, "Processing complete!", output_path,
+            variants=variant_results(job_id, request, video_info, output_keys),
+            output_key=next(iter(output_keys.values()), None),
+        )
         
         return output_path
         
@@ -289,3 +1123,46 @@ def create_job(video_id: str) -> JobStatus:
 def get_job(job_id: str) -> Optional[JobStatus]:
     """Get job status by ID."""
     return jobs.get(job_id)
+
+
+def get_job_artifacts(job_id: str) -> Optional[dict]:
+    """Get the reusable transcript and video info of a finished job."""
+    return job_artifacts.get(job_id)
+
+
+async def restyle_video(
+    job_id: str,
+    source_job_id: str,
+    request: ProcessRequest,
+) -> str:
+    """
+    Re-render a finished job with a new caption look.
+    
+    Reuses the source job's transcript words and video info, so only the
+    subtitle generation and caption burning steps run.
+    """
+    try:
+        # The source job may have been deleted since the restyle was accepted
+        source = job_artifacts.get(source_job_id)
+        if source is None:
+            raise ProcessingError("Source job no longer available")
+        video_path = source["video_path"]
+        
+        update_job_status(job_id, ProcessingStatus.PENDING, 0, "Waiting for a worker...")
+        
+        outputs = await render_outputs(job_id, video_path, source["words"], source["video_info"], request)
+        output_path = next(iter(outputs.values()))
+        output_keys = await publish_outputs(job_id, outputs)
+        
+        job_artifacts[job_id] = {**source, "request": request, "outputs": outputs, "output_keys": output_keys}
+        update_job_status(
+            job_id, ProcessingStatus.COMPLETED, 100, "Processing complete!", output_path,
+            variants=variant_results(job_id, request, source["video_info"], output_keys),
+            output_key=next(iter(output_keys.values()), None),
+        )
+        
+        return output_path
+        
+    except Exception as e:
+        update_job_status(job_id, ProcessingStatus.FAILED, 0, str(e), error=str(e))
+        raise
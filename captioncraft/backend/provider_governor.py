@@ -0,0 +1,166 @@
+"""Per-provider rate limiting shared by all jobs: token bucket, in-flight cap, 429 backoff."""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from config import get_settings
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ProviderGovernor:
+    """
+    Admission control for one transcription provider.
+
+    Requests take a token from a bucket refilled at `rate` per second (up to
+    `burst`) and a slot from a fixed in-flight pool. A 429 pauses the whole
+    provider for its Retry-After (or an exponential backoff) and the request
+    is requeued rather than failed. Time spent waiting is recorded, so
+    /health shows whether jobs are held up by provider quota or by our own
+    CPU stages.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_in_flight: int, max_retries: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.loop = asyncio.get_running_loop()
+
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._bucket = asyncio.Lock()  # FIFO: first caller in line gets the next token
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._waiting = 0
+
+        self.requests = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def _take_token(self):
+        async with self._bucket:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def _acquire(self):
+        started = time.monotonic()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - started
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        self._in_flight += 1
+
+    def _release(self):
+        self._in_flight -= 1
+        self._slots.release()
+
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def call(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        Send a request through the governor.
+
+        `send` is called again for each retry, so it must build a fresh
+        request (streamed bodies can only be read once). Returns the last
+        response, which is still a 429 if retries ran out.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self._acquire()
+            try:
+                self.requests += 1
+                response = await send()
+            finally:
+                self._release()
+
+            if response.status_code != 429 or attempt == self.max_retries:
+                return response
+
+            self.throttled += 1
+            delay = parse_retry_after(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = (2 ** attempt) * random.uniform(0.5, 1.0)
+            print(f"⏳ {self.name} rate limited; retrying in {delay:.1f}s")
+            self._pause(delay)
+
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "max_in_flight": self.max_in_flight,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "requests": self.requests,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+        }
+
+
+# One governor per provider, shared by every job in the process
+governors: dict[str, ProviderGovernor] = {}
+
+
+def get_governor(provider: str) -> ProviderGovernor:
+    """The shared governor for "assemblyai" or "sarvam" (recreated if the event loop changed)."""
+    governor = governors.get(provider)
+    if governor is None or governor.loop is not asyncio.get_running_loop():
+        settings = get_settings()
+        governor = ProviderGovernor(
+            provider,
+            rate=getattr(settings, f"{provider}_rate_limit"),
+            burst=getattr(settings, f"{provider}_burst"),
+            max_in_flight=getattr(settings, f"{provider}_max_in_flight"),
+            max_retries=settings.provider_max_retries,
+        )
+        governors[provider] = governor
+    return governor
+
+
+def governor_stats() -> dict:
+    return {name: governor.stats() for name, governor in governors.items()}
@@ -1,9 +1,20 @@
 """Sarvam AI transcription integration for Hinglish."""
 import asyncio
+import io
+import random
+import wave
+from typing import List, Optional, Tuple, Union
+
 import httpx
-from typing import List, Optional
+import numpy as np
+
 from models import Word, TranscriptResult
 from config import get_settings
+from http_clients import get_http_client, provider_timeout
+from provider_governor import get_governor
+from hinglish_corrections import get_corrector
+from media_probe import ProbeError, get_media_probe
+from offload import read_file, run_cpu
 
 SARVAM_BASE_URL = "https://api.sarvam.ai"
 
@@ -13,21 +24,60 @@ SARVAM_AVAILABLE = True
 
 class SarvamTranscriptionError(Exception):
     """Error during Sarvam transcription."""
-    pass
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+    
+    @property
+    def retryable(self) -> bool:
+        # 429s are retried by the provider governor, which honours Retry-After
+        return self.status_code is not None and self.status_code >= 500
+
+
+def sarvam_base_url() -> str:
+    return get_settings().sarvam_base_url or SARVAM_BASE_URL
+
+
+async def _audio_duration_ms(audio: Union[str, bytes]) -> Optional[int]:
+    """Duration of WAV bytes or an audio file, if it can be determined."""
+    if isinstance(audio, bytes):
+        try:
+            with wave.open(io.BytesIO(audio), "rb") as wav:
+                return int(wav.getnframes() * 1000 / wav.getframerate())
+        except (wave.Error, EOFError):
+            return None
+    
+    try:
+        info = await get_media_probe().info(audio)
+    except ProbeError:
+        return None
+    return int(info["duration"] * 1000) or None
+
+
+async def transliterate_texts(texts: List[str]) -> List[str]:
+    """Devanagari → Hinglish for a batch of texts, on the CPU pool."""
+    # Import transliterator for Hinglish conversion
+    from hinglish_transliterator import transliterate_batch
+    
+    return await run_cpu(transliterate_batch, texts)
 
 
 async def transcribe_audio_sarvam(
-    audio_path: str,
+    audio: Union[str, bytes],
     language_code: str = "hi-IN",  # Hindi/Hinglish
     output_script: str = "hinglish",  # "hinglish" or "devanagari"
+    allow_empty: bool = False,
 ) -> TranscriptResult:
     """
     Transcribe audio using Sarvam AI.
     
     Args:
-        audio_path: Path to local audio file
+        audio: Path to local audio file, or WAV bytes
         language_code: Language code (default 'hi-IN' for Hindi/Hinglish)
         output_script: "hinglish" for Roman script, "devanagari" for Hindi script
+        allow_empty: Return no words for silent audio instead of a placeholder
+            (chunks of a longer file; the stitched result gets the placeholder)
     
     Returns:
         TranscriptResult with word-level timestamps
@@ -37,136 +87,119 @@ async def transcribe_audio_sarvam(
     if not settings.sarvam_api_key:
         raise SarvamTranscriptionError("SARVAM_API_KEY not configured")
     
-    # Import transliterator for Hinglish conversion
-    from hinglish_transliterator import devanagari_to_hinglish, transliterate_batch
-    
     # Read audio file content first
-    with open(audio_path, "rb") as f:
-        audio_content = f.read()
+    if isinstance(audio, bytes):
+        audio_content = audio
+    else:
+        audio_content = await read_file(audio)
     
-    async with httpx.AsyncClient() as client:
-        # Build multipart form data with file content
-        files = {"file": ("audio.wav", audio_content, "audio/wav")}
-        data = {"language_code": language_code}
-        
-        response = await client.post(
-            f"{SARVAM_BASE_URL}/speech-to-text",
-            headers={
-                "api-subscription-key": settings.sarvam_api_key,
-            },
-            data=data,
-            files=files,
-            timeout=300.0,
+    client = get_http_client()
+    # Build multipart form data with file content
+    files = {"file": ("audio.wav", audio_content, "audio/wav")}
+    data = {"language_code": language_code}
+    
+    response = await get_governor("sarvam").call(lambda: client.post(
+        f"{sarvam_base_url()}/speech-to-text",
+        headers={
+            "api-subscription-key": settings.sarvam_api_key,
+        },
+        data=data,
+        files=files,
+        timeout=provider_timeout("sarvam"),
+    ))
+    
+    print(f"Sarvam API Response Status: {response.status_code}")
+    
+    if response.status_code != 200:
+        raise SarvamTranscriptionError(
+            f"Transcription failed: {response.status_code} - {response.text}",
+            response.status_code,
         )
+    
+    result = response.json()
+    print(f"Sarvam API Response: {result}")
+    
+    # Parse the response - Sarvam returns transcript with optional timestamps
+    full_text = result.get("transcript", result.get("text", ""))
+    
+    # Parse word-level timestamps if available
+    words = []
+    word_data_list = []
+    
+    if "timestamped_transcript" in result and result["timestamped_transcript"]:
+        # Format with word timestamps
+        for item in result["timestamped_transcript"]:
+            word_data_list.append({
+                "text": item.get("word", ""),
+                "start": int(item.get("start_time", 0) * 1000),
+                "end": int(item.get("end_time", 0) * 1000),
+                "confidence": item.get("confidence", 1.0),
+            })
+    elif "words" in result and result["words"]:
+        # Alternative format
+        for word_data in result["words"]:
+            word_data_list.append({
+                "text": word_data.get("word", word_data.get("text", "")),
+                "start": int(word_data.get("start", word_data.get("start_time", 0)) * 1000),
+                "end": int(word_data.get("end", word_data.get("end_time", 0)) * 1000),
+                "confidence": word_data.get("confidence", 1.0),
+            })
+    
+    # Convert Devanagari to Hinglish if requested: words and full text in one batch
+    if output_script == "hinglish":
+        print(f"Converting Devanagari to Hinglish...")
+        texts = [w["text"] for w in word_data_list] + [full_text]
+        converted = await transliterate_texts(texts)
+        full_text = converted.pop()
+        for word_data, text in zip(word_data_list, converted):
+            word_data["text"] = text
+        print(f"Converted text: {full_text[:100]}...")
+    
+    for word_data in word_data_list:
+        words.append(Word(
+            text=word_data["text"],
+            start=word_data["start"],
+            end=word_data["end"],
+            confidence=word_data["confidence"],
+        ))
+    
+    # If no word timestamps from API, split the text ourselves
+    if not words and full_text:
+        import re
         
-        print(f"Sarvam API Response Status: {response.status_code}")
-        
-        if response.status_code != 200:
-            raise SarvamTranscriptionError(
-                f"Transcription failed: {response.status_code} - {response.text}"
-            )
-        
-        result = response.json()
-        print(f"Sarvam API Response: {result}")
-        
-        # Parse the response - Sarvam returns transcript with optional timestamps
-        full_text = result.get("transcript", result.get("text", ""))
-        
-        # Convert Devanagari to Hinglish if requested
-        if output_script == "hinglish":
-            print(f"Converting Devanagari to Hinglish...")
-            full_text = devanagari_to_hinglish(full_text)
-            print(f"Converted text: {full_text[:100]}...")
-        
-        # Parse word-level timestamps if available
-        words = []
-        word_data_list = []
+        # Get actual audio duration if possible
+        audio_duration_ms = await _audio_duration_ms(audio) or 60000  # Default 60s fallback
         
-        if "timestamped_transcript" in result and result["timestamped_transcript"]:
-            # Format with word timestamps
-            for item in result["timestamped_transcript"]:
-                word_data_list.append({
-                    "text": item.get("word", ""),
-                    "start": int(item.get("start_time", 0) * 1000),
-                    "end": int(item.get("end_time", 0) * 1000),
-                    "confidence": item.get("confidence", 1.0),
-                })
-        elif "words" in result and result["words"]:
-            # Alternative format
-            for word_data in result["words"]:
-                word_data_list.append({
-                    "text": word_data.get("word", word_data.get("text", "")),
-                    "start": int(word_data.get("start", word_data.get("start_time", 0)) * 1000),
-                    "end": int(word_data.get("end", word_data.get("end_time", 0)) * 1000),
-                    "confidence": word_data.get("confidence", 1.0),
-                })
+        # Split into words (handle both Hinglish and Devanagari)
+        text_words = re.findall(r'\S+', full_text)
         
-        # Batch transliterate words if Hinglish output requested
-        if word_data_list and output_script == "hinglish":
-            word_texts = [w["text"] for w in word_data_list]
-            transliterated_texts = transliterate_batch(word_texts)
+        if text_words:
+            # Distribute words evenly across duration
+            word_duration = audio_duration_ms // len(text_words)
             
-            for i, word_data in enumerate(word_data_list):
-                words.append(Word(
-                    text=transliterated_texts[i],
-                    start=word_data["start"],
-                    end=word_data["end"],
-                    confidence=word_data["confidence"],
-                ))
-        elif word_data_list:
-            # No transliteration needed
-            for word_data in word_data_list:
+            for i, word_text in enumerate(text_words):
+                start_ms = i * word_duration
+                end_ms = min((i + 1) * word_duration, audio_duration_ms)
                 words.append(Word(
-                    text=word_data["text"],
-                    start=word_data["start"],
-                    end=word_data["end"],
-                    confidence=word_data["confidence"],
+                    text=word_text,
+                    start=start_ms,
+                    end=end_ms,
+                    confidence=1.0,
                 ))
-        
-        # If no word timestamps from API, split the text ourselves
-        if not words and full_text:
-            import re
-            
-            # Get actual audio duration if possible
-            audio_duration_ms = 60000  # Default 60s fallback
-            try:
-                import subprocess
-                result = subprocess.run(
-                    ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-                     "-of", "default=noprint_wrappers=1:nokey=1", audio_path],
-                    capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    audio_duration_ms = int(float(result.stdout.strip()) * 1000)
-            except Exception:
-                pass
-            
-            # Split into words (handle both Hinglish and Devanagari)
-            text_words = re.findall(r'\S+', full_text)
-            
-            if text_words:
-                # Distribute words evenly across duration
-                word_duration = audio_duration_ms // len(text_words)
-                
-                for i, word_text in enumerate(text_words):
-                    start_ms = i * word_duration
-                    end_ms = min((i + 1) * word_duration, audio_duration_ms)
-                    words.append(Word(
-                        text=word_text,
-                        start=start_ms,
-                        end=end_ms,
-                        confidence=1.0,
-                    ))
-        
-        if not words:
-            # Absolute fallback
-            words = [Word(text=full_text or "No transcription", start=0, end=60000, confidence=1.0)]
-        
-        return TranscriptResult(
-            words=words,
-            text=full_text,
-            language=language_code,
-        )
+    
+    if not words and not allow_empty:
+        words = _placeholder_words(full_text)
+    
+    return TranscriptResult(
+        words=words,
+        text=full_text,
+        language=language_code,
+    )
+
+
+def _placeholder_words(text: str) -> List[Word]:
+    """Absolute fallback when no words could be timed: one caption for the whole clip."""
+    return [Word(text=text or "No transcription", start=0, end=60000, confidence=1.0)]
 
 
 async def transcribe_from_url_sarvam(
@@ -180,28 +213,190 @@ async def transcribe_from_url_sarvam(
     Note: Sarvam requires file upload, so we download first then upload.
     """
     # Download the audio file first
-    async with httpx.AsyncClient() as client:
-        response = await client.get(audio_url, timeout=60.0)
-        if response.status_code != 200:
-            raise SarvamTranscriptionError(f"Failed to download audio: {response.status_code}")
-        
-        # Save to temp file
-        import tempfile
-        import os
-        
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp.write(response.content)
-            tmp_path = tmp.name
-        
+    client = get_http_client()
+    response = await client.get(audio_url, timeout=provider_timeout("sarvam"))
+    if response.status_code != 200:
+        raise SarvamTranscriptionError(f"Failed to download audio: {response.status_code}")
+    
+    # Save to temp file
+    import tempfile
+    import os
+    
+    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+        tmp.write(response.content)
+        tmp_path = tmp.name
+    
+    try:
+        # Transcribe
+        result = await transcribe_audio_sarvam(tmp_path, language_code, output_script)
+    finally:
+        # Cleanup
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    
+    return result
+
+
+# Chunked transcription: long audio is cut at its quietest points into pieces
+# the synchronous API accepts, which are transcribed concurrently
+VAD_FRAME_MS = 20
+VAD_SMOOTHING_FRAMES = 10  # Look for ~200ms of quiet, not a single quiet frame
+
+
+def _read_wav(audio: Union[str, bytes]) -> Optional[Tuple[np.ndarray, int]]:
+    """16-bit mono samples and sample rate of WAV bytes or a WAV file, or None."""
+    try:
+        with wave.open(io.BytesIO(audio) if isinstance(audio, bytes) else audio, "rb") as wav:
+            if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+                return None
+            return np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2"), wav.getframerate()
+    except (wave.Error, EOFError, OSError):
+        return None
+
+
+def _to_wav(samples: np.ndarray, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+def find_split_points(samples: np.ndarray, sample_rate: int, max_chunk_seconds: float) -> List[int]:
+    """
+    Sample offsets to cut audio at so no chunk exceeds `max_chunk_seconds`.
+    
+    Energy-based VAD: per-frame mean energy, smoothed over ~200ms, is computed
+    for the whole signal in one vectorized pass. Each cut goes at the quietest
+    point of the back half of the current window, which is a pause between
+    words whenever there is one.
+    """
+    frame = sample_rate * VAD_FRAME_MS // 1000
+    n_frames = len(samples) // frame
+    max_frames = int(max_chunk_seconds * 1000 // VAD_FRAME_MS)
+    
+    if n_frames <= max_frames:
+        return []
+    
+    frames = samples[:n_frames * frame].astype(np.float32).reshape(n_frames, frame)
+    energy = np.square(frames).mean(axis=1)
+    kernel = np.ones(VAD_SMOOTHING_FRAMES, dtype=np.float32) / VAD_SMOOTHING_FRAMES
+    energy = np.convolve(energy, kernel, mode="same")
+    
+    cuts = []
+    start = 0
+    min_frames = max_frames // 2
+    while n_frames - start > max_frames:
+        window = energy[start + min_frames:start + max_frames]
+        start += min_frames + int(np.argmin(window))
+        cuts.append(start * frame)
+    return cuts
+
+
+def split_audio(audio: Union[str, bytes], max_chunk_seconds: float) -> Optional[List[Tuple[int, bytes]]]:
+    """Split WAV audio at silences into (offset_ms, wav_bytes) chunks; None if not WAV."""
+    decoded = _read_wav(audio)
+    if decoded is None:
+        return None
+    
+    samples, sample_rate = decoded
+    bounds = [0, *find_split_points(samples, sample_rate, max_chunk_seconds), len(samples)]
+    return [
+        (start * 1000 // sample_rate, _to_wav(samples[start:end], sample_rate))
+        for start, end in zip(bounds, bounds[1:])
+    ]
+
+
+async def _transcribe_chunk_with_retry(
+    chunk: bytes,
+    language_code: str,
+    output_script: str,
+    semaphore: asyncio.Semaphore,
+) -> TranscriptResult:
+    """Transcribe one chunk, retrying server and network errors with backoff."""
+    retries = get_settings().sarvam_chunk_retries
+    
+    for attempt in range(retries + 1):
         try:
-            # Transcribe
-            result = await transcribe_audio_sarvam(tmp_path, language_code, output_script)
-        finally:
-            # Cleanup
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            async with semaphore:
+                return await transcribe_audio_sarvam(chunk, language_code, output_script, allow_empty=True)
+        except SarvamTranscriptionError as e:
+            if not e.retryable or attempt == retries:
+                raise
+        except httpx.TransportError as e:
+            if attempt == retries:
+                raise SarvamTranscriptionError(f"Transcription request failed: {e}")
         
-        return result
+        # Back off outside the semaphore so other chunks keep going
+        await asyncio.sleep((2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+async def transcribe_audio_sarvam_chunked(
+    audio: Union[str, bytes],
+    language_code: str = "hi-IN",
+    output_script: str = "hinglish",
+) -> TranscriptResult:
+    """
+    Transcribe long audio by splitting it at silences.
+    
+    Chunks of at most `sarvam_chunk_seconds` are sent concurrently (at most
+    `sarvam_max_concurrency` in flight), each retried on its own, and their
+    words are stitched back with start/end shifted by the chunk offset. If a
+    chunk fails for good, the others are cancelled.
+    Short or non-WAV audio goes through a single request.
+    """
+    settings = get_settings()
+    
+    chunks = None
+    if settings.sarvam_chunk_seconds > 0:
+        # Reading, VAD and re-encoding touch every sample: keep it off the event loop
+        chunks = await run_cpu(split_audio, audio, settings.sarvam_chunk_seconds)
+    
+    if not chunks or len(chunks) == 1:
+        return await transcribe_audio_sarvam(audio, language_code, output_script)
+    
+    print(f"Sarvam: transcribing {len(chunks)} chunks")
+    # Chunks come back in Devanagari; the whole transcript is converted in one batch
+    chunk_script = "devanagari" if output_script == "hinglish" else output_script
+    semaphore = asyncio.Semaphore(settings.sarvam_max_concurrency)
+    tasks = [
+        asyncio.create_task(_transcribe_chunk_with_retry(chunk, language_code, chunk_script, semaphore))
+        for _, chunk in chunks
+    ]
+    try:
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        # One chunk failed for good: the transcript is lost, so stop spending quota on the rest
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    
+    words = []
+    for (offset_ms, _), result in zip(chunks, results):
+        for word in result.words:
+            words.append(Word(
+                text=word.text,
+                start=word.start + offset_ms,
+                end=word.end + offset_ms,
+                confidence=word.confidence,
+            ))
+    text = " ".join(result.text for result in results if result.text)
+    
+    if output_script == "hinglish":
+        converted = await transliterate_texts([word.text for word in words] + [text])
+        text = converted.pop()
+        words = [
+            word if new == word.text else word.model_copy(update={"text": new})
+            for word, new in zip(words, converted)
+        ]
+    
+    if not words:
+        words = _placeholder_words(text)
+    
+    return TranscriptResult(words=words, text=text, language=language_code)
 
 
 async def batch_transcribe_sarvam(
@@ -209,11 +404,14 @@ async def batch_transcribe_sarvam(
     language_code: str = "hi-IN",
     output_script: str = "hinglish",
 ) -> List[TranscriptResult]:
-    """Transcribe multiple audio files concurrently."""
-    tasks = [
-        transcribe_audio_sarvam(path, language_code, output_script)
-        for path in audio_paths
-    ]
+    """Transcribe multiple audio files concurrently, at most `sarvam_max_concurrency` at a time."""
+    semaphore = asyncio.Semaphore(get_settings().sarvam_max_concurrency)
+    
+    async def transcribe(path: str) -> TranscriptResult:
+        async with semaphore:
+            return await transcribe_audio_sarvam(path, language_code, output_script)
+    
+    tasks = [transcribe(path) for path in audio_paths]
     return await asyncio.gather(*tasks, return_exceptions=True)
 
 
@@ -221,170 +419,11 @@ def correct_common_hinglish_misspellings(text: str) -> str:
     """
     Post-process Hinglish text to fix common misspellings.
     This adds a safety net even with Sarvam's good transcription.
+    
+    The correction table (data/hinglish_corrections.json) is compiled once;
+    use `get_corrector().correct_words()` to correct a whole transcript.
     """
-    corrections = {
-        # Common transcription errors
-        "mein": "main",
-        "hoon": "hun",
-        "tumhara": "tumara",
-        "aapka": "apka",
-        "kyun": "kyu",
-        "kyunki": "kyuki",
-        "kyoki": "kyuki",
-        "lekin": "lekin",
-        "magar": "magar",
-        "par": "par",
-        "kyu ki": "kyunki",
-        "kyun ki": "kyunki",
-        "kya": "kya",
-        "hai": "hai",
-        "hain": "hain",
-        "thi": "thi",
-        "the": "the",
-        "tha": "tha",
-        "raha": "raha",
-        "rahi": "rahi",
-        "rahe": "rahe",
-        "gaya": "gaya",
-        "gayi": "gayi",
-        "gaye": "gaye",
-        "diya": "diya",
-        "diye": "diye",
-        "liya": "liya",
-        "liye": "liye",
-        "hua": "hua",
-        "hui": "hui",
-        "hue": "hue",
-        "karna": "karna",
-        "karne": "karne",
-        "karte": "karte",
-        "karti": "karti",
-        "karta": "karta",
-        "kar raha": "kar raha",
-        "kar rahi": "kar rahi",
-        "kar rahe": "kar rahe",
-        "ho raha": "ho raha",
-        "ho rahi": "ho rahi",
-        "ho rahe": "ho rahe",
-        "chahiye": "chahiye",
-        "chahie": "chahiye",
-        "zindagi": "zindagi",
-        "jindagi": "zindagi",
-        "mujhe": "mujhe",
-        "mujhse": "mujhse",
-        "tujhe": "tujhe",
-        "tujhse": "tujhse",
-        "isse": "isse",
-        "usse": "usse",
-        "jisse": "jisse",
-        "kaise": "kaise",
-        "kab": "kab",
-        "kahan": "kahan",
-        "kidhar": "kidhar",
-        "kisne": "kisne",
-        "kisko": "kisko",
-        "kisliye": "kisliye",
-        "iske": "iske",
-        "uske": "uske",
-        "jiske": "jiske",
-        "iska": "iska",
-        "uska": "uska",
-        "jiska": "jiska",
-        "isko": "isko",
-        "usko": "usko",
-        "bhi": "bhi",
-        "hi": "hi",
-        "to": "to",
-        "se": "se",
-        "ko": "ko",
-        "ke": "ke",
-        "ka": "ka",
-        "ki": "ki",
-        "me": "mein",
-        "mein": "mein",
-        "mai": "main",
-        "main": "main",
-        "hum": "hum",
-        "tum": "tum",
-        "aap": "aap",
-        "woh": "woh",
-        "yeh": "yeh",
-        "jab": "jab",
-        "tab": "tab",
-        "agar": "agar",
-        "nahi": "nahi",
-        "na": "na",
-        "mat": "mat",
-        "matlab": "matlab",
-        "baat": "baat",
-        "sach": "sach",
-        "jhooth": "jhooth",
-        "achha": "acha",
-        "accha": "acha",
-        "bura": "bura",
-        "bahut": "bahut",
-        "zyada": "zyada",
-        "jyada": "zyada",
-        "kam": "kam",
-        "thora": "thora",
-        "thoda": "thoda",
-        "sab": "sab",
-        "kuch": "kuch",
-        "koi": "koi",
-        "har": "har",
-        "ek": "ek",
-        "do": "do",
-        "dono": "dono",
-        "aur": "aur",
-        "ya": "ya",
-        "phir": "phir",
-        "fir": "phir",
-        "pehle": "pehle",
-        "phle": "pehle",
-        "baad": "baad",
-        "baad mein": "baad mein",
-        "abhi": "abhi",
-        "ab": "ab",
-        "pehli": "pehli",
-        "doosra": "doosra",
-        "dusra": "doosra",
-        "teesra": "teesra",
-        "chautha": "chautha",
-        "aakhri": "aakhri",
-        "antim": "antim",
-        "shuru": "shuru",
-        "khatam": "khatam",
-        "poora": "poora",
-        "adha": "adha",
-        "paisa": "paisa",
-        "paise": "paise",
-        "kaam": "kaam",
-        "waqt": "waqt",
-        "din": "din",
-        "raat": "raat",
-        "subah": "subah",
-        "shaam": "shaam",
-    }
-    
-    # Apply corrections (case-insensitive but preserve case)
-    import re
-    
-    def replace_word(match):
-        word = match.group(0)
-        word_lower = word.lower()
-        if word_lower in corrections:
-            # Preserve original case pattern
-            corrected = corrections[word_lower]
-            if word.isupper():
-                return corrected.upper()
-            elif word[0].isupper():
-                return corrected.capitalize()
-            return corrected
-        return word
-    
-    # Replace whole words only
-    pattern = r'\b(' + '|'.join(re.escape(k) for k in corrections.keys()) + r')\b'
-    return re.sub(pattern, replace_word, text, flags=re.IGNORECASE)
+    return get_corrector().correct(text)
 
 
 if __name__ == "__main__":
@@ -1,27 +1,97 @@
 """Cloudflare R2 storage integration using S3-compatible API."""
-import os
+import threading
+from typing import Optional, Tuple
+
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
-from typing import Optional
+
 from config import get_settings
+from offload import run_io
 
+MB = 1024 * 1024
 
-def get_r2_client():
-    """Create an S3 client configured for Cloudflare R2."""
+_client = None
+_client_key: Optional[Tuple] = None
+_client_lock = threading.Lock()
+
+
+def r2_endpoint_url() -> str:
+    settings = get_settings()
+    return settings.r2_endpoint_url or f"https://{settings.r2_account_id}.r2.cloudflarestorage.com"
+
+
+def _create_client():
     settings = get_settings()
     
     return boto3.client(
         "s3",
-        endpoint_url=f"https://{settings.r2_account_id}.r2.cloudflarestorage.com",
+        endpoint_url=r2_endpoint_url(),
         aws_access_key_id=settings.r2_access_key_id,
         aws_secret_access_key=settings.r2_secret_access_key,
         config=Config(
             signature_version="s3v4",
             region_name="auto",
+            # Every part of a parallel transfer needs its own connection
+            max_pool_connections=max(settings.r2_max_pool_connections, settings.r2_max_concurrency),
+            tcp_keepalive=True,
+            retries={"max_attempts": settings.r2_max_attempts, "mode": "standard"},
         ),
     )
 
 
+def is_configured() -> bool:
+    """Whether R2 credentials and an account (or endpoint) are set."""
+    settings = get_settings()
+    return bool(
+        settings.r2_access_key_id
+        and settings.r2_secret_access_key
+        and (settings.r2_endpoint_url or settings.r2_account_id)
+    )
+
+
+def get_r2_client():
+    """
+    Get the shared S3 client for R2.
+    
+    Building a client loads the service model (tens of milliseconds), so one
+    is created per configuration and reused; boto3 clients are thread-safe
+    and pool their connections.
+    """
+    global _client, _client_key
+    settings = get_settings()
+    key = (
+        r2_endpoint_url(),
+        settings.r2_access_key_id,
+        settings.r2_secret_access_key,
+        settings.r2_max_pool_connections,
+        settings.r2_max_concurrency,
+        settings.r2_max_attempts,
+    )
+    
+    with _client_lock:
+        if _client is None or _client_key != key:
+            _client = _create_client()
+            _client_key = key
+        return _client
+
+
+def get_transfer_config() -> TransferConfig:
+    """Multipart settings: files above the threshold move in parallel parts."""
+    settings = get_settings()
+    return TransferConfig(
+        multipart_threshold=settings.r2_multipart_threshold_mb * MB,
+        multipart_chunksize=settings.r2_part_size_mb * MB,
+        max_concurrency=settings.r2_max_concurrency,
+        use_threads=settings.r2_max_concurrency > 1,
+    )
+
+
+def content_disposition(filename: str) -> str:
+    """Content-Disposition that saves the object as `filename`."""
+    return f'attachment; filename="{filename}"'
+
+
 def generate_presigned_upload_url(
     key: str,
     content_type: str = "video/mp4",
@@ -45,47 +115,76 @@ def generate_presigned_upload_url(
 def generate_presigned_download_url(
     key: str,
     expires_in: int = 3600,
+    download_name: Optional[str] = None,
 ) -> str:
-    """Generate a presigned URL for downloading from R2."""
+    """Generate a presigned URL for downloading from R2, saved as `download_name` if given."""
     settings = get_settings()
     client = get_r2_client()
     
+    params = {
+        "Bucket": settings.r2_bucket_name,
+        "Key": key,
+    }
+    if download_name:
+        params["ResponseContentDisposition"] = content_disposition(download_name)
+    
     return client.generate_presigned_url(
         "get_object",
-        Params={
-            "Bucket": settings.r2_bucket_name,
-            "Key": key,
-        },
+        Params=params,
         ExpiresIn=expires_in,
     )
 
 
-def upload_file(file_path: str, key: str, content_type: str = "video/mp4") -> str:
-    """Upload a local file to R2."""
+def get_download_url(key: str, expires_in: int = 3600, download_name: Optional[str] = None) -> str:
+    """
+    Public URL if configured, otherwise a presigned URL.
+    
+    Public URLs can't override headers, so they are saved under the
+    Content-Disposition the object was uploaded with.
+    """
+    settings = get_settings()
+    if settings.r2_public_url:
+        return f"{settings.r2_public_url}/{key}"
+    
+    return generate_presigned_download_url(key, expires_in, download_name)
+
+
+def upload_file(
+    file_path: str,
+    key: str,
+    content_type: str = "video/mp4",
+    download_name: Optional[str] = None,
+) -> str:
+    """
+    Upload a local file to R2, to be saved as `download_name` if given.
+    
+    Files above `r2_multipart_threshold_mb` are sent as a multipart upload
+    of `r2_part_size_mb` parts, `r2_max_concurrency` at a time.
+    """
     settings = get_settings()
     client = get_r2_client()
     
-    with open(file_path, "rb") as f:
-        client.put_object(
-            Bucket=settings.r2_bucket_name,
-            Key=key,
-            Body=f,
-            ContentType=content_type,
-        )
+    extra_args = {"ContentType": content_type}
+    if download_name:
+        extra_args["ContentDisposition"] = content_disposition(download_name)
     
-    # Return public URL if configured, otherwise presigned URL
-    if settings.r2_public_url:
-        return f"{settings.r2_public_url}/{key}"
+    client.upload_file(
+        file_path,
+        settings.r2_bucket_name,
+        key,
+        ExtraArgs=extra_args,
+        Config=get_transfer_config(),
+    )
     
-    return generate_presigned_download_url(key)
+    return get_download_url(key)
 
 
 def download_file(key: str, local_path: str) -> str:
-    """Download a file from R2 to local path."""
+    """Download a file from R2 to local path (ranged parts in parallel when large)."""
     settings = get_settings()
     client = get_r2_client()
     
-    client.download_file(settings.r2_bucket_name, key, local_path)
+    client.download_file(settings.r2_bucket_name, key, local_path, Config=get_transfer_config())
     
     return local_path
 
@@ -112,3 +211,38 @@ def file_exists(key: str) -> bool:
         return True
     except Exception:
         return False
+
+
+# Async wrappers: the SDK blocks, so calls run on the shared I/O pool
+
+async def upload_file_async(
+    file_path: str,
+    key: str,
+    content_type: str = "video/mp4",
+    download_name: Optional[str] = None,
+) -> str:
+    return await run_io(upload_file, file_path, key, content_type, download_name)
+
+
+async def download_file_async(key: str, local_path: str) -> str:
+    return await run_io(download_file, key, local_path)
+
+
+async def delete_file_async(key: str) -> bool:
+    return await run_io(delete_file, key)
+
+
+async def file_exists_async(key: str) -> bool:
+    return await run_io(file_exists, key)
+
+
+async def generate_presigned_upload_url_async(
+    key: str,
+    content_type: str = "video/mp4",
+    expires_in: int = 3600,
+) -> str:
+    return await run_io(generate_presigned_upload_url, key, content_type, expires_in)
+
+
+async def get_download_url_async(key: str, expires_in: int = 3600, download_name: Optional[str] = None) -> str:
+    return await run_io(get_download_url, key, expires_in, download_name)
@@ -1,6 +1,15 @@
 """ASS subtitle generation with multiple caption styles."""
-from typing import List
+import io
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, TextIO, Union
+
+import numpy as np
+
 from models import Word, CaptionStyle, CaptionPosition, FontFamily
+from word_timeline import WordTimeline
+
+# Transcript words: a WordTimeline, or any iterable of Word
+Words = Union[WordTimeline, Iterable[Word]]
 
 
 # ASS style definitions for each caption style
@@ -87,12 +96,14 @@ def ms_to_ass_time(ms: int) -> str:
     return f"{hours}:{minutes:02d}:{seconds:02d}.{centiseconds:02d}"
 
 
-def group_words_into_lines(words: List[Word], words_per_line: int = 4) -> List[dict]:
-    """Group words into subtitle lines based on timing and word count."""
-    if not words:
-        return []
+def iter_lines(words: Words, words_per_line: int = 4) -> Iterator[dict]:
+    """Yield subtitle lines one at a time; see group_words_into_lines."""
+    if isinstance(words, WordTimeline):
+        starts, ends = words.line_bounds(words_per_line)
+        for text, start, end in zip(words.line_texts(words_per_line), starts.tolist(), ends.tolist()):
+            yield {"text": text, "start": start, "end": end}
+        return
     
-    lines = []
     current_words = []
     
     for word in words:
@@ -100,41 +111,41 @@ def group_words_into_lines(words: List[Word], words_per_line: int = 4) -> List[d
         
         # Create a new line when we hit the word limit or detect a natural pause
         if len(current_words) >= words_per_line:
-            lines.append({
+            yield {
                 "text": " ".join(w.text for w in current_words),
                 "start": current_words[0].start,
                 "end": current_words[-1].end,
-            })
+            }
             current_words = []
     
     # Don't forget remaining words
     if current_words:
-        lines.append({
+        yield {
             "text": " ".join(w.text for w in current_words),
             "start": current_words[0].start,
             "end": current_words[-1].end,
-        })
-    
-    return lines
+        }
 
 
-def generate_ass_subtitle(
-    words: List[Word],
+def group_words_into_lines(words: Words, words_per_line: int = 4) -> List[dict]:
+    """Group words into subtitle lines based on timing and word count."""
+    return list(iter_lines(words, words_per_line))
+
+
+@lru_cache(maxsize=256)
+def ass_header(
     style: CaptionStyle = CaptionStyle.CLASSIC,
     font: FontFamily = FontFamily.MONTSERRAT,
     position: CaptionPosition = CaptionPosition.BOTTOM,
-    words_per_line: int = 4,
     video_width: int = 1080,
     video_height: int = 1920,
 ) -> str:
-    """Generate a complete ASS subtitle file."""
-    
+    """Script info, style and events format sections, built once per look and resolution."""
     style_def = STYLE_DEFINITIONS[style]
     alignment = POSITION_ALIGNMENT[position]
     margin_v = POSITION_MARGIN_V[position]
     
-    # Build the ASS header
-    ass_content = f"""[Script Info]
+    return f"""[Script Info]
 Title: CaptionCraft Subtitles
 ScriptType: v4.00+
 PlayResX: {video_width}
@@ -148,18 +159,98 @@ Style: Default,{font.value},{style_def['fontsize']},{style_def['primary_color']}
 [Events]
 Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
 """
+
+
+def _timeline_events(
+    timeline: WordTimeline,
+    words_per_line: int,
+    offset_ms: int,
+    end_ms: Optional[int],
+) -> Iterator[tuple]:
+    """(start, end, text) of the lines in the segment, selected and shifted with NumPy."""
+    starts, ends = timeline.line_bounds(words_per_line)
+    keep = ends > offset_ms
+    if end_ms is not None:
+        keep &= starts < end_ms
+    lines = np.flatnonzero(keep)
+    starts = np.maximum(starts[lines].astype(np.int64) - offset_ms, 0)
+    ends = ends[lines].astype(np.int64) - offset_ms
+    return zip(starts.tolist(), ends.tolist(), timeline.line_texts(words_per_line, lines.tolist()))
+
+
+def iter_ass_events(
+    words: Words,
+    words_per_line: int = 4,
+    offset_ms: int = 0,
+    end_ms: Optional[int] = None,
+) -> Iterator[str]:
+    """Yield Dialogue lines (newline-terminated) for the [Events] section."""
+    if isinstance(words, WordTimeline):
+        events = _timeline_events(words, words_per_line, offset_ms, end_ms)
+    else:
+        events = (
+            (max(line["start"] - offset_ms, 0), line["end"] - offset_ms, line["text"])
+            for line in iter_lines(words, words_per_line)
+            if not (line["end"] <= offset_ms or (end_ms is not None and line["start"] >= end_ms))
+        )
     
-    # Group words into lines and create dialogue events
-    lines = group_words_into_lines(words, words_per_line)
-    
-    for line in lines:
-        start_time = ms_to_ass_time(line["start"])
-        end_time = ms_to_ass_time(line["end"])
-        text = line["text"].replace("\n", "\\N")
+    for start, end, text in events:
+        start_time = ms_to_ass_time(start)
+        end_time = ms_to_ass_time(end)
+        text = text.replace("\n", "\\N")
         
-        ass_content += f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
+        yield f"Dialogue: 0,{start_time},{end_time},Default,,0,0,0,,{text}\n"
+
+
+def write_ass_subtitle(
+    file: TextIO,
+    words: Words,
+    style: CaptionStyle = CaptionStyle.CLASSIC,
+    font: FontFamily = FontFamily.MONTSERRAT,
+    position: CaptionPosition = CaptionPosition.BOTTOM,
+    words_per_line: int = 4,
+    video_width: int = 1080,
+    video_height: int = 1920,
+    offset_ms: int = 0,
+    end_ms: Optional[int] = None,
+):
+    """
+    Stream a complete ASS subtitle file to an open text file.
     
-    return ass_content
+    Events are written as they are generated, so memory stays flat however
+    long the transcript is. `offset_ms`/`end_ms` restrict the events to one
+    segment of the video and shift them so the segment starts at 0. Lines
+    are still grouped over the whole transcript, so a line crossing a
+    segment boundary is identical on both sides of it.
+    """
+    file.write(ass_header(style, font, position, video_width, video_height))
+    file.writelines(iter_ass_events(words, words_per_line, offset_ms, end_ms))
+
+
+def save_ass_subtitle(path: str, words: Words, **options):
+    """Write an ASS subtitle file to `path` (options as for write_ass_subtitle)."""
+    with open(path, "w", encoding="utf-8") as f:
+        write_ass_subtitle(f, words, **options)
+
+
+def generate_ass_subtitle(
+    words: Words,
+    style: CaptionStyle = CaptionStyle.CLASSIC,
+    font: FontFamily = FontFamily.MONTSERRAT,
+    position: CaptionPosition = CaptionPosition.BOTTOM,
+    words_per_line: int = 4,
+    video_width: int = 1080,
+    video_height: int = 1920,
+    offset_ms: int = 0,
+    end_ms: Optional[int] = None,
+) -> str:
+    """Generate a complete ASS subtitle file as a string (see write_ass_subtitle)."""
+    buffer = io.StringIO()
+    write_ass_subtitle(
+        buffer, words, style, font, position, words_per_line,
+        video_width, video_height, offset_ms, end_ms,
+    )
+    return buffer.getvalue()
 
 
 def get_style_info(style: CaptionStyle) -> dict:
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Tests for the offline benchmark suite's baselines and regression check."""
+import json
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmarks import suite
+
+
+def test_synthetic_transcript():
+    """Synthetic transcripts have the expected length and ordered timings."""
+    print("🎙️ Testing synthetic transcripts...")
+
+    words = suite.make_transcript(600)
+    assert len(words) == 600 * suite.WORDS_PER_MINUTE // 60
+    assert all(a.start < b.start for a, b in zip(words, words[1:]))
+    assert all(w.start < w.end for w in words)
+    assert words[-1].end <= 600_000
+    assert suite.make_transcript(600) == words  # Deterministic
+    print(f"  ✅ {len(words)} words, {len({w.text for w in words})} distinct")
+
+
+def test_run_save_and_compare():
+    """A saved run compares clean against itself and flags a slowdown past the threshold."""
+    print("\n📈 Testing baselines and comparison...")
+
+    min_sample = suite.MIN_SAMPLE_SECONDS
+    suite.MIN_SAMPLE_SECONDS = 0.001  # One loop per sample is enough here
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = os.path.join(tmp, "baseline.json")
+            assert suite.main(["run", "--sizes", "1m", "--repeat", "1", "--save", baseline]) == 0
+            with open(baseline, encoding="utf-8") as f:
+                results = json.load(f)
+            assert len(results["results"]) == 9
+            assert all(r["seconds"] > 0 for r in results["results"].values())
+
+            assert suite.main(["compare", baseline, baseline]) == 0
+
+            slower = os.path.join(tmp, "slower.json")
+            results["results"]["generate_ass_subtitle/1m"]["seconds"] *= 1.2
+            with open(slower, "w", encoding="utf-8") as f:
+                json.dump(results, f)
+            assert suite.main(["compare", baseline, slower, "--threshold", "0.1"]) == 1
+            assert suite.main(["compare", baseline, slower, "--threshold", "0.25"]) == 0
+    finally:
+        suite.MIN_SAMPLE_SECONDS = min_sample
+    print("  ✅ Regression flagged")
+
+
+if __name__ == "__main__":
+    test_synthetic_transcript()
+    test_run_save_and_compare()
+    print("\n✅ All benchmark suite tests passed!")
@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from models import Word, CaptionStyle, CaptionPosition, FontFamily
 from subtitles import generate_ass_subtitle, group_words_into_lines
-from processor import extract_audio, burn_captions, get_video_info
+from processor import extract_audio, burn_captions, get_video_info, parse_ffmpeg_input_info, pcm_to_wav
 
 
 # Sample transcript (simulating AssemblyAI output)
@@ -62,6 +62,34 @@ def test_subtitle_generation():
     print("\n✅ All subtitle styles generated successfully!")
 
 
+SAMPLE_FFMPEG_BANNER = """Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'temp/test_video.mp4':
+  Duration: 00:01:02.48, start: 0.000000, bitrate: 2035 kb/s
+  Stream #0:0[0x1](und): Video: h264 (High) (avc1 / 0x31637661), yuv420p(tv, bt709, progressive), 1080x1920 [SAR 1:1 DAR 9:16], 1900 kb/s, 30 fps, 30 tbr, 15360 tbn (default)
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, stereo, fltp, 128 kb/s (default)
+Stream mapping:
+  Stream #0:1 -> #0:0 (aac (native) -> pcm_s16le (native))
+Output #0, s16le, to 'pipe:1':
+  Stream #0:0(und): Audio: pcm_s16le, 16000 Hz, mono, s16, 256 kb/s (default)
+"""
+
+
+def test_ffmpeg_banner_parsing():
+    """Test single-pass ingest metadata parsing and in-memory WAV wrapping."""
+    print("\n🔎 Testing FFmpeg banner parsing...")
+    
+    info = parse_ffmpeg_input_info(SAMPLE_FFMPEG_BANNER)
+    assert info == {
+        "width": 1080, "height": 1920, "duration": 62.48, "codec": "h264",
+        "rotation": 0, "has_video": True, "has_audio": True, "audio_codec": "aac",
+    }, info
+    
+    wav = pcm_to_wav(b"\x00\x00" * 16000)
+    assert wav[:4] == b"RIFF" and wav[8:12] == b"WAVE"
+    assert len(wav) == 44 + 32000
+    
+    print(f"  ✅ Parsed: {info}")
+
+
 async def test_audio_extraction():
     """Test FFmpeg audio extraction."""
     print("\n🎵 Testing audio extraction...")
@@ -101,7 +129,7 @@ async def test_caption_burning():
         return False
     
     # Get video info
-    info = get_video_info(video_path)
+    info = await get_video_info(video_path)
     print(f"  Video info: {info}")
     
     # Burn captions
@@ -129,6 +157,7 @@ async def main():
     
     # Test 1: Subtitle generation
     test_subtitle_generation()
+    test_ffmpeg_banner_parsing()
     
     # Test 2: Audio extraction
     await test_audio_extraction()
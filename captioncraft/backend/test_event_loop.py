@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Tests for the event-loop lag monitor and the blocking-call offload layer."""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import offload
+from config import get_settings
+from loop_monitor import LoopMonitor
+from main import app
+
+
+def slow_disk_read(seconds: float = 0.3) -> bytes:
+    """Stands in for a blocking call: a read from a slow disk or an SDK request."""
+    time.sleep(seconds)
+    return b"data"
+
+
+async def serve_status_polls(count: int) -> float:
+    """Worst delay, in seconds, seen by `count` timers firing every 10ms (like /status polls)."""
+    worst = 0.0
+    for _ in range(count):
+        started = time.monotonic()
+        await asyncio.sleep(0.01)
+        worst = max(worst, time.monotonic() - started - 0.01)
+    return worst
+
+
+def test_monitor_catches_blocking_call():
+    """A blocking call shows up as lag, and its stack names the culprit."""
+    print("🐢 Testing lag monitor on a blocking call...")
+
+    async def run():
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.1)
+        monitor.start()
+        polls = asyncio.create_task(serve_status_polls(30))
+        await asyncio.sleep(0.05)
+        slow_disk_read()
+        worst = await polls
+        await monitor.stop()
+        return monitor, worst
+
+    monitor, worst = asyncio.run(run())
+    stats = monitor.stats()
+    assert worst >= 0.25, worst
+    assert monitor.blocks == 1, stats
+    assert stats["max_ms"] >= 250 and stats["p50_ms"] < 50, stats
+    assert any("slow_disk_read" in line for line in monitor.last_block["stack"]), monitor.last_block
+    print(f"  ✅ Polls delayed {worst * 1000:.0f}ms; stack points at slow_disk_read")
+
+
+def test_offloaded_calls_keep_loop_responsive():
+    """The same calls on the I/O pool leave the loop free, and file helpers read intact data."""
+    print("\n🧵 Testing offloaded calls...")
+
+    async def run(path):
+        monitor = LoopMonitor(interval=0.01, block_threshold=0.1)
+        monitor.start()
+        polls = asyncio.create_task(serve_status_polls(30))
+        results = await asyncio.gather(*(offload.run_io(slow_disk_read) for _ in range(4)))
+        worst = await polls
+        data = await offload.read_file(path)
+        chunks = [chunk async for chunk in offload.iter_file(path, 1000)]
+        await monitor.stop()
+        return monitor, worst, results, data, chunks
+
+    payload = os.urandom(4500)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "audio.wav")
+        with open(path, "wb") as f:
+            f.write(payload)
+        monitor, worst, results, data, chunks = asyncio.run(run(path))
+
+    assert results == [b"data"] * 4
+    assert data == payload and b"".join(chunks) == payload and len(chunks) == 5
+    assert monitor.blocks == 0, monitor.last_block
+    assert worst < 0.1, worst
+    assert offload.stats()["io"]["in_flight"] == 0
+    print(f"  ✅ Worst poll delay {worst * 1000:.1f}ms with 4 blocking calls in flight")
+
+
+def test_upload_and_health():
+    """Uploads are written through the I/O pool; /health reports loop lag and pool usage."""
+    print("\n🩺 Testing upload writes and health stats...")
+
+    payload = os.urandom(2 * 1024 * 1024 + 7)
+    settings = get_settings()
+    original_temp_dir = settings.temp_dir
+    with tempfile.TemporaryDirectory() as temp_dir:
+        settings.temp_dir = temp_dir
+        try:
+            with TestClient(app) as client:
+                response = client.post("/upload", files={"file": ("clip.mp4", payload, "video/mp4")})
+                assert response.status_code == 200, response.text
+                video_id = response.json()["video_id"]
+                with open(os.path.join(temp_dir, f"{video_id}.mp4"), "rb") as f:
+                    assert f.read() == payload
+
+                time.sleep(0.3)  # Let the monitor take some samples
+                health = client.get("/health").json()
+        finally:
+            settings.temp_dir = original_temp_dir
+
+    assert health["event_loop"]["samples"] > 0, health["event_loop"]
+    assert health["offload"]["io"]["completed"] >= 3, health["offload"]
+    print(f"  ✅ Loop p99 {health['event_loop']['p99_ms']}ms, {health['offload']['io']['completed']} I/O calls")
+
+
+if __name__ == "__main__":
+    test_monitor_catches_blocking_call()
+    test_offloaded_calls_keep_loop_responsive()
+    test_upload_and_health()
+    print("\n✅ All event loop tests passed!")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Tests for bulk Devanagari -> Hinglish conversion of whole transcripts."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hinglish_transliterator import (
+    _SEGMENT_PATTERN, cache_stats, clear_cache, devanagari_to_hinglish, transliterate_batch,
+)
+from test_hinglish_cache import zipf_transcript
+from test_transcriber import override_settings
+
+
+def make_texts() -> list:
+    """A transcript's words (with punctuation, English and blanks) followed by its full text."""
+    words = zipf_transcript(words=3000, seed=17)
+    words[10] = "video"
+    words[20] = words[20] + "।"
+    words[30] = "है?"
+    words[40] = ""
+    return words + [" ".join(words)]
+
+
+def test_batch_matches_per_text():
+    """Every text converts exactly as devanagari_to_hinglish would on its own."""
+    print("📦 Testing batch transliteration...")
+
+    texts = make_texts()
+    expected = [devanagari_to_hinglish(text) for text in texts]
+    assert transliterate_batch(texts) == expected
+    assert transliterate_batch([]) == []
+    assert transliterate_batch(["Hello", "", "  "]) == ["Hello", "", "  "]
+    print(f"  ✅ {len(texts)} texts identical")
+
+
+def test_each_word_converted_once():
+    """Distinct words are converted once, however often they appear in words and text."""
+    print("\n1️⃣ Testing deduplication...")
+
+    texts = make_texts()
+    unique = {seg for text in texts for seg in _SEGMENT_PATTERN.findall(text)}
+
+    clear_cache()
+    transliterate_batch(texts)
+    stats = cache_stats()
+    assert stats["misses"] == len(unique) and stats["hits"] == 0, stats
+    print(f"  ✅ {sum(len(_SEGMENT_PATTERN.findall(t)) for t in texts)} words, {len(unique)} conversions")
+
+
+def test_process_pool_matches_in_process():
+    """Fanning out to worker processes gives the same result."""
+    print("\n🧵 Testing process pool...")
+
+    texts = make_texts()
+    with override_settings(hinglish_pool_min_words=1):
+        pooled = transliterate_batch(texts, processes=2)
+    assert pooled == transliterate_batch(texts, processes=0)
+    print("  ✅ Pool output identical")
+
+
+if __name__ == "__main__":
+    test_batch_matches_per_text()
+    test_each_word_converted_once()
+    test_process_pool_matches_in_process()
+    print("\n✅ All batch transliteration tests passed!")
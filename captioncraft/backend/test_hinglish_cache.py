@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Tests for the per-word Devanagari -> Hinglish cache."""
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hinglish_transliterator import (
+    _process_devanagari_segment, cache_stats, clear_cache, devanagari_to_hinglish,
+    seed_cache,
+)
+
+SEED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "hinglish_seed_words.txt")
+
+
+def zipf_transcript(words: int = 5000, seed: int = 3) -> list:
+    """Word list drawn with Zipfian frequencies from the seed vocabulary."""
+    with open(SEED_FILE, encoding="utf-8") as f:
+        vocabulary = [line.split()[0] for line in f if line.strip() and not line.startswith("#")]
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    return random.Random(seed).choices(vocabulary, weights=weights, k=words)
+
+
+def test_cached_output_matches_uncached():
+    """Cached results are identical to a fresh conversion."""
+    print("🧠 Testing cached transliteration...")
+
+    clear_cache()
+    words = zipf_transcript()
+    cached = [devanagari_to_hinglish(w) for w in words]
+    uncached = [_process_devanagari_segment.__wrapped__(w) for w in words]
+    assert cached == uncached
+
+    stats = cache_stats()
+    assert stats["hits"] + stats["misses"] == len(words)
+    assert stats["size"] == len(set(words))
+    assert stats["hit_rate"] > 0.95, stats
+    print(f"  ✅ {len(words)} words, hit rate {stats['hit_rate']:.1%}")
+
+
+def test_clear_cache_resets():
+    """clear_cache empties the cache and its statistics."""
+    print("\n🧹 Testing cache clear...")
+
+    devanagari_to_hinglish("नमस्ते दोस्तों")
+    clear_cache()
+    assert cache_stats() == {"hits": 0, "misses": 0, "size": 0,
+                             "max_size": cache_stats()["max_size"], "hit_rate": 0.0}
+    print("  ✅ Cache cleared")
+
+
+def test_seed_cache_from_frequency_list():
+    """Seeding warms the cache without counting toward the hit rate."""
+    print("\n🌱 Testing cache seeding...")
+
+    clear_cache()
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write("# word count\nहै 1000\nमें 800\n\nhello 10\nनहीं 500\n")
+        path = f.name
+    try:
+        assert seed_cache(path) == 3
+    finally:
+        os.remove(path)
+
+    assert cache_stats()["hits"] == 0 and cache_stats()["size"] == 3
+    devanagari_to_hinglish("यह सही नहीं है")
+    stats = cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2), stats
+
+    clear_cache()
+    assert seed_cache(SEED_FILE, limit=10) == 10
+    print(f"  ✅ Seeded; first sentence hit {stats['hits']} of 4 words")
+
+
+if __name__ == "__main__":
+    test_cached_output_matches_uncached()
+    test_clear_cache_resets()
+    test_seed_cache_from_frequency_list()
+    print("\n✅ All transliteration cache tests passed!")
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""Tests that the compiled Hinglish correction engine matches the original function exactly."""
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hinglish_corrections import HinglishCorrector, get_corrector, load_corrections
+from models import Word
+from sarvam_transcriber import correct_common_hinglish_misspellings
+
+
+def legacy_correct(text: str) -> str:
+    """The original per-call implementation, kept verbatim as the reference."""
+    corrections = {
+        # Common transcription errors
+        "mein": "main",
+        "hoon": "hun",
+        "tumhara": "tumara",
+        "aapka": "apka",
+        "kyun": "kyu",
+        "kyunki": "kyuki",
+        "kyoki": "kyuki",
+        "lekin": "lekin",
+        "magar": "magar",
+        "par": "par",
+        "kyu ki": "kyunki",
+        "kyun ki": "kyunki",
+        "kya": "kya",
+        "hai": "hai",
+        "hain": "hain",
+        "thi": "thi",
+        "the": "the",
+        "tha": "tha",
+        "raha": "raha",
+        "rahi": "rahi",
+        "rahe": "rahe",
+        "gaya": "gaya",
+        "gayi": "gayi",
+        "gaye": "gaye",
+        "diya": "diya",
+        "diye": "diye",
+        "liya": "liya",
+        "liye": "liye",
+        "hua": "hua",
+        "hui": "hui",
+        "hue": "hue",
+        "karna": "karna",
+        "karne": "karne",
+        "karte": "karte",
+        "karti": "karti",
+        "karta": "karta",
+        "kar raha": "kar raha",
+        "kar rahi": "kar rahi",
+        "kar rahe": "kar rahe",
+        "ho raha": "ho raha",
+        "ho rahi": "ho rahi",
+        "ho rahe": "ho rahe",
+        "chahiye": "chahiye",
+        "chahie": "chahiye",
+        "zindagi": "zindagi",
+        "jindagi": "zindagi",
+        "mujhe": "mujhe",
+        "mujhse": "mujhse",
+        "tujhe": "tujhe",
+        "tujhse": "tujhse",
+        "isse": "isse",
+        "usse": "usse",
+        "jisse": "jisse",
+        "kaise": "kaise",
+        "kab": "kab",
+        "kahan": "kahan",
+        "kidhar": "kidhar",
+        "kisne": "kisne",
+        "kisko": "kisko",
+        "kisliye": "kisliye",
+        "iske": "iske",
+        "uske": "uske",
+        "jiske": "jiske",
+        "iska": "iska",
+        "uska": "uska",
+        "jiska": "jiska",
+        "isko": "isko",
+        "usko": "usko",
+        "bhi": "bhi",
+        "hi": "hi",
+        "to": "to",
+        "se": "se",
+        "ko": "ko",
+        "ke": "ke",
+        "ka": "ka",
+        "ki": "ki",
+        "me": "mein",
+        "mein": "mein",
+        "mai": "main",
+        "main": "main",
+        "hum": "hum",
+        "tum": "tum",
+        "aap": "aap",
+        "woh": "woh",
+        "yeh": "yeh",
+        "jab": "jab",
+        "tab": "tab",
+        "agar": "agar",
+        "nahi": "nahi",
+        "na": "na",
+        "mat": "mat",
+        "matlab": "matlab",
+        "baat": "baat",
+        "sach": "sach",
+        "jhooth": "jhooth",
+        "achha": "acha",
+        "accha": "acha",
+        "bura": "bura",
+        "bahut": "bahut",
+        "zyada": "zyada",
+        "jyada": "zyada",
+        "kam": "kam",
+        "thora": "thora",
+        "thoda": "thoda",
+        "sab": "sab",
+        "kuch": "kuch",
+        "koi": "koi",
+        "har": "har",
+        "ek": "ek",
+        "do": "do",
+        "dono": "dono",
+        "aur": "aur",
+        "ya": "ya",
+        "phir": "phir",
+        "fir": "phir",
+        "pehle": "pehle",
+        "phle": "pehle",
+        "baad": "baad",
+        "baad mein": "baad mein",
+        "abhi": "abhi",
+        "ab": "ab",
+        "pehli": "pehli",
+        "doosra": "doosra",
+        "dusra": "doosra",
+        "teesra": "teesra",
+        "chautha": "chautha",
+        "aakhri": "aakhri",
+        "antim": "antim",
+        "shuru": "shuru",
+        "khatam": "khatam",
+        "poora": "poora",
+        "adha": "adha",
+        "paisa": "paisa",
+        "paise": "paise",
+        "kaam": "kaam",
+        "waqt": "waqt",
+        "din": "din",
+        "raat": "raat",
+        "subah": "subah",
+        "shaam": "shaam",
+    }
+    
+    # Apply corrections (case-insensitive but preserve case)
+    import re
+    
+    def replace_word(match):
+        word = match.group(0)
+        word_lower = word.lower()
+        if word_lower in corrections:
+            # Preserve original case pattern
+            corrected = corrections[word_lower]
+            if word.isupper():
+                return corrected.upper()
+            elif word[0].isupper():
+                return corrected.capitalize()
+            return corrected
+        return word
+    
+    # Replace whole words only
+    pattern = r'\b(' + '|'.join(re.escape(k) for k in corrections.keys()) + r')\b'
+    return re.sub(pattern, replace_word, text, flags=re.IGNORECASE)
+
+
+def make_corpus(seed: int = 7, sentences: int = 2000) -> list:
+    """Sentences mixing every table key, casing variants, punctuation and noise words."""
+    rng = random.Random(seed)
+    keys = list(load_corrections())
+    noise = ["zaroori", "kaam", "Kar", "raha", "kyun", "ki", "baad", "mein", "hello", "OK",
+             "mein,", "(hai)", "kya?", "tum's", "naam", "kaamwala", "maine", "ki-ki", "123", "नमस्ते"]
+    separators = [" ", " ", " ", "  ", ", ", "\n", "-", "!", "\t"]
+
+    def variant(token: str) -> str:
+        roll = rng.random()
+        if roll < 0.15:
+            return token.upper()
+        if roll < 0.3:
+            return token.capitalize()
+        if roll < 0.35:
+            return token.title()
+        if roll < 0.4:
+            return "".join(c.upper() if rng.random() < 0.5 else c for c in token)
+        return token
+
+    corpus = []
+    for _ in range(sentences):
+        tokens = [variant(rng.choice(keys if rng.random() < 0.7 else noise))
+                  for _ in range(rng.randint(1, 12))]
+        text = tokens[0]
+        for token in tokens[1:]:
+            text += rng.choice(separators) + token
+        corpus.append(text)
+    return corpus
+
+
+def test_matches_original_function():
+    """Corrected text is identical to the original implementation."""
+    print("🔤 Testing correction equivalence...")
+
+    corpus = make_corpus()
+    corpus += [
+        "", "mein tumhara kaam kar raha hoon kyunki yeh zaroori hai",
+        "kyun ki", "Kyu Ki", "baad mein", "KAR RAHA", "Kar Raha", "kar  raha",
+        "MEIN", "Mein", "mEIN", "me", "Me", "ME", "meine", "\u212aam",  # Kelvin sign K
+    ]
+    for text in corpus:
+        assert correct_common_hinglish_misspellings(text) == legacy_correct(text), text
+
+    print(f"  ✅ {len(corpus)} texts identical")
+
+
+def test_batch_matches_per_text():
+    """Batch correction of words equals correcting each word separately."""
+    print("\n📦 Testing batch correction...")
+
+    corrector = get_corrector()
+    texts = [token for text in make_corpus(seed=11, sentences=300) for token in text.split(" ")]
+    texts += ["kar raha", "with\x00separator", ""]
+
+    assert corrector.correct_texts(texts) == [legacy_correct(t) for t in texts]
+
+    words = [Word(text=t, start=i * 100, end=i * 100 + 90, confidence=0.5) for i, t in enumerate(texts)]
+    corrected = corrector.correct_words(words)
+    assert [w.text for w in corrected] == [legacy_correct(t) for t in texts]
+    assert [(w.start, w.end, w.confidence) for w in corrected] == [(w.start, w.end, w.confidence) for w in words]
+    print(f"  ✅ {len(texts)} words corrected in one pass")
+
+
+def test_custom_table_file():
+    """A correction table can be loaded from a data file, order preserved."""
+    print("\n📄 Testing custom correction table...")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"baad": "baad", "baad mein": "later", "plz": "please"}, f)
+        path = f.name
+    try:
+        corrector = HinglishCorrector(load_corrections(path))
+    finally:
+        os.remove(path)
+
+    assert corrector.correct("Plz wait, baad mein") == "Please wait, baad mein"
+    assert corrector.correct("PLZ") == "PLEASE"
+    print("  ✅ Loaded and applied")
+
+
+if __name__ == "__main__":
+    test_matches_original_function()
+    test_batch_matches_per_text()
+    test_custom_table_file()
+    print("\n✅ All Hinglish correction tests passed!")
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Tests that the direct Devanagari converter matches the original ITRANS pipeline exactly."""
+import os
+import random
+import re
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from indic_transliteration import sanscript
+from indic_transliteration.sanscript import transliterate as _transliterate
+
+from hinglish_transliterator import (
+    _convert_segment_direct,
+    _process_itrans_segment,
+    clear_cache,
+    devanagari_to_hinglish,
+    is_devanagari,
+)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def legacy_itrans_word(w: str) -> str:
+    """The original ITRANS word pipeline, kept verbatim as the reference."""
+    if not w:
+        return w
+    
+    # Separate punctuation
+    punct = ''
+    while w and not w[-1].isalnum():
+        punct = w[-1] + punct
+        w = w[:-1]
+    if not w:
+        return punct
+    
+    # ── 1. Mark long vowels with placeholders ──
+    # Protect diphthongs first
+    w = w.replace('ai', '\x01')
+    w = w.replace('au', '\x02')
+    w = w.replace('A', '§')   # long aa
+    w = w.replace('I', '£')   # long ee
+    w = w.replace('U', '¥')   # long oo
+    w = w.replace('\x01', 'ai')
+    w = w.replace('\x02', 'au')
+    
+    # ── 2. Consonant conversions ──
+    # Anusvara
+    w = re.sub(r'M(?=[pbm])', 'm', w)
+    w = w.replace('M', 'n')
+    # Chandrabindu / visarga
+    w = w.replace('~N', 'n'); w = w.replace('.n', 'n'); w = w.replace('.N', 'n')
+    w = w.replace('H', 'h')
+    # Retroflex dots
+    w = w.replace('.Dh', 'dh'); w = w.replace('.D', 'd'); w = w.replace('.T', 't')
+    # Danda
+    w = w.replace('|', '.')
+    # Vowel modifiers
+    w = w.replace('RRi', 'ri'); w = w.replace('LLi', 'li')
+    # Nuqta
+    w = w.replace('.k', 'q'); w = w.replace('.g', 'gh')
+    w = w.replace('.j', 'z'); w = w.replace('.f', 'f'); w = w.replace('.p', 'f')
+    # Aspirated (order matters)
+    w = w.replace('Ch', 'chh')
+    w = w.replace('Th', 'th'); w = w.replace('Dh', 'dh'); w = w.replace('Bh', 'bh')
+    w = w.replace('Gh', 'gh'); w = w.replace('Jh', 'jh'); w = w.replace('Kh', 'kh')
+    w = w.replace('Ph', 'ph'); w = w.replace('Sh', 'sh'); w = w.replace('sh', 'sh')
+    w = w.replace('GY', 'gy'); w = w.replace('NY', 'ny')
+    # Remaining ITRANS capitals
+    for c in 'TDNKG':
+        w = w.replace(c, c.lower())
+    
+    # ── 3. Schwa deletion ──
+    # Only delete lowercase 'a' (schwa), never markers (§£¥)
+    
+    consonants = set('bcdfghjklmnpqrstvwxyz')
+    vowels_all = set('aeiou§£¥')
+    
+    # 3a. Word-final schwa
+    if len(w) > 1 and w[-1] == 'a' and w[-2] in consonants:
+        w = w[:-1]
+    
+    # 3b. Medial schwa deletion
+    # Rule: delete 'a' between consonants C₁aC₂ when:
+    #   - There's already a vowel before C₁ (not first syllable)
+    #   - Followed by a vowel sound (next syllable exists)
+    # This prevents "chalo" → "chlo" but allows "chalate" → "chalte"
+    
+    changed = True
+    while changed:
+        changed = False
+        chars = list(w)
+        new = []
+        i = 0
+        while i < len(chars):
+            if (chars[i] in consonants and
+                i + 1 < len(chars) and chars[i+1] == 'a' and
+                i + 2 < len(chars) and chars[i+2] in consonants and
+                i + 3 < len(chars) and chars[i+3] in vowels_all):
+                # Check: is there already a vowel before this position?
+                preceding = ''.join(chars[:i])
+                has_prior_vowel = any(c in vowels_all for c in preceding)
+                if has_prior_vowel:
+                    new.append(chars[i])
+                    i += 2  # skip the schwa
+                    changed = True
+                else:
+                    new.append(chars[i])
+                    i += 1
+            else:
+                new.append(chars[i])
+                i += 1
+        w = ''.join(new)
+    
+    # ── 4. Convert markers to casual Hinglish vowels ──
+    
+    # § (long aa) conversion rules:
+    # - Word-final → 'a' (tumhArA → tumhara)
+    # - Word-initial → 'aa' (aaj, aap, aai)
+    # - Internal in short words (≤4 chars) → 'aa' (naam, baat, kaam)
+    # - Internal in longer words → 'a' (khana, tumhara, chahiye)
+    
+    # Word-final §
+    if w.endswith('§'):
+        w = w[:-1] + 'a'
+    
+    # Word-initial §
+    if w.startswith('§'):
+        w = 'aa' + w[1:]
+    
+    # Remaining internal §: depends on word length
+    if '§' in w:
+        if len(w) <= 4:
+            w = w.replace('§', 'aa')
+        else:
+            w = w.replace('§', 'a')
+    
+    # £ (long ee):
+    # - Word-final → 'i' (most casual: ladkee → ladki)  
+    # - Internal → 'ee' (theek, neela)
+    if w.endswith('£'):
+        w = w[:-1] + 'i'
+    # £ before 'n' at word end → 'i' + 'n' (naheen → nahin)
+    w = re.sub(r'£n$', 'in', w)
+    w = w.replace('£', 'ee')
+    
+    # ¥ (long oo):
+    # - Generally → 'oo' (hoon, poora)
+    # - Word-final before nothing → 'oo'
+    w = w.replace('¥', 'oo')
+    
+    # ── 5. Consonant cluster cleanup ──
+    w = w.replace('chchh', 'cch')  # अच्छ → acch not achchh
+    
+    # ── 6. Common word-specific fixes ──
+    # 'ie' at word end from चाहिए → should be 'iye'
+    if w.endswith('hie'):
+        w = w[:-2] + 'iye'
+    
+    # ── 7. Word override dictionary ──
+    overrides = {
+        'yeh': 'yeh', 'yah': 'yeh',
+        'woh': 'woh', 'vah': 'woh', 'voh': 'woh',
+        'ham': 'hum', 'hum': 'hum',
+        'nahi': 'nahi', 'nahin': 'nahi',
+        'theek': 'theek', 'thik': 'theek',
+        'accha': 'accha', 'acchi': 'acchi',
+        'party': 'party', 'parti': 'party', 'paarti': 'party',
+        'film': 'film',
+        'bhai': 'bhai', 'bhaai': 'bhai',
+        'men': 'mein',
+        'dhanyvad': 'dhanyavaad', 'dhnyvad': 'dhanyavaad',
+        'to': 'toh',
+    }
+    w_lower = w.lower()
+    if w_lower in overrides:
+        w = overrides[w_lower]
+    
+    return w + punct
+
+
+def legacy_hinglish(text: str) -> str:
+    """The original Devanagari → ITRANS → Hinglish conversion."""
+    if not text or not text.strip():
+        return text
+    if not is_devanagari(text):
+        return text
+    
+    segments = re.split(r'([\u0900-\u097F\u0964\u0965]+)', text)
+    parts = []
+    for seg in segments:
+        if not seg:
+            continue
+        if is_devanagari(seg) or seg in ('।', '॥'):
+            itrans = _transliterate(seg, sanscript.DEVANAGARI, sanscript.ITRANS)
+            parts.append(' '.join(legacy_itrans_word(w) for w in itrans.split()))
+        else:
+            parts.append(seg)
+    return ''.join(parts)
+
+
+def fixture_inputs() -> list:
+    """Every quoted Devanagari string in the existing transliteration tests and self-test."""
+    inputs = []
+    for name in ("hinglish_transliterator.py", "test_hinglish.py", "test_hinglish_qa.py"):
+        with open(os.path.join(HERE, name), encoding="utf-8") as f:
+            source = f.read()
+        inputs += [s for s in re.findall(r'"([^"\n]*)"', source) if is_devanagari(s)]
+    return inputs
+
+
+CONSONANTS = [chr(c) for c in range(0x915, 0x93A)] + [chr(c) for c in range(0x958, 0x960)]
+VOWELS = [chr(c) for c in range(0x904, 0x915)]
+MATRAS = list("ािीुूृेैोौ") + ["\u094d"] * 3  # Virama is common in clusters
+SIGNS = [chr(c) for c in range(0x93E, 0x950)] + ["\u0901", "\u0902", "\u0903"]
+OTHER = ["\u093c", "\u093d", "\u0950", "\u0964", "\u0965", "\u0966", "\u0969", "\u0970"]
+
+
+def random_word(rng: random.Random) -> str:
+    """Syllable soup: mostly well-formed, sometimes stray signs or clusters."""
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        roll = rng.random()
+        if roll < 0.7:
+            parts.append(rng.choice(CONSONANTS))
+            if rng.random() < 0.05:
+                parts.append("\u093c")
+            if rng.random() < 0.6:
+                parts.append(rng.choice(MATRAS if rng.random() < 0.95 else SIGNS))
+            if rng.random() < 0.15:
+                parts.append(rng.choice(["\u0901", "\u0902", "\u0903"]))
+        elif roll < 0.97:
+            parts.append(rng.choice(VOWELS))
+        else:
+            parts.append(rng.choice(OTHER + SIGNS))
+    return "".join(parts)
+
+
+def test_fixtures_match_original():
+    """The self-test and test_hinglish*.py inputs convert exactly as before."""
+    print("🔤 Testing fixture sentences...")
+    clear_cache()
+
+    inputs = fixture_inputs()
+    assert len(inputs) > 20
+    for text in inputs:
+        assert devanagari_to_hinglish(text) == legacy_hinglish(text), text
+    print(f"  ✅ {len(inputs)} fixture strings identical")
+
+
+def test_random_words_match_original():
+    """Random syllables (including unsupported codepoints) convert exactly as before."""
+    print("\n🎲 Testing random words...")
+    clear_cache()
+
+    rng = random.Random(16)
+    direct = 0
+    for _ in range(20000):
+        word = random_word(rng)
+        expected = legacy_hinglish(word)
+        assert devanagari_to_hinglish(word) == expected, (word, expected)
+        if _convert_segment_direct(word) is not None:
+            direct += 1
+    assert direct > 8000  # Both paths exercised; the rest hit unsupported codepoints
+    print(f"  ✅ 20000 words identical, {direct} converted directly")
+
+
+def test_fallback_for_unsupported_text():
+    """Codepoints outside the tables are handed to the ITRANS path."""
+    print("\n↩️ Testing fallback...")
+
+    for text in ["ॐ", "कळ", "\u095d", "ा", "क।ख", "सॉरी"]:
+        assert _convert_segment_direct(text) is None, text
+        assert devanagari_to_hinglish(text) == _process_itrans_segment(text) == legacy_hinglish(text)
+    assert _convert_segment_direct("नमस्ते।") == legacy_hinglish("नमस्ते।")
+    print("  ✅ Unsupported segments fall back")
+
+
+if __name__ == "__main__":
+    test_fixtures_match_original()
+    test_random_words_match_original()
+    test_fallback_for_unsupported_text()
+    print("\n✅ All direct transliteration tests passed!")
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Tests for live job status events and FFmpeg progress reporting."""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models import ProcessingStatus
+from processor import (
+    _parse_progress, create_job, encode_progress_reporter,
+    subscribe_job, unsubscribe_job, update_job_status, jobs, job_subscribers,
+)
+
+
+# One `-progress` block as FFmpeg writes it
+PROGRESS_BLOCK = {
+    "frame": "450",
+    "fps": "59.87",
+    "stream_0_0_q": "28.0",
+    "bitrate": "1520.3kbits/s",
+    "total_size": "2854912",
+    "out_time_us": "15000000",
+    "out_time_ms": "15000000",
+    "out_time": "00:00:15.000000",
+    "dup_frames": "0",
+    "drop_frames": "0",
+    "speed": "2.5x",
+    "progress": "continue",
+}
+
+
+def test_parse_progress_block():
+    """FFmpeg key=value reports become numeric snapshots."""
+    print("📈 Testing FFmpeg progress parsing...")
+
+    progress = _parse_progress(PROGRESS_BLOCK, 60000)
+    assert progress == {
+        "frame": 450,
+        "fps": 59.87,
+        "speed": 2.5,
+        "out_time_ms": 15000,
+        "duration_ms": 60000,
+        "done": False,
+    }, progress
+
+    # Early reports have N/A values
+    early = _parse_progress({"out_time_us": "N/A", "speed": "N/A", "progress": "continue"}, None)
+    assert early["out_time_ms"] == 0 and early["speed"] is None
+    print(f"  ✅ Parsed: {progress}")
+
+
+def test_subscribers_receive_encode_progress():
+    """Every status update, including encode progress, reaches subscribers."""
+    print("\n📡 Testing job status subscriptions...")
+
+    async def run():
+        job = create_job("video-1")
+        queue = subscribe_job(job.job_id)
+
+        update_job_status(job.job_id, ProcessingStatus.BURNING_CAPTIONS, 80, "Burning...")
+        report = encode_progress_reporter(
+            job.job_id, ProcessingStatus.BURNING_CAPTIONS, 80, 99, "Burning...", duration=60.0
+        )
+        report(_parse_progress(PROGRESS_BLOCK, None))
+        update_job_status(job.job_id, ProcessingStatus.COMPLETED, 100, "Done")
+
+        snapshots = [queue.get_nowait() for _ in range(queue.qsize())]
+        unsubscribe_job(job.job_id, queue)
+        del jobs[job.job_id]
+        return snapshots
+
+    snapshots = asyncio.run(run())
+
+    assert [s.status for s in snapshots] == [
+        ProcessingStatus.BURNING_CAPTIONS,
+        ProcessingStatus.BURNING_CAPTIONS,
+        ProcessingStatus.COMPLETED,
+    ]
+    encode = snapshots[1].encode
+    assert encode.percent == 25.0
+    assert encode.eta_seconds == 18.0  # 45s of video left at 2.5x realtime
+    assert snapshots[1].progress == 84
+    assert snapshots[2].encode is None
+    assert not job_subscribers
+    print(f"  ✅ Encode progress: {encode}")
+
+
+if __name__ == "__main__":
+    test_parse_progress_block()
+    test_subscribers_receive_encode_progress()
+    print("\n✅ All job event tests passed!")
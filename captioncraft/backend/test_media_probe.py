@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Tests for the async, cached media probe."""
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import media_probe
+from media_probe import MediaProbe, ProbeError, parse_media_info
+from processor import ingest_media
+
+
+ROTATED_BANNER = """Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'phone.mp4':
+  Duration: 00:00:12.50, start: 0.000000, bitrate: 9000 kb/s
+  Stream #0:0[0x1](und): Video: hevc (Main) (hvc1 / 0x31637668), yuv420p(tv, bt709), 1920x1080, 8800 kb/s, 30 fps, 30 tbr, 600 tbn (default)
+      Metadata:
+        handler_name    : Core Media Video
+      Side data:
+        displaymatrix: rotation of -90.00 degrees
+  Stream #0:1[0x2](und): Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, mono, fltp, 96 kb/s (default)
+"""
+
+LEGACY_ROTATE_BANNER = """Input #0, mov,mp4,m4a,3gp,3g2,mj2, from 'old.mp4':
+  Duration: 00:00:03.00, start: 0.000000, bitrate: 900 kb/s
+  Stream #0:0(und): Video: h264 (High) (avc1 / 0x31637661), yuv420p, 1280x720, 800 kb/s, 30 fps, 30 tbr, 90k tbn (default)
+    Metadata:
+      rotate          : 270
+      handler_name    : VideoHandler
+"""
+
+AUDIO_BANNER = """Input #0, wav, from 'audio.wav':
+  Duration: 00:00:42.00, bitrate: 256 kb/s
+  Stream #0:0: Audio: pcm_s16le ([1][0][0][0] / 0x0001), 16000 Hz, 1 channels, s16, 256 kb/s
+"""
+
+
+def make_video(path: str):
+    """A 5 second 320x180 clip with a keyframe every second and a tone."""
+    subprocess.run(
+        [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "lavfi", "-i", "testsrc=size=320x180:rate=25:duration=5",
+            "-f", "lavfi", "-i", "sine=frequency=440:duration=5",
+            "-c:v", "libx264", "-preset", "ultrafast", "-g", "25", "-c:a", "aac", "-shortest",
+            path,
+        ],
+        check=True,
+    )
+
+
+def test_banner_parsing():
+    """Rotation swaps the displayed size; audio-only files have no video info."""
+    print("🔎 Testing banner parsing...")
+
+    info = parse_media_info(ROTATED_BANNER)
+    assert info == {
+        "width": 1080, "height": 1920, "duration": 12.5, "codec": "hevc",
+        "rotation": 270, "has_video": True, "has_audio": True, "audio_codec": "aac",
+    }, info
+
+    info = parse_media_info(LEGACY_ROTATE_BANNER)
+    assert (info["width"], info["height"], info["rotation"], info["has_audio"]) == (720, 1280, 90, False), info
+
+    info = parse_media_info(AUDIO_BANNER)
+    assert info["has_video"] is False and info["has_audio"] is True and info["audio_codec"] == "pcm_s16le"
+    assert info["width"] is None and info["duration"] == 42.0
+    print("  ✅ Rotated, legacy-rotated and audio-only banners parsed")
+
+
+def test_probe_cache():
+    """A file is probed once per version, concurrent probes share a run, and ingest seeds the cache."""
+    print("\n🗂️  Testing probe caching...")
+
+    if not shutil.which("ffmpeg"):
+        print("  ⚠️ FFmpeg not found, skipping probe cache test")
+        return
+
+    runs = []
+    run = media_probe._run
+
+    async def counting_run(cmd):
+        runs.append(cmd)
+        return await run(cmd)
+
+    async def probe_all(probe, video_path):
+        infos = await asyncio.gather(*(probe.info(video_path) for _ in range(5)))
+        assert len(runs) == 1 and all(info == infos[0] for info in infos)
+        assert (infos[0]["width"], infos[0]["height"], infos[0]["duration"]) == (320, 180, 5.0)
+        assert infos[0]["has_audio"] and infos[0]["rotation"] == 0
+
+        keyframes = await probe.keyframes(video_path)
+        assert keyframes == [0.0, 1.0, 2.0, 3.0, 4.0], keyframes
+        assert await probe.keyframes(video_path) == keyframes
+        assert len(runs) == 2
+
+        # A new version of the file is probed again
+        stat = os.stat(video_path)
+        os.utime(video_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        await probe.info(video_path)
+        assert len(runs) == 3
+
+        try:
+            await probe.info(video_path + ".missing")
+        except ProbeError:
+            pass
+        else:
+            raise AssertionError("missing file probed")
+
+    async def ingest_then_probe(video_path):
+        info, _ = await ingest_media(video_path)
+        assert await media_probe.get_media_probe().info(video_path) == info
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "input.mp4")
+        make_video(video_path)
+
+        media_probe._run = counting_run
+        try:
+            probe = MediaProbe(max_entries=8)
+            asyncio.run(probe_all(probe, video_path))
+            assert probe.stats()["misses"] == 3 and probe.stats()["hits"] == 5, probe.stats()
+
+            runs.clear()
+            asyncio.run(ingest_then_probe(video_path))
+            assert runs == []
+        finally:
+            media_probe._run = run
+    print("  ✅ One FFmpeg run per file version")
+
+
+def test_rotated_video():
+    """A rotated clip reports its displayed size."""
+    print("\n🔄 Testing rotated video probing...")
+
+    if not shutil.which("ffmpeg"):
+        print("  ⚠️ FFmpeg not found, skipping rotated video test")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "input.mp4")
+        rotated_path = os.path.join(tmp, "rotated.mp4")
+        make_video(video_path)
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-display_rotation", "90", "-i", video_path, "-c", "copy", rotated_path],
+            check=True,
+        )
+
+        info = asyncio.run(MediaProbe(max_entries=8).info(rotated_path))
+        assert (info["width"], info["height"], info["rotation"]) == (180, 320, 90), info
+    print("  ✅ 320x180 rotated by 90 degrees reported as 180x320")
+
+
+if __name__ == "__main__":
+    test_banner_parsing()
+    test_probe_cache()
+    test_rotated_video()
+    print("\n✅ All media probe tests passed!")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Caption timing tests for segment-parallel burning (no FFmpeg needed)."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models import Word
+from processor import plan_segments
+from subtitles import generate_ass_subtitle, group_words_into_lines
+
+
+# Word every 700ms with 600ms duration, so lines regularly straddle boundaries
+WORDS = [Word(text=f"w{i}", start=i * 700, end=i * 700 + 600) for i in range(60)]
+DURATION = 42.0
+KEYFRAMES = [i * 2.0 for i in range(21)]  # GOP of 2 seconds
+
+
+def parse_ass_time(value: str) -> int:
+    """Convert H:MM:SS.cc to milliseconds."""
+    hours, minutes, rest = value.split(":")
+    seconds, centiseconds = rest.split(".")
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(centiseconds) * 10
+
+
+def dialogue_events(ass_content: str) -> list:
+    events = []
+    for line in ass_content.splitlines():
+        if line.startswith("Dialogue:"):
+            fields = line[len("Dialogue: "):].split(",", 9)
+            events.append((parse_ass_time(fields[1]), parse_ass_time(fields[2]), fields[9]))
+    return events
+
+
+def test_plan_segments_on_keyframes():
+    """Segments start on keyframes and cover the whole video."""
+    print("✂️  Testing segment planning...")
+
+    segments = plan_segments(KEYFRAMES, DURATION, 4)
+
+    assert segments[0][0] == 0.0
+    assert segments[-1][1] == DURATION
+    for (_, end), (start, _) in zip(segments, segments[1:]):
+        assert end == start
+        assert start in KEYFRAMES
+    assert len(segments) == 4, segments
+
+    # Sparse keyframes: never more segments than keyframes allow
+    assert plan_segments([0.0, 30.0], DURATION, 8) == [(0.0, 30.0), (30.0, DURATION)]
+    print(f"  ✅ Segments: {segments}")
+
+
+def test_caption_timing_across_segment_boundaries():
+    """Shifted per-segment events reproduce the full timeline exactly."""
+    print("\n⏱️  Testing caption timing across segment boundaries...")
+
+    segments = plan_segments(KEYFRAMES, DURATION, 4)
+    full_lines = group_words_into_lines(WORDS, 3)
+
+    # What a viewer sees at each boundary-straddling moment, reassembled
+    rendered = {}
+    for i, (start, end) in enumerate(segments):
+        is_last = i == len(segments) - 1
+        offset_ms = round(start * 1000)
+        ass = generate_ass_subtitle(
+            WORDS,
+            words_per_line=3,
+            offset_ms=offset_ms,
+            end_ms=None if is_last else round(end * 1000),
+        )
+        for ev_start, ev_end, text in dialogue_events(ass):
+            assert ev_start >= 0
+            seg_end = ev_end if is_last else min(ev_end, round((end - start) * 1000))
+            rendered.setdefault(text, []).append((ev_start + offset_ms, seg_end + offset_ms))
+
+    straddling = 0
+    for line in full_lines:
+        pieces = sorted(rendered[line["text"]])
+        # Pieces must be contiguous and together span the original line exactly
+        assert pieces[0][0] == line["start"], (line, pieces)
+        assert pieces[-1][1] == line["end"], (line, pieces)
+        for (_, prev_end), (next_start, _) in zip(pieces, pieces[1:]):
+            assert prev_end == next_start, (line, pieces)
+        if len(pieces) > 1:
+            straddling += 1
+
+    assert straddling > 0, "test data should include lines crossing a boundary"
+    print(f"  ✅ {len(full_lines)} lines verified, {straddling} crossing segment boundaries")
+
+
+def test_unsegmented_output_unchanged():
+    """Default arguments still produce the original single-file timeline."""
+    print("\n📄 Testing default (single segment) output...")
+
+    events = dialogue_events(generate_ass_subtitle(WORDS, words_per_line=3))
+    lines = group_words_into_lines(WORDS, 3)
+
+    assert [(s, e) for s, e, _ in events] == [(l["start"], l["end"]) for l in lines]
+    print("  ✅ Timeline unchanged")
+
+
+if __name__ == "__main__":
+    test_plan_segments_on_keyframes()
+    test_caption_timing_across_segment_boundaries()
+    test_unsegmented_output_unchanged()
+    print("\n✅ All parallel burn timing tests passed!")
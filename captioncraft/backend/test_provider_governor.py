@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Tests for the per-provider rate limiter and 429 governor (no network needed)."""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from provider_governor import ProviderGovernor, parse_retry_after
+
+
+def test_token_bucket_and_in_flight_limit():
+    """Requests are paced to the rate after the burst and capped in flight."""
+    print("🪣 Testing token bucket and in-flight cap...")
+
+    async def run():
+        governor = ProviderGovernor("test", rate=20, burst=2, max_in_flight=3, max_retries=0)
+        in_flight = peak = 0
+
+        async def send():
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        started = time.monotonic()
+        responses = await asyncio.gather(*[governor.call(send) for _ in range(12)])
+        return time.monotonic() - started, peak, responses, governor.stats()
+
+    elapsed, peak, responses, stats = asyncio.run(run())
+
+    assert all(r.status_code == 200 for r in responses)
+    # 2 from the burst, then 10 more at 20/s
+    assert 0.45 <= elapsed < 1.0, elapsed
+    assert peak <= 3
+    assert stats["requests"] == 12 and stats["throttled"] == 0
+    assert stats["wait_seconds"] > 0 and stats["in_flight"] == 0
+    print(f"  ✅ 12 requests in {elapsed:.2f}s, peak {peak} in flight, waited {stats['wait_seconds']}s total")
+
+
+def test_429_requeued_after_retry_after():
+    """A 429 pauses the provider for Retry-After and the request is retried."""
+    print("\n🚦 Testing 429 handling...")
+
+    async def run():
+        governor = ProviderGovernor("test", rate=100, burst=100, max_in_flight=10, max_retries=3)
+        calls = []
+
+        async def send():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0.3"})
+            return httpx.Response(200)
+
+        response = await governor.call(send)
+
+        # Other requests wait out the pause too
+        async def other():
+            return httpx.Response(200)
+
+        governor._pause(0.2)
+        paused_at = time.monotonic()
+        await governor.call(other)
+        return response, calls, time.monotonic() - paused_at, governor.stats()
+
+    response, calls, other_wait, stats = asyncio.run(run())
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.3
+    assert other_wait >= 0.2
+    assert stats["throttled"] == 1 and stats["requests"] == 2 + 1
+    print(f"  ✅ Retried after {calls[1] - calls[0]:.2f}s")
+
+
+def test_retries_exhausted_returns_last_response():
+    """When retries run out the 429 is returned for the caller to report."""
+    print("\n🛑 Testing retry exhaustion...")
+
+    async def run():
+        governor = ProviderGovernor("test", rate=100, burst=100, max_in_flight=10, max_retries=2)
+
+        async def send():
+            return httpx.Response(429, headers={"Retry-After": "0"})
+
+        return await governor.call(send), governor.stats()
+
+    response, stats = asyncio.run(run())
+    assert response.status_code == 429
+    assert stats["requests"] == 3 and stats["throttled"] == 2
+    print("  ✅ 429 returned after 2 retries")
+
+
+def test_parse_retry_after():
+    """Retry-After accepts seconds and HTTP dates."""
+    print("\n📅 Testing Retry-After parsing...")
+
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # In the past
+    print("  ✅ Parsed seconds and dates")
+
+
+if __name__ == "__main__":
+    test_token_bucket_and_in_flight_limit()
+    test_429_requeued_after_retry_after()
+    test_retries_exhausted_returns_last_response()
+    test_parse_retry_after()
+    print("\n✅ All provider governor tests passed!")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Tests for publishing outputs to R2 and redirecting downloads (moto server, no FFmpeg)."""
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from fastapi.testclient import TestClient
+
+import storage
+from main import app
+from models import ProcessingStatus
+from processor import (
+    create_job, get_job, job_artifacts, publish_outputs, subscribe_job, unsubscribe_job, update_job_status,
+)
+from test_storage import BUCKET, MOTO_AVAILABLE, LocalS3
+from test_transcriber import override_settings
+
+
+client = TestClient(app, follow_redirects=False)
+
+
+def make_outputs(directory: str) -> dict:
+    outputs = {}
+    for name in ("9x16", "wide"):
+        path = os.path.join(directory, f"clip_{name}.mp4")
+        with open(path, "wb") as f:
+            f.write(f"video {name}".encode())
+        outputs[name] = path
+    return outputs
+
+
+def finish_job(outputs: dict, output_keys: dict) -> str:
+    """A completed job with the given outputs, as process_video leaves it."""
+    job = create_job("video")
+    job_artifacts[job.job_id] = {"outputs": outputs, "output_keys": output_keys}
+    update_job_status(
+        job.job_id, ProcessingStatus.COMPLETED, 100, "Processing complete!", outputs["9x16"],
+        output_key=output_keys.get("9x16"),
+    )
+    return job.job_id
+
+
+def test_publish_uploads_and_expires_local_copies():
+    """Outputs are uploaded under the job's prefix, and local copies go after the hot window."""
+    print("☁️  Testing output publishing...")
+
+    if not MOTO_AVAILABLE:
+        print("  ⚠️ moto[server] not installed, skipping publish tests")
+        return
+
+    async def run(outputs):
+        job = create_job("video")
+        queue = subscribe_job(job.job_id)
+        try:
+            output_keys = await publish_outputs(job.job_id, outputs)
+            statuses = [queue.get_nowait().status for _ in range(queue.qsize())]
+        finally:
+            unsubscribe_job(job.job_id, queue)
+        await asyncio.sleep(0.05)  # Hot window of 0 seconds
+        return job.job_id, output_keys, statuses
+
+    with LocalS3(), tempfile.TemporaryDirectory() as tmp:
+        outputs = make_outputs(tmp)
+        with override_settings(local_output_hot_seconds=0):
+            job_id, output_keys, statuses = asyncio.run(run(outputs))
+
+        assert output_keys == {name: f"outputs/{job_id}/{os.path.basename(path)}" for name, path in outputs.items()}
+        assert statuses == [ProcessingStatus.UPLOADING]
+        video_id = get_job(job_id).video_id
+        for name, key in output_keys.items():
+            head = storage.get_r2_client().head_object(Bucket=BUCKET, Key=key)
+            assert head["ContentType"] == "video/mp4" and head["ContentLength"] == len(f"video {name}")
+            assert head["ContentDisposition"] == f'attachment; filename="captioned_{video_id}_{name}.mp4"'
+        assert not any(os.path.exists(path) for path in outputs.values())
+
+        # One failed upload: the others are removed and nothing is published
+        outputs = make_outputs(tmp)
+        os.remove(outputs["wide"])
+        failed_job_id = create_job("video").job_id
+        assert asyncio.run(publish_outputs(failed_job_id, outputs)) == {}
+        listing = storage.get_r2_client().list_objects_v2(Bucket=BUCKET, Prefix=f"outputs/{failed_job_id}/")
+        assert listing["KeyCount"] == 0, listing
+        assert os.path.exists(outputs["9x16"])
+
+        # Publishing off, or R2 not configured: nothing is uploaded or deleted
+        outputs = make_outputs(tmp)
+        with override_settings(r2_publish_outputs=False):
+            assert asyncio.run(publish_outputs(job_id, outputs)) == {}
+        with override_settings(r2_access_key_id=""):
+            assert not storage.is_configured()
+            assert asyncio.run(publish_outputs(job_id, outputs)) == {}
+        assert all(os.path.exists(path) for path in outputs.values())
+    print(f"  ✅ {len(output_keys)} outputs published, local copies removed")
+
+
+def test_download_redirects():
+    """Published outputs redirect to a signed URL; unpublished ones stream from disk."""
+    print("\n↪️  Testing download redirects...")
+
+    if not MOTO_AVAILABLE:
+        print("  ⚠️ moto[server] not installed, skipping publish tests")
+        return
+
+    with LocalS3(), tempfile.TemporaryDirectory() as tmp:
+        outputs = make_outputs(tmp)
+        output_keys = {}
+        for name, path in outputs.items():
+            output_keys[name] = f"outputs/test/{os.path.basename(path)}"
+            storage.upload_file(path, output_keys[name])
+        job_id = finish_job(outputs, output_keys)
+
+        video_id = get_job(job_id).video_id
+        response = client.get(f"/download/{job_id}")
+        assert response.status_code == 307, response.text
+        assert "X-Amz-Signature=" in response.headers["location"]
+        download = httpx.get(response.headers["location"])
+        assert download.content == b"video 9x16"
+        assert download.headers["content-disposition"] == f'attachment; filename="captioned_{video_id}.mp4"'
+
+        response = client.get(f"/download/{job_id}/wide")
+        assert response.status_code == 307
+        download = httpx.get(response.headers["location"])
+        assert download.content == b"video wide"
+        assert download.headers["content-disposition"] == f'attachment; filename="captioned_{video_id}_wide.mp4"'
+
+        with override_settings(r2_public_url="https://cdn.example.com"):
+            response = client.get(f"/download/{job_id}")
+            assert response.headers["location"] == f"https://cdn.example.com/{output_keys['9x16']}"
+
+        # Deleting the job removes the published objects
+        assert client.delete(f"/job/{job_id}").status_code == 200
+        assert not storage.file_exists(output_keys["9x16"])
+
+        local_job_id = finish_job(make_outputs(tmp), {})
+        response = client.get(f"/download/{local_job_id}")
+        assert response.status_code == 200 and response.content == b"video 9x16"
+        assert client.get(f"/download/{local_job_id}/missing").status_code == 404
+    print("  ✅ 307 to R2 for published outputs, local file otherwise")
+
+
+if __name__ == "__main__":
+    test_publish_uploads_and_expires_local_copies()
+    test_download_redirects()
+    print("\n✅ All publish tests passed!")
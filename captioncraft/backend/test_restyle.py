@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Tests for POST /job/{job_id}/restyle (rendering stubbed, no FFmpeg or API keys)."""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fastapi.testclient import TestClient
+
+import processor
+from main import app
+from models import CaptionStyle, FontFamily, ProcessRequest, ProcessingStatus, Word
+from processor import DEFAULT_OUTPUT, ProcessingError, create_job, get_job, job_artifacts, update_job_status
+from test_transcriber import override_settings
+from word_timeline import WordTimeline
+
+
+class StubRender:
+    """Stands in for render_outputs: records each call and writes placeholder outputs."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.calls = []
+
+    async def __call__(self, job_id, video_path, words, video_info, request):
+        self.calls.append({"video_path": video_path, "words": words, "video_info": video_info, "request": request})
+        names = [variant.name for variant in request.variants] or [DEFAULT_OUTPUT]
+        outputs = {}
+        for name in names:
+            outputs[name] = os.path.join(self.directory, f"output_{job_id}_{name}.mp4")
+            with open(outputs[name], "wb") as f:
+                f.write(b"video")
+        return outputs
+
+
+async def no_transcription(*args, **kwargs):
+    raise AssertionError("Restyle must reuse the source transcript")
+
+
+def finished_job(video_path: str, request: ProcessRequest) -> str:
+    """A completed job with the artifacts process_video leaves behind."""
+    job = create_job(request.video_id)
+    job_artifacts[job.job_id] = {
+        "video_path": video_path,
+        "video_info": {"width": 1280, "height": 720, "duration": 3.0},
+        "words": WordTimeline.from_words([Word(text="namaste", start=0, end=500)]),
+        "request": request,
+        "outputs": {},
+        "output_keys": {},
+    }
+    update_job_status(job.job_id, ProcessingStatus.COMPLETED, 100, "Processing complete!")
+    return job.job_id
+
+
+def wait_for(client: TestClient, job_id: str) -> dict:
+    for _ in range(100):
+        status = client.get(f"/status/{job_id}").json()
+        if status["status"] in ("completed", "failed"):
+            return status
+        time.sleep(0.02)
+    raise AssertionError(f"Job {job_id} did not finish: {status}")
+
+
+def test_restyle_endpoint():
+    """Restyles merge into the source request and reuse its transcript; bad sources are refused."""
+    print("🎨 Testing restyle endpoint...")
+
+    render_outputs, transcribe_audio = processor.render_outputs, processor.transcribe_audio
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "input.mp4")
+        with open(video_path, "wb") as f:
+            f.write(b"source")
+        stub = StubRender(tmp)
+        processor.render_outputs, processor.transcribe_audio = stub, no_transcription
+        try:
+            with override_settings(r2_publish_outputs=False), TestClient(app) as client:
+                assert client.post("/job/missing/restyle", json={}).status_code == 404
+
+                pending = create_job("test-video").job_id
+                assert client.post(f"/job/{pending}/restyle", json={}).status_code == 400
+
+                gone = finished_job(os.path.join(tmp, "deleted.mp4"), ProcessRequest(video_id="test-video"))
+                response = client.post(f"/job/{gone}/restyle", json={})
+                assert response.status_code == 404 and "no longer available" in response.json()["detail"]
+
+                source_request = ProcessRequest(video_id="test-video", font="Poppins", words_per_line=2)
+                source = finished_job(video_path, source_request)
+                response = client.post(f"/job/{source}/restyle", json={"style": "minimal", "words_per_line": 3})
+                assert response.status_code == 200, response.text
+                status = wait_for(client, response.json()["job_id"])
+                assert status["status"] == "completed", status
+
+                # A variant's own style would win, so restyling it is refused; other fields go through
+                variants_request = ProcessRequest(video_id="test-video", variants=[
+                    {"aspect_ratio": "9:16", "style": "highlight"},
+                    {"aspect_ratio": "1:1"},
+                ])
+                variants_source = finished_job(video_path, variants_request)
+                response = client.post(f"/job/{variants_source}/restyle", json={"style": "minimal"})
+                assert response.status_code == 400 and "style" in response.json()["detail"]
+                response = client.post(f"/job/{variants_source}/restyle", json={"font": "Inter"})
+                assert response.status_code == 200, response.text
+                assert wait_for(client, response.json()["job_id"])["status"] == "completed"
+        finally:
+            processor.render_outputs, processor.transcribe_audio = render_outputs, transcribe_audio
+
+    assert len(stub.calls) == 2
+    call = stub.calls[0]
+    assert call["video_path"] == video_path
+    assert call["words"] is job_artifacts[source]["words"]
+    assert call["request"].style == CaptionStyle.MINIMAL and call["request"].words_per_line == 3
+    assert call["request"].font == FontFamily.POPPINS  # Unset fields keep the source's values
+    assert job_artifacts[source]["request"] is source_request  # Source left as it was
+    assert [variant.style for variant in stub.calls[1]["request"].variants] == [CaptionStyle.HIGHLIGHT, None]
+    print("  ✅ 404/400/404 refusals, fields merged, transcript reused")
+
+
+def test_restyle_after_source_deleted():
+    """A source deleted before the restyle runs fails the new job instead of leaving it pending."""
+    print("\n🗑️  Testing restyle of a deleted source...")
+
+    job = create_job("test-video")
+    try:
+        asyncio.run(processor.restyle_video(job.job_id, "deleted-job", ProcessRequest(video_id="test-video")))
+        assert False, "restyle of a missing source succeeded"
+    except ProcessingError:
+        pass
+
+    job = get_job(job.job_id)
+    assert job.status == ProcessingStatus.FAILED and "no longer available" in job.error, job
+    print("  ✅ Job marked failed")
+
+
+if __name__ == "__main__":
+    test_restyle_endpoint()
+    test_restyle_after_source_deleted()
+    print("\n✅ All restyle tests passed!")
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""Tests for silence-split concurrent Sarvam transcription (local fake API, no keys)."""
+import asyncio
+import io
+import json
+import os
+import sys
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import http_clients
+from sarvam_transcriber import (
+    SarvamTranscriptionError, find_split_points, split_audio, transcribe_audio_sarvam_chunked,
+)
+from test_transcriber import override_settings
+
+
+SAMPLE_RATE = 16000
+
+
+def make_speech(pattern: list) -> bytes:
+    """WAV of alternating tone bursts ("speech") and silences, given as (seconds, loud)."""
+    rng = np.random.default_rng(0)
+    parts = []
+    for seconds, loud in pattern:
+        n = int(seconds * SAMPLE_RATE)
+        if loud:
+            t = np.arange(n) / SAMPLE_RATE
+            parts.append(4000 * np.sin(2 * np.pi * 200 * t) + rng.normal(0, 300, n))
+        else:
+            parts.append(rng.normal(0, 30, n))  # Room noise
+    samples = np.concatenate(parts).astype("<i2")
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class FakeSarvam:
+    """
+    Sarvam speech-to-text on localhost.
+
+    Returns one timestamped word per second of uploaded audio, and nothing
+    for audio that is only room noise. The first `fail_first` requests get
+    `fail_status` (503, or 429 with Retry-After: 0). Tracks peak concurrency.
+    """
+
+    def __init__(self, fail_first: int = 0, latency: float = 0.2, fail_status: int = 503):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak = 0
+        self.requests = 0
+        self.failures_left = fail_first
+        self.latency = latency
+        self.fail_status = fail_status
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                with fake.lock:
+                    fake.requests += 1
+                    fake.in_flight += 1
+                    fake.peak = max(fake.peak, fake.in_flight)
+                    fail = fake.failures_left > 0
+                    fake.failures_left -= 1
+                try:
+                    time.sleep(fake.latency)
+                    if fail:
+                        self.send_json(fake.fail_status, {"error": "overloaded"})
+                        return
+
+                    wav_start = body.index(b"RIFF")
+                    with wave.open(io.BytesIO(body[wav_start:]), "rb") as wav:
+                        seconds = wav.getnframes() / wav.getframerate()
+                        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+                    silent = np.abs(samples).max() < 1000
+                    words = [] if silent else [
+                        {"word": f"w{i}", "start_time": i, "end_time": i + 0.5}
+                        for i in range(int(seconds))
+                    ]
+                    self.send_json(200, {
+                        "transcript": " ".join(w["word"] for w in words),
+                        "timestamped_transcript": words,
+                    })
+                finally:
+                    with fake.lock:
+                        fake.in_flight -= 1
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def test_splits_land_in_silences():
+    """Cuts fall inside pauses and no chunk exceeds the limit."""
+    print("✂️ Testing silence splitting...")
+
+    # 8s speech / 1s pause, repeated: pauses start at 8, 17, 26, 35...
+    pattern = [(8, True), (1, False)] * 6
+    audio = make_speech(pattern)
+    with wave.open(io.BytesIO(audio), "rb") as wav:
+        samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype="<i2")
+
+    cuts = find_split_points(samples, SAMPLE_RATE, max_chunk_seconds=20)
+    cut_seconds = [cut / SAMPLE_RATE for cut in cuts]
+    for cut in cut_seconds:
+        assert 8 <= cut % 9 <= 9, cut_seconds  # Inside a pause
+
+    bounds = [0, *cuts, len(samples)]
+    assert max(b - a for a, b in zip(bounds, bounds[1:])) <= 20 * SAMPLE_RATE
+
+    chunks = split_audio(audio, 20)
+    assert [offset for offset, _ in chunks] == [int(c * 1000) for c in [0, *cut_seconds]]
+    assert split_audio(b"not a wav", 20) is None
+    print(f"  ✅ Cut at {', '.join(f'{c:.2f}s' for c in cut_seconds)}")
+
+
+def test_chunks_transcribed_concurrently_with_retry():
+    """Chunks run under the concurrency limit, retry 503s and stitch words by offset."""
+    print("\n🧩 Testing chunked Sarvam transcription...")
+
+    audio = make_speech([(8, True), (1, False)] * 10)  # 90s
+
+    async def run():
+        result = await transcribe_audio_sarvam_chunked(audio, output_script="devanagari")
+        await http_clients.shutdown()
+        return result
+
+    with FakeSarvam(fail_first=2) as fake:
+        with override_settings(
+            sarvam_base_url=fake.url,
+            sarvam_api_key="test",
+            sarvam_chunk_seconds=10,
+            sarvam_max_concurrency=3,
+            sarvam_rate_limit=100,
+            sarvam_burst=100,
+        ):
+            started = time.monotonic()
+            result = asyncio.run(run())
+            elapsed = time.monotonic() - started
+
+    chunks = split_audio(audio, 10)
+    assert fake.peak == 3, fake.peak
+    assert fake.requests == len(chunks) + 2
+    starts = [word.start for word in result.words]
+    assert starts == sorted(starts)
+    assert result.words[-1].end <= 90_000
+    # Each chunk's first word starts exactly at its offset
+    offsets = {offset for offset, _ in chunks}
+    assert offsets <= set(starts)
+    assert result.text.startswith("w0 w1")
+    print(f"  ✅ {len(chunks)} chunks, {len(result.words)} words, peak {fake.peak} in flight, {elapsed:.1f}s")
+
+
+def test_silent_chunk_adds_no_words():
+    """A chunk with nothing said contributes no words; text and words stay in step."""
+    print("\n🤫 Testing a silent chunk...")
+
+    audio = make_speech([(8, True), (12, False), (8, True)])  # 28s, quiet in the middle
+    quiet = make_speech([(28, False)])
+
+    async def run(audio):
+        result = await transcribe_audio_sarvam_chunked(audio, output_script="devanagari")
+        await http_clients.shutdown()
+        return result
+
+    with FakeSarvam(latency=0) as fake:
+        with override_settings(sarvam_base_url=fake.url, sarvam_api_key="test", sarvam_chunk_seconds=10):
+            result = asyncio.run(run(audio))
+            silence = asyncio.run(run(quiet))
+
+    chunks = split_audio(audio, 10)
+    assert fake.requests == len(chunks) + len(split_audio(quiet, 10))
+    assert all(word.text.startswith("w") for word in result.words), result.words
+    assert result.text == " ".join(word.text for word in result.words)
+    # No word is placed inside the quiet stretch
+    assert not any(9_000 <= word.start < 17_000 for word in result.words), result.words
+
+    # All chunks silent: one placeholder for the whole file, not one per chunk
+    assert [word.text for word in silence.words] == ["No transcription"]
+    print(f"  ✅ {len(result.words)} words from {len(chunks)} chunks, none from the silent one")
+
+
+def test_rate_limited_chunk_fails_without_extra_retries():
+    """429s are retried only by the provider governor, and a failed chunk cancels the rest."""
+    print("\n🛑 Testing a rate-limited chunk...")
+
+    audio = make_speech([(8, True), (1, False)] * 4)  # 36s, 4 chunks
+
+    async def run():
+        try:
+            await transcribe_audio_sarvam_chunked(audio, output_script="devanagari")
+            assert False, "rate-limited transcription succeeded"
+        except SarvamTranscriptionError as e:
+            assert e.status_code == 429, e
+        finally:
+            await http_clients.shutdown()
+
+    with FakeSarvam(fail_first=1000, latency=0, fail_status=429) as fake:
+        with override_settings(
+            sarvam_base_url=fake.url,
+            sarvam_api_key="test",
+            sarvam_chunk_seconds=10,
+            sarvam_max_concurrency=1,
+            sarvam_rate_limit=100,
+            sarvam_burst=100,
+            provider_max_retries=2,
+        ):
+            asyncio.run(run())
+            requests = fake.requests
+
+    # The first chunk's request plus 2 governor retries; queued chunks never send
+    assert requests == 3, requests
+    print(f"  ✅ {requests} requests, remaining chunks cancelled")
+
+
+def test_short_audio_is_one_request():
+    """Audio under the chunk length goes through a single request."""
+    print("\n📏 Testing short audio path...")
+
+    async def run():
+        result = await transcribe_audio_sarvam_chunked(make_speech([(5, True)]), output_script="devanagari")
+        await http_clients.shutdown()
+        return result
+
+    with FakeSarvam(latency=0) as fake:
+        with override_settings(sarvam_base_url=fake.url, sarvam_api_key="test", sarvam_chunk_seconds=25):
+            result = asyncio.run(run())
+
+    assert fake.requests == 1
+    assert [w.text for w in result.words] == ["w0", "w1", "w2", "w3", "w4"]
+    print("  ✅ Single request")
+
+
+if __name__ == "__main__":
+    test_splits_land_in_silences()
+    test_chunks_transcribed_concurrently_with_retry()
+    test_silent_chunk_adds_no_words()
+    test_rate_limited_chunk_fails_without_extra_retries()
+    test_short_audio_is_one_request()
+    print("\n✅ All chunked Sarvam tests passed!")
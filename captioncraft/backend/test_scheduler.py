@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""Tests for the stage-aware job scheduler (no FFmpeg or API keys needed)."""
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import processor
+from models import ProcessRequest, Word
+from processor import JobScheduler, QueueFullError, CPU_STAGE, NETWORK_STAGE
+from test_transcriber import override_settings
+from word_timeline import WordTimeline
+
+
+def test_stage_concurrency_is_bounded():
+    """No more than `workers` jobs run a stage at the same time."""
+    print("🧵 Testing per-stage concurrency limits...")
+
+    async def run():
+        scheduler = JobScheduler(cpu_workers=2, network_workers=5, max_queue_depth=20)
+        peak = {CPU_STAGE: 0, NETWORK_STAGE: 0}
+
+        async def job(kind):
+            async with scheduler.stage(kind):
+                active = scheduler.stats()["stages"][kind]["active"]
+                peak[kind] = max(peak[kind], active)
+                await asyncio.sleep(0.01)
+
+        tasks = [
+            scheduler.submit(job, kind)
+            for kind in (CPU_STAGE, NETWORK_STAGE)
+            for _ in range(10)
+        ]
+        await asyncio.gather(*tasks)
+        return peak, scheduler.stats()
+
+    peak, stats = asyncio.run(run())
+
+    assert peak[CPU_STAGE] == 2, peak
+    assert peak[NETWORK_STAGE] == 5, peak
+    assert stats["jobs"] == 0
+    print(f"  ✅ Peak concurrency: {peak}")
+
+
+def test_network_wait_frees_cpu_slot():
+    """A job waiting on the network does not block another job's encode."""
+    print("\n🌐 Testing CPU slot release during network waits...")
+
+    async def run():
+        scheduler = JobScheduler(cpu_workers=1, network_workers=4, max_queue_depth=10)
+        transcribing = asyncio.Event()
+        order = []
+
+        async def slow_transcription_job():
+            async with scheduler.stage(CPU_STAGE):
+                order.append("a:extract")
+            async with scheduler.stage(NETWORK_STAGE):
+                transcribing.set()
+                await asyncio.sleep(0.05)
+                order.append("a:transcribed")
+
+        async def encode_job():
+            await transcribing.wait()
+            async with scheduler.stage(CPU_STAGE):
+                order.append("b:burn")
+
+        await asyncio.gather(
+            scheduler.submit(slow_transcription_job),
+            scheduler.submit(encode_job),
+        )
+        return order
+
+    order = asyncio.run(run())
+
+    assert order.index("b:burn") < order.index("a:transcribed"), order
+    print(f"  ✅ Order: {order}")
+
+
+def test_admission_rejected_when_full():
+    """Submitting beyond the queue depth raises QueueFullError."""
+    print("\n🚦 Testing admission control...")
+
+    async def run():
+        scheduler = JobScheduler(cpu_workers=1, network_workers=1, max_queue_depth=2)
+        release = asyncio.Event()
+
+        async def job():
+            await release.wait()
+
+        tasks = [scheduler.submit(job), scheduler.submit(job)]
+        assert scheduler.is_full()
+
+        try:
+            scheduler.submit(job)
+            rejected = False
+        except QueueFullError:
+            rejected = True
+
+        release.set()
+        await asyncio.gather(*tasks)
+        return rejected, scheduler.is_full()
+
+    rejected, still_full = asyncio.run(run())
+
+    assert rejected
+    assert not still_full
+    print("  ✅ Third job rejected, queue drained afterwards")
+
+
+def test_multi_slot_request_not_starved():
+    """A 3-slot encode waiting behind steady 1-slot traffic gets its turn in order."""
+    print("\n🚦 Testing multi-slot fairness...")
+
+    async def run():
+        scheduler = JobScheduler(cpu_workers=3, network_workers=1, max_queue_depth=10)
+        loop = asyncio.get_running_loop()
+        stop_at = loop.time() + 0.5
+
+        async def single_slot_traffic():
+            while loop.time() < stop_at:
+                async with scheduler.stage(CPU_STAGE):
+                    await asyncio.sleep(0.01)
+
+        async def parallel_burn():
+            await asyncio.sleep(0.05)
+            requested = loop.time()
+            async with scheduler.stage(CPU_STAGE, slots=3):
+                return loop.time() - requested, loop.time() < stop_at
+
+        traffic = [asyncio.create_task(single_slot_traffic()) for _ in range(3)]
+        waited, during_traffic = await parallel_burn()
+        await asyncio.gather(*traffic)
+        return waited, during_traffic
+
+    waited, during_traffic = asyncio.run(run())
+
+    assert during_traffic and waited < 0.1, waited
+    print(f"  ✅ 3-slot hold acquired after {waited * 1000:.0f}ms while 1-slot jobs kept arriving")
+
+
+def test_encoders_never_exceed_cpu_slots():
+    """Parallel segments and variant batches start no more encoders than the CPU slots held."""
+    print("\n🧮 Testing encoder counts against CPU slots...")
+
+    scheduler = JobScheduler(cpu_workers=2, network_workers=1, max_queue_depth=10)
+    encoders = []
+
+    def held_slots() -> int:
+        stage = scheduler.stats()["stages"][CPU_STAGE]
+        return stage["workers"] - stage["free"]
+
+    async def keyframes(video_path):
+        return [float(i) for i in range(60)]
+
+    async def burn_segments(video_path, segments, subtitle_paths, output_path, fonts_dir, on_progress=None):
+        encoders.append((len(segments), held_slots()))
+        return output_path
+
+    async def burn_variants(video_path, branches, on_progress=None):
+        encoders.append((len(branches), held_slots()))
+        return [output_path for _, _, output_path in branches]
+
+    async def run(tmp):
+        words = WordTimeline.from_words([Word(text="namaste", start=0, end=500)])
+        video_info = {"width": 1280, "height": 720, "duration": 60.0, "codec": "h264"}
+        request = ProcessRequest(video_id="v")
+        await processor.render_captions("job", "in.mp4", words, video_info, request, os.path.join(tmp, "out.mp4"))
+
+        request = ProcessRequest(video_id="v", variants=[{"aspect_ratio": "9:16"}] * 5)
+        return await processor.render_variants("job", "in.mp4", words, video_info, request)
+
+    patched = ("get_scheduler", "get_keyframes", "burn_captions_parallel", "burn_variants")
+    originals = {name: getattr(processor, name) for name in patched}
+    stubs = (lambda: scheduler, keyframes, burn_segments, burn_variants)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, stub in zip(patched, stubs):
+            setattr(processor, name, stub)
+        try:
+            with override_settings(temp_dir=tmp, output_dir=tmp, parallel_burn_segments=8, parallel_burn_min_duration=0):
+                outputs = asyncio.run(run(tmp))
+        finally:
+            for name, original in originals.items():
+                setattr(processor, name, original)
+
+    # 8 segments asked for, 2 run; 5 variants go out in runs of 2, 2 and 1
+    assert encoders == [(2, 2), (2, 2), (2, 2), (1, 1)], encoders
+    assert len(outputs) == 5
+    print(f"  ✅ Encoders per run vs slots held: {encoders}")
+
+
+if __name__ == "__main__":
+    test_stage_concurrency_is_bounded()
+    test_network_wait_frees_cpu_slot()
+    test_admission_rejected_when_full()
+    test_multi_slot_request_not_starved()
+    test_encoders_never_exceed_cpu_slots()
+    print("\n✅ All scheduler tests passed!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""Tests for soft (muxed, toggleable) caption tracks and output containers."""
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic import ValidationError
+
+import processor
+from models import OutputContainer, OutputMode, ProcessRequest, Word
+from processor import ProcessingError, create_job, get_output_path, mux_subtitles, parse_ffmpeg_input_info, render_captions
+from subtitles import save_ass_subtitle
+from test_transcriber import override_settings
+from word_timeline import WordTimeline
+
+
+def mux_command(container: OutputContainer, language: str = "hi", audio_codec: str = "aac") -> list:
+    """The FFmpeg command mux_subtitles builds, with run_ffmpeg stubbed."""
+    commands = []
+
+    async def capture(cmd, error_message, on_progress=None):
+        commands.append(cmd)
+        return b"", ""
+
+    run_ffmpeg = processor.run_ffmpeg
+    processor.run_ffmpeg = capture
+    try:
+        asyncio.run(mux_subtitles(
+            "in.mp4", "subs.ass", f"out.{container.value}", container, language, audio_codec=audio_codec,
+        ))
+    finally:
+        processor.run_ffmpeg = run_ffmpeg
+    return commands[0]
+
+
+def option(cmd: list, flag: str):
+    return cmd[cmd.index(flag) + 1] if flag in cmd else None
+
+
+def test_mux_commands():
+    """Each container gets its subtitle codec; video is copied, audio too unless WebM can't hold it."""
+    print("🎚️  Testing soft-mode FFmpeg commands...")
+
+    expected = {
+        OutputContainer.MP4: "mov_text",
+        OutputContainer.MKV: "ass",
+        OutputContainer.WEBM: "webvtt",
+    }
+    for container, subtitle_codec in expected.items():
+        cmd = mux_command(container, audio_codec="opus" if container == OutputContainer.WEBM else "aac")
+        assert option(cmd, "-c:s") == subtitle_codec, cmd
+        assert option(cmd, "-c:v") == "copy" and option(cmd, "-c:a") == "copy", cmd
+        assert cmd[cmd.index("-map") + 1:][:5] == ["0:v", "-map", "0:a?", "-map", "1:0"], cmd
+        assert option(cmd, "-metadata:s:s:0") == "language=hin"
+        assert cmd[-1] == f"out.{container.value}"
+
+    # AAC/MP3 can't be copied into WebM, so it is encoded to Opus
+    for audio_codec in ("aac", "mp3", None):
+        cmd = mux_command(OutputContainer.WEBM, audio_codec=audio_codec)
+        assert option(cmd, "-c:a") == "libopus" and option(cmd, "-c:v") == "copy", cmd
+    assert option(mux_command(OutputContainer.WEBM, audio_codec="vorbis"), "-c:a") == "copy"
+
+    assert option(mux_command(OutputContainer.MP4, language="en"), "-metadata:s:s:0") == "language=eng"
+    assert "-metadata:s:s:0" not in mux_command(OutputContainer.MP4, language="fr")
+    print("  ✅ mov_text/ass/webvtt, stream copy, Opus for WebM, language tags")
+
+
+def test_container_validation_and_paths():
+    """Only soft mode may pick a container, and outputs take its extension."""
+    print("\n📦 Testing container validation and output paths...")
+
+    for container in ("mkv", "webm"):
+        try:
+            ProcessRequest(video_id="v", container=container)
+            assert False, f"burn mode accepted {container}"
+        except ValidationError as e:
+            assert "soft" in str(e)
+        assert ProcessRequest(video_id="v", output_mode="soft", container=container).container.value == container
+    assert ProcessRequest(video_id="v").container == OutputContainer.MP4
+
+    with override_settings(output_dir="/outputs"):
+        soft = ProcessRequest(video_id="v", output_mode="soft", container="mkv")
+        assert get_output_path("/tmp/clip.mov", "job1", soft) == "/outputs/clip_job1_captioned.mkv"
+        burn = ProcessRequest(video_id="v")
+        assert get_output_path("/tmp/clip.mov", "job1", burn) == "/outputs/clip_job1_captioned.mp4"
+
+    # WebM needs VP8/VP9/AV1 video; refused before anything runs
+    request = ProcessRequest(video_id="v", output_mode=OutputMode.SOFT, container=OutputContainer.WEBM)
+    video_info = {"width": 320, "height": 180, "duration": 1.0, "codec": "h264", "audio_codec": "aac"}
+    try:
+        asyncio.run(render_captions(create_job("v").job_id, "in.mp4", WordTimeline.from_words([]), video_info, request, "out.webm"))
+        assert False, "WebM from H.264 accepted"
+    except ProcessingError as e:
+        assert "h264" in str(e)
+    print("  ✅ Burn mode is MP4 only; .mkv/.webm/.mp4 extensions")
+
+
+def test_webm_from_aac_source():
+    """A VP9 clip with AAC audio muxes into a playable WebM with Opus audio and a WebVTT track."""
+    print("\n🎞️  Testing WebM muxing from an AAC source...")
+
+    if not shutil.which("ffmpeg"):
+        print("  ⚠️ FFmpeg not found, skipping WebM mux test")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "input.mkv")
+        subtitle_path = os.path.join(tmp, "captions.ass")
+        output_path = os.path.join(tmp, "output.webm")
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "lavfi", "-i", "testsrc=size=160x90:rate=10:duration=2",
+                "-f", "lavfi", "-i", "sine=frequency=440:duration=2",
+                "-c:v", "libvpx-vp9", "-deadline", "realtime", "-c:a", "aac", "-shortest",
+                video_path,
+            ],
+            check=True,
+        )
+        save_ass_subtitle(subtitle_path, WordTimeline.from_words([Word(text="namaste", start=0, end=1000)]))
+
+        probe = subprocess.run(["ffmpeg", "-i", video_path], capture_output=True, text=True)
+        audio_codec = parse_ffmpeg_input_info(probe.stderr)["audio_codec"]
+        assert audio_codec == "aac"
+        asyncio.run(mux_subtitles(video_path, subtitle_path, output_path, OutputContainer.WEBM, "hi", audio_codec=audio_codec))
+
+        probe = subprocess.run(["ffmpeg", "-i", output_path], capture_output=True, text=True)
+    assert "Video: vp9" in probe.stderr and "Audio: opus" in probe.stderr, probe.stderr
+    assert "Subtitle: webvtt" in probe.stderr, probe.stderr
+    print("  ✅ VP9 copied, AAC encoded to Opus, WebVTT track added")
+
+
+if __name__ == "__main__":
+    test_mux_commands()
+    test_container_validation_and_paths()
+    test_webm_from_aac_source()
+    print("\n✅ All soft mode tests passed!")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Tests for the streaming ASS subtitle writer (no FFmpeg needed)."""
+import io
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models import CaptionPosition, CaptionStyle, FontFamily, Word
+from subtitles import ass_header, generate_ass_subtitle, iter_ass_events, write_ass_subtitle
+
+
+def make_words(count: int):
+    return (Word(text=f"w{i}", start=i * 400, end=i * 400 + 350) for i in range(count))
+
+
+def test_write_matches_generate():
+    """Streaming to a file gives exactly the string generate_ass_subtitle returns."""
+    print("📝 Testing streamed ASS output...")
+
+    words = list(make_words(500))
+    for offset_ms, end_ms in [(0, None), (30_000, 90_000)]:
+        buffer = io.StringIO()
+        write_ass_subtitle(
+            buffer, iter(words), CaptionStyle.HIGHLIGHT, FontFamily.POPPINS, CaptionPosition.TOP,
+            3, 720, 1280, offset_ms, end_ms,
+        )
+        expected = generate_ass_subtitle(
+            words, CaptionStyle.HIGHLIGHT, FontFamily.POPPINS, CaptionPosition.TOP,
+            3, 720, 1280, offset_ms, end_ms,
+        )
+        assert buffer.getvalue() == expected
+        assert expected.startswith(ass_header(CaptionStyle.HIGHLIGHT, FontFamily.POPPINS, CaptionPosition.TOP, 720, 1280))
+
+    assert ass_header() is ass_header()  # Built once per look and resolution
+    print("  ✅ Identical output")
+
+
+def test_events_are_streamed():
+    """A long transcript is written without holding the file in memory."""
+    print("\n🌊 Testing memory use on a long transcript...")
+
+    count = 200_000  # About 22 hours at 150 words per minute
+    events = iter_ass_events(make_words(count), words_per_line=4)
+    assert next(events).startswith("Dialogue: 0,0:00:00.00,")
+
+    tracemalloc.start()
+    with open(os.devnull, "w", encoding="utf-8") as f:
+        write_ass_subtitle(f, make_words(count))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    file_size = len(generate_ass_subtitle(list(make_words(count))))
+    assert peak < file_size / 10, (peak, file_size)
+    print(f"  ✅ Peak {peak / 1024:.0f} KiB for a {file_size / 1024 / 1024:.1f} MiB file")
+
+
+if __name__ == "__main__":
+    test_write_matches_generate()
+    test_events_are_streamed()
+    print("\n✅ All subtitle writer tests passed!")
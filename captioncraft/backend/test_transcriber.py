@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""Tests for the AssemblyAI client against a local fake API (no API keys needed)."""
+import asyncio
+import json
+import os
+import sys
+import shutil
+import threading
+import time
+import wave
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import http_clients
+from config import get_settings
+from transcriber import (
+    WEBHOOK_AUTH_HEADER, TranscriptionError, poll_delays, transcribe_audio,
+    upload_audio_to_assemblyai,
+)
+
+
+class FakeAssemblyAI:
+    """
+    Minimal AssemblyAI API on localhost.
+
+    Transcripts complete `complete_after` seconds after they are started. If a
+    transcript was started with a webhook URL, `on_webhook(url, headers, body)`
+    is called from a server thread at that moment. The first `throttle_first`
+    requests get a 429. Records uploaded bodies and counts requests, status
+    polls and TCP connections.
+    """
+
+    def __init__(self, complete_after: float = 0.0, on_webhook=None, throttle_first: int = 0):
+        self.lock = threading.Lock()
+        self.throttle_left = throttle_first
+        self.requests = 0
+        self.polls = 0
+        self.connections = 0
+        self.transcripts = {}
+        self.started = {}
+        self.uploads = []
+        self.complete_after = complete_after
+        self.on_webhook = on_webhook
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive
+
+            def setup(self):
+                super().setup()
+                with fake.lock:
+                    fake.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def send_json(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def read_body(self) -> bytes:
+                if self.headers.get("Transfer-Encoding") != "chunked":
+                    return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                body = b""
+                while (line := self.rfile.readline().strip()) and (size := int(line.split(b";")[0], 16)):
+                    body += self.rfile.read(size)
+                    self.rfile.readline()
+                self.rfile.readline()
+                return body
+
+            def throttled(self) -> bool:
+                with fake.lock:
+                    fake.requests += 1
+                    throttle = fake.throttle_left > 0
+                    fake.throttle_left -= 1
+                if throttle:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0.2")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                return throttle
+
+            def do_POST(self):
+                body = self.read_body()
+                if self.throttled():
+                    return
+                with fake.lock:
+                    transcript_id = f"t{len(fake.transcripts)}"
+                if self.path == "/upload":
+                    with fake.lock:
+                        fake.uploads.append((self.headers.get("Transfer-Encoding"), body))
+                    self.send_json(200, {"upload_url": f"fake://{len(body)}"})
+                elif self.path == "/transcript":
+                    payload = json.loads(body)
+                    with fake.lock:
+                        fake.transcripts[transcript_id] = payload
+                        fake.started[transcript_id] = time.monotonic()
+                    self.send_json(200, {"id": transcript_id, "status": "queued"})
+                    if payload.get("webhook_url") and fake.on_webhook:
+                        threading.Timer(fake.complete_after, fake.on_webhook, args=(
+                            payload["webhook_url"],
+                            {payload["webhook_auth_header_name"]: payload["webhook_auth_header_value"]},
+                            {"transcript_id": transcript_id, "status": "completed"},
+                        )).start()
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+            def do_GET(self):
+                transcript_id = self.path.rsplit("/", 1)[-1]
+                if self.throttled():
+                    return
+                with fake.lock:
+                    fake.polls += 1
+                    elapsed = time.monotonic() - fake.started[transcript_id]
+                if elapsed < fake.complete_after:
+                    self.send_json(200, {"id": transcript_id, "status": "processing"})
+                    return
+                self.send_json(200, {
+                    "id": transcript_id,
+                    "status": "completed",
+                    "text": "hello world",
+                    "language_code": "en",
+                    "words": [
+                        {"text": "hello", "start": 0, "end": 400, "confidence": 0.9},
+                        {"text": "world", "start": 400, "end": 900, "confidence": 0.8},
+                    ],
+                })
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.server.handle_error = lambda request, address: None  # Clients aborting uploads
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextmanager
+def override_settings(**values):
+    settings = get_settings()
+    original = {name: getattr(settings, name) for name in values}
+    for name, value in values.items():
+        setattr(settings, name, value)
+    try:
+        yield settings
+    finally:
+        for name, value in original.items():
+            setattr(settings, name, value)
+
+
+def make_wav(seconds: float, sample_rate: int = 16000) -> bytes:
+    """A WAV of a quiet warbling tone (speech-like enough to compress)."""
+    import io
+    import math
+
+    frames = bytearray()
+    for i in range(int(seconds * sample_rate)):
+        t = i / sample_rate
+        sample = int(3000 * math.sin(2 * math.pi * (220 + 40 * math.sin(2 * math.pi * 3 * t)) * t))
+        frames += sample.to_bytes(2, "little", signed=True)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(frames))
+    return buffer.getvalue()
+
+
+WAV = make_wav(0.5)
+
+
+def test_concurrent_jobs_reuse_pooled_connections():
+    """Concurrent transcriptions share a bounded pool of keep-alive connections."""
+    print("🔌 Testing pooled provider connections...")
+
+    async def run():
+        first = await asyncio.gather(*[transcribe_audio(WAV) for _ in range(20)])
+        # A second wave of jobs finds the connections already open
+        second = await asyncio.gather(*[transcribe_audio(WAV) for _ in range(20)])
+        await http_clients.shutdown()
+        return first + second
+
+    with FakeAssemblyAI() as fake:
+        with override_settings(
+            assemblyai_base_url=fake.url, http_max_connections=4, assemblyai_upload_codec="wav"
+        ):
+            results = asyncio.run(run())
+
+    assert len(results) == 40
+    assert all(r.text == "hello world" and len(r.words) == 2 for r in results)
+    assert fake.requests == 40 * 3  # upload, start, one poll
+    assert fake.connections <= 4, fake.connections
+    print(f"  ✅ {fake.requests} requests over {fake.connections} connections")
+
+
+def test_client_lifecycle():
+    """The shared client is closed on shutdown and recreated per event loop."""
+    print("\n♻️ Testing shared client lifecycle...")
+
+    async def in_loop():
+        await http_clients.startup()
+        client = http_clients.get_http_client()
+        assert http_clients.get_http_client() is client
+        await http_clients.shutdown()
+        assert client.is_closed
+        return http_clients.get_http_client()
+
+    lazy = asyncio.run(in_loop())
+
+    async def next_loop():
+        client = http_clients.get_http_client()
+        await http_clients.shutdown()
+        return client
+
+    assert asyncio.run(next_loop()) is not lazy
+    print("  ✅ Client closed on shutdown and scoped to its event loop")
+
+
+def test_poll_delays_adapt_to_audio_duration():
+    """The first check lands near the expected finish, then backs off with jitter."""
+    print("\n⏱️ Testing adaptive poll schedule...")
+
+    with override_settings(
+        assemblyai_poll_min_interval=1.0,
+        assemblyai_poll_max_interval=30.0,
+        assemblyai_expected_rtf=0.15,
+        assemblyai_webhook_url="",
+    ) as settings:
+        delays = poll_delays(audio_duration=120)  # ~18s to transcribe 2 minutes
+        first, *rest = [next(delays) for _ in range(12)]
+        assert 18 * 0.8 <= first <= 18 * 1.2, first
+
+        # Long audio is capped at the max interval
+        assert next(poll_delays(audio_duration=3600)) <= 30 * 1.2
+        expected = [min(1.5 ** i, 30) for i in range(11)]
+        for delay, base in zip(rest, expected):
+            assert base * 0.8 <= delay <= base * 1.2, (delay, base)
+
+        settings.assemblyai_webhook_url = "https://example.com/webhooks/assemblyai"
+        webhook_delays = poll_delays(audio_duration=600)
+        assert all(24 <= next(webhook_delays) <= 36 for _ in range(5))
+
+    print(f"  ✅ First wait {first:.1f}s, then {', '.join(f'{d:.1f}' for d in rest[:5])}...")
+
+
+def test_webhook_wakes_waiting_job():
+    """A webhook delivered to the API route completes the job without polling."""
+    print("\n🪝 Testing webhook completion...")
+
+    import httpx
+    from main import app
+
+    async def run(fake: FakeAssemblyAI):
+        loop = asyncio.get_running_loop()
+        api = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://api")
+        deliveries = []
+
+        def deliver(url, headers, body):
+            # AssemblyAI calls the public URL; route it to the app in this loop
+            path = httpx.URL(url).path
+            deliveries.append(asyncio.run_coroutine_threadsafe(
+                api.post(path, headers=headers, json=body), loop
+            ))
+
+        fake.on_webhook = deliver
+        started = time.monotonic()
+        result = await transcribe_audio(WAV, audio_duration=3600)
+        elapsed = time.monotonic() - started
+
+        responses = [await asyncio.wrap_future(d) for d in deliveries]
+        rejected = await api.post(
+            "/webhooks/assemblyai",
+            headers={WEBHOOK_AUTH_HEADER: "wrong"},
+            json={"transcript_id": "t0", "status": "completed"},
+        )
+        await api.aclose()
+        await http_clients.shutdown()
+        return result, elapsed, responses, rejected
+
+    with FakeAssemblyAI(complete_after=0.5) as fake:
+        with override_settings(
+            assemblyai_base_url=fake.url,
+            assemblyai_webhook_url="https://captions.example.com/webhooks/assemblyai",
+            assemblyai_webhook_secret="s3cret",
+            assemblyai_upload_codec="wav",
+        ):
+            result, elapsed, responses, rejected = asyncio.run(run(fake))
+
+    payload = fake.transcripts["t0"]
+    assert payload["webhook_url"] == "https://captions.example.com/webhooks/assemblyai"
+    assert payload["webhook_auth_header_value"] == "s3cret"
+    assert [r.json() for r in responses] == [{"transcript_id": "t0", "waiting": True}]
+    assert rejected.status_code == 401
+    assert result.text == "hello world"
+    # One status check up front and one after the webhook; an hour of audio
+    # would otherwise mean waiting out the 30s safety-net poll
+    assert fake.polls == 2, fake.polls
+    assert elapsed < 5, elapsed
+    print(f"  ✅ Completed {elapsed:.2f}s after start with {fake.polls} status checks")
+
+
+def test_webhook_rejects_malformed_requests():
+    """Bad bodies are 400s and odd credentials 401s, never a 500."""
+    print("\n🧱 Testing malformed webhook requests...")
+
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+    url = "/webhooks/assemblyai"
+    with override_settings(assemblyai_webhook_secret="s3cret"):
+        auth = {WEBHOOK_AUTH_HEADER: "s3cret"}
+        assert client.post(url, headers=auth, content=b"not json").status_code == 400
+        assert client.post(url, headers=auth, json=["t0"]).status_code == 400
+        assert client.post(url, headers=auth, json="t0").status_code == 400
+        assert client.post(url, headers=auth, json={}).status_code == 400
+        assert client.post(url, headers=auth, json={"transcript_id": "unknown"}).json()["waiting"] is False
+
+        non_ascii = {WEBHOOK_AUTH_HEADER: "s3crét".encode("latin-1")}
+        assert client.post(url, headers=non_ascii, json={"transcript_id": "t0"}).status_code == 401
+    print("  ✅ 400 for non-JSON and non-object bodies, 401 for a non-ASCII token")
+
+
+def test_polling_fallback_without_webhook():
+    """Without webhooks, polling backs off instead of hitting the API every 3s."""
+    print("\n🔁 Testing adaptive polling fallback...")
+
+    async def run():
+        result = await transcribe_audio(WAV, audio_duration=10)
+        await http_clients.shutdown()
+        return result
+
+    with FakeAssemblyAI(complete_after=1.0) as fake:
+        with override_settings(
+            assemblyai_base_url=fake.url,
+            assemblyai_poll_min_interval=0.05,
+            assemblyai_poll_max_interval=0.5,
+            assemblyai_expected_rtf=0.08,  # First check ~0.8s in
+            assemblyai_upload_codec="wav",
+        ):
+            result = asyncio.run(run())
+
+    assert result.text == "hello world"
+    assert 3 <= fake.polls <= 8, fake.polls  # Polling every 0.05s would take ~20
+    print(f"  ✅ Completed with {fake.polls} status checks")
+
+
+def test_rate_limited_job_is_requeued():
+    """429s from the provider delay jobs instead of failing them."""
+    print("\n🚦 Testing provider rate limiting...")
+
+    from provider_governor import get_governor
+
+    async def run():
+        results = await asyncio.gather(*[transcribe_audio(WAV) for _ in range(5)])
+        stats = get_governor("assemblyai").stats()
+        await http_clients.shutdown()
+        return results, stats
+
+    with FakeAssemblyAI(throttle_first=3) as fake:
+        with override_settings(assemblyai_base_url=fake.url, assemblyai_upload_codec="wav"):
+            results, stats = asyncio.run(run())
+
+    assert all(r.text == "hello world" for r in results)
+    assert stats["throttled"] == 3, stats
+    assert stats["requests"] == 5 * 3 + 3
+    print(f"  ✅ All jobs completed; {stats['throttled']} requests throttled and requeued")
+
+
+def test_upload_is_streamed_and_compressed():
+    """Uploads go out in chunks, FLAC-encoded on the fly, from bytes or a file."""
+    print("\n🗜️ Testing streaming compressed upload...")
+
+    if not shutil.which("ffmpeg"):
+        print("  ⚠️ FFmpeg not found, skipping compressed upload test")
+        return
+
+    wav = make_wav(10)
+    wav_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp", "upload_test.wav")
+    os.makedirs(os.path.dirname(wav_path), exist_ok=True)
+    with open(wav_path, "wb") as f:
+        f.write(wav)
+
+    async def run():
+        await upload_audio_to_assemblyai(wav)
+        await upload_audio_to_assemblyai(wav_path)
+        await http_clients.shutdown()
+
+    try:
+        with FakeAssemblyAI() as fake:
+            with override_settings(assemblyai_base_url=fake.url, assemblyai_upload_codec="flac"):
+                asyncio.run(run())
+            with override_settings(assemblyai_base_url=fake.url, assemblyai_upload_codec="wav"):
+                asyncio.run(run())
+    finally:
+        os.remove(wav_path)
+
+    flac_uploads, wav_uploads = fake.uploads[:2], fake.uploads[2:]
+    assert all(encoding == "chunked" for encoding, _ in fake.uploads)
+    for _, body in flac_uploads:
+        assert body.startswith(b"fLaC")
+        assert len(body) < len(wav) / 2, (len(body), len(wav))
+    assert [body for _, body in wav_uploads] == [wav, wav]
+
+    ratio = len(wav) / len(flac_uploads[0][1])
+    print(f"  ✅ {len(wav)} byte WAV uploaded as {len(flac_uploads[0][1])} byte FLAC ({ratio:.1f}x)")
+
+
+def test_upload_encoding_failure():
+    """An FFmpeg failure mid-upload surfaces as a TranscriptionError."""
+    print("\n💥 Testing upload encoding failure...")
+
+    if not shutil.which("ffmpeg"):
+        print("  ⚠️ FFmpeg not found, skipping encoding failure test")
+        return
+
+    async def run():
+        try:
+            await upload_audio_to_assemblyai(b"not audio at all" * 1000)
+        except TranscriptionError as e:
+            return str(e)
+        finally:
+            await http_clients.shutdown()
+
+    with FakeAssemblyAI() as fake:
+        with override_settings(assemblyai_base_url=fake.url, assemblyai_upload_codec="flac"):
+            error = asyncio.run(run())
+
+    assert error and error.startswith("Audio encoding failed"), error
+    print(f"  ✅ {error.splitlines()[0][:80]}")
+
+
+if __name__ == "__main__":
+    test_concurrent_jobs_reuse_pooled_connections()
+    test_client_lifecycle()
+    test_poll_delays_adapt_to_audio_duration()
+    test_webhook_wakes_waiting_job()
+    test_webhook_rejects_malformed_requests()
+    test_polling_fallback_without_webhook()
+    test_rate_limited_job_is_requeued()
+    test_upload_is_streamed_and_compressed()
+    test_upload_encoding_failure()
+    print("\n✅ All transcriber tests passed!")
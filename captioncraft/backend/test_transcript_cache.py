@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Tests for the content-addressed transcript cache."""
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models import Word, TranscriptResult
+from transcript_cache import TranscriptCache
+
+
+def make_transcript(text: str) -> TranscriptResult:
+    words = [
+        Word(text=w, start=i * 400, end=i * 400 + 350, confidence=0.9)
+        for i, w in enumerate(text.split())
+    ]
+    return TranscriptResult(words=words, text=text, language="en")
+
+
+def test_hit_and_miss():
+    """A stored transcript round-trips; other keys miss."""
+    print("💾 Testing transcript cache hits and misses...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TranscriptCache(cache_dir, max_bytes=1024 * 1024)
+        audio = b"RIFF fake wav payload"
+
+        key_en = cache.make_key(audio, "assemblyai", "en")
+        key_hi = cache.make_key(audio, "assemblyai", "hi")
+        assert key_en != key_hi
+
+        assert cache.get(key_en) is None
+        transcript = make_transcript("hello and welcome to caption craft")
+        cache.put(key_en, transcript)
+
+        cached = cache.get(key_en)
+        assert cached == transcript
+        assert cache.get(key_hi) is None
+
+        # A fresh instance picks up entries already on disk
+        reopened = TranscriptCache(cache_dir, max_bytes=1024 * 1024)
+        assert reopened.get(key_en) == transcript
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2, stats
+        print(f"  ✅ Stats: {stats}")
+
+
+def test_lru_eviction_by_size():
+    """The least recently used entry is evicted once the size limit is exceeded."""
+    print("\n🧹 Testing LRU eviction...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        entry_size = len(make_transcript("one two three").model_dump_json())
+        cache = TranscriptCache(cache_dir, max_bytes=entry_size * 2)
+
+        keys = [cache.make_key(bytes([i]), "assemblyai", "en") for i in range(3)]
+        cache.put(keys[0], make_transcript("one two three"))
+        cache.put(keys[1], make_transcript("one two three"))
+
+        # Touch the first entry so the second becomes least recently used
+        assert cache.get(keys[0]) is not None
+        cache.put(keys[2], make_transcript("one two three"))
+
+        assert cache.get(keys[1]) is None
+        assert cache.get(keys[0]) is not None
+        assert cache.get(keys[2]) is not None
+        assert not os.path.exists(os.path.join(cache_dir, f"{keys[1]}.json"))
+        assert cache.stats()["size_bytes"] <= entry_size * 2
+        print("  ✅ Least recently used entry evicted")
+
+
+def test_concurrent_puts_of_one_key():
+    """Jobs with the same audio can store the transcript at the same time."""
+    print("\n🧵 Testing concurrent puts...")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TranscriptCache(cache_dir, max_bytes=1024 * 1024)
+        key = cache.make_key(b"same audio", "assemblyai", "en")
+        transcript = make_transcript("same words from two jobs")
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            for future in [pool.submit(cache.put, key, transcript) for _ in range(200)]:
+                future.result()  # Raises if a writer lost its temp file
+
+        assert cache.get(key) == transcript
+        assert os.listdir(cache_dir) == [f"{key}.json"]
+        assert cache.stats()["entries"] == 1
+        print("  ✅ 200 concurrent puts, one entry, no temp files left")
+
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_lru_eviction_by_size()
+    test_concurrent_puts_of_one_key()
+    print("\n✅ All transcript cache tests passed!")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Tests for multi-variant rendering (several caption looks and frame shapes per encode)."""
+import asyncio
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import processor
+from models import AspectRatio, FrameFit, OutputVariant, ProcessRequest, ProcessingStatus, Word
+from processor import (
+    JobScheduler, create_job, get_job, ingest_media, job_artifacts, parse_ffmpeg_input_info,
+    restyle_video, variant_frame,
+)
+from test_transcriber import override_settings
+from word_timeline import WordTimeline
+
+
+def test_variant_frames():
+    """Crops fit inside the source, pads cover it, and every size is even."""
+    print("📐 Testing variant frame geometry...")
+
+    for width, height in [(1920, 1080), (1080, 1920), (1278, 717)]:
+        assert variant_frame(width, height, OutputVariant()) == (width, height, "")
+        for ratio in (AspectRatio.VERTICAL, AspectRatio.SQUARE, AspectRatio.PORTRAIT, AspectRatio.LANDSCAPE):
+            num, den = processor.ASPECT_RATIOS[ratio]
+
+            w, h, frame_filter = variant_frame(width, height, OutputVariant(aspect_ratio=ratio))
+            assert w <= width and h <= height and w % 2 == 0 and h % 2 == 0
+            assert abs(w / h - num / den) < 0.01, (width, height, ratio, w, h)
+            assert frame_filter == f"crop={w}:{h}"
+
+            w, h, frame_filter = variant_frame(width, height, OutputVariant(aspect_ratio=ratio, fit=FrameFit.PAD))
+            assert w >= width and h >= height and w % 2 == 0 and h % 2 == 0
+            assert abs(w / h - num / den) < 0.01, (width, height, ratio, w, h)
+            assert frame_filter.startswith(f"pad={w}:{h}:")
+
+    assert variant_frame(1920, 1080, OutputVariant(aspect_ratio=AspectRatio.VERTICAL))[:2] == (606, 1080)
+    assert variant_frame(1920, 1080, OutputVariant(aspect_ratio=AspectRatio.VERTICAL, fit=FrameFit.PAD))[:2] == (1920, 3414)
+    print("  ✅ Crop, pad and source frames verified")
+
+
+def test_variant_names():
+    """Unnamed variants get unique names; duplicates and soft mode are rejected."""
+    print("\n🏷️  Testing variant naming and validation...")
+
+    request = ProcessRequest(video_id="v", variants=[
+        {"aspect_ratio": "9:16"},
+        {"aspect_ratio": "9:16", "style": "highlight"},
+        {"aspect_ratio": "9:16"},
+        {"name": "yt", "aspect_ratio": "16:9"},
+    ])
+    assert [v.name for v in request.variants] == ["9x16", "9x16-highlight", "9x16-2", "yt"]
+    assert ProcessRequest(video_id="v").variants == []
+
+    for bad in [
+        {"variants": [{"name": "a"}, {"name": "a"}]},
+        {"variants": [{"name": "no spaces"}]},
+        {"variants": [{}] * 7},
+        {"variants": [{}], "output_mode": "soft"},
+    ]:
+        try:
+            ProcessRequest(video_id="v", **bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad}")
+    print("  ✅ Names filled in, invalid requests rejected")
+
+
+def test_variants_render_in_one_encode():
+    """Three variants come out of a single FFmpeg run at their own sizes."""
+    print("\n🎞️  Testing multi-variant rendering...")
+
+    if not shutil.which("ffmpeg"):
+        print("  ⚠️ FFmpeg not found, skipping multi-variant render test")
+        return
+
+    calls = []
+    run_ffmpeg = processor.run_ffmpeg
+
+    async def counting_run_ffmpeg(cmd, *args, **kwargs):
+        calls.append(cmd)
+        return await run_ffmpeg(cmd, *args, **kwargs)
+
+    async def run(video_path):
+        video_info, _ = await ingest_media(video_path)
+        words = WordTimeline.from_words(
+            Word(text=f"word{i}", start=i * 400, end=i * 400 + 350) for i in range(7)
+        )
+        source = create_job("test-video")
+        job_artifacts[source.job_id] = {
+            "video_path": video_path,
+            "video_info": video_info,
+            "words": words,
+            "request": ProcessRequest(video_id="test-video"),
+        }
+        request = ProcessRequest(video_id="test-video", variants=[
+            {"aspect_ratio": "9:16"},
+            {"aspect_ratio": "1:1", "fit": "pad", "style": "highlight"},
+            {"name": "wide"},
+        ])
+        calls.clear()
+        job = create_job("test-video")
+        await restyle_video(job.job_id, source.job_id, request)
+        return job.job_id
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video_path = os.path.join(tmp, "input.mp4")
+        subprocess.run(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "lavfi", "-i", "testsrc=size=320x180:rate=25:duration=3",
+                "-f", "lavfi", "-i", "sine=frequency=440:duration=3",
+                "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-shortest",
+                video_path,
+            ],
+            check=True,
+        )
+
+        # One encoder per variant needs a CPU slot each, whatever this machine's core count
+        get_scheduler = processor.get_scheduler
+        processor.run_ffmpeg = counting_run_ffmpeg
+        processor.get_scheduler = lambda: JobScheduler(cpu_workers=3, network_workers=1, max_queue_depth=10)
+        try:
+            with override_settings(output_dir=tmp, temp_dir=tmp):
+                job_id = asyncio.run(run(video_path))
+        finally:
+            processor.run_ffmpeg = run_ffmpeg
+            processor.get_scheduler = get_scheduler
+
+        assert len(calls) == 1, calls
+        job = get_job(job_id)
+        assert job.status == ProcessingStatus.COMPLETED, job.message
+        assert [(v.name, v.width, v.height) for v in job.variants] == [
+            ("9x16", 100, 180), ("1x1-highlight", 320, 320), ("wide", 320, 180),
+        ]
+        assert job.variants[0].download_url == f"/download/{job_id}/9x16"
+
+        outputs = job_artifacts[job_id]["outputs"]
+        for variant in job.variants:
+            probe = subprocess.run(["ffmpeg", "-i", outputs[variant.name]], capture_output=True, text=True)
+            info = parse_ffmpeg_input_info(probe.stderr)
+            assert (info["width"], info["height"]) == (variant.width, variant.height), info
+            assert "Audio:" in probe.stderr
+        assert not [name for name in os.listdir(tmp) if name.endswith(".ass")]
+    print(f"  ✅ {len(job.variants)} variants from one FFmpeg run")
+
+
+if __name__ == "__main__":
+    test_variant_frames()
+    test_variant_names()
+    test_variants_render_in_one_encode()
+    print("\n✅ All variant tests passed!")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Tests for the array-backed WordTimeline (no FFmpeg needed)."""
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hinglish_corrections import get_corrector
+from models import Word
+from subtitles import generate_ass_subtitle, group_words_into_lines
+from word_timeline import WordTimeline
+
+
+def make_words(count: int) -> list:
+    """Words every 400ms, a 2s pause after every 25th, from a small vocabulary."""
+    vocabulary = ["main", "hoon", "kyun", "kya", "hai", "tumhara", "kyu", "accha"]
+    words = []
+    start = 0
+    for i in range(count):
+        words.append(Word(text=vocabulary[i % len(vocabulary)], start=start, end=start + 350, confidence=0.9))
+        start += 2400 if i % 25 == 24 else 400
+    return words
+
+
+def test_round_trip_and_text_mapping():
+    """Words convert losslessly, and text rewrites run once per distinct word."""
+    print("🔁 Testing round trip and text mapping...")
+
+    words = make_words(1000)
+    timeline = WordTimeline.from_words(words)
+    assert len(timeline) == 1000 and len(timeline.vocabulary) == 8
+    assert timeline.to_words() == words
+    assert timeline.start.dtype == np.int32 and timeline.confidence.dtype == np.float32
+
+    calls = []
+
+    def correct(texts):
+        calls.append(len(texts))
+        return get_corrector().correct_texts(texts)
+
+    corrected = timeline.map_text(correct)
+    assert calls == [8]
+    assert corrected.texts == [w.text for w in get_corrector().correct_words(words)]
+    # "kyun" -> "kyu" merges two vocabulary entries
+    assert len(corrected.vocabulary) == len(set(corrected.texts)) < 8
+    print(f"  ✅ 1000 words, corrections applied to {calls[0]} distinct texts")
+
+
+def test_shift_filter_and_gaps():
+    """Offsets, windows and pauses are computed on the arrays."""
+    print("\n📐 Testing shifting, filtering and gap detection...")
+
+    timeline = WordTimeline.from_words(make_words(100))
+
+    shifted = timeline.shifted(5000)
+    assert (shifted.start - timeline.start == 5000).all()
+    assert shifted.vocabulary is timeline.vocabulary
+
+    window = timeline.between(10_000, 12_000)
+    assert all(w.end > 10_000 and w.start < 12_000 for w in window.to_words())
+    assert len(window) == sum(1 for w in make_words(100) if w.end > 10_000 and w.start < 12_000)
+
+    assert timeline.gaps(1000).tolist() == [24, 49, 74]
+    assert len(timeline.select(timeline.confidence > 0.5)) == 100
+    assert timeline.select(slice(0, 3)).texts == ["main", "hoon", "kyun"]
+    print("  ✅ Pauses found after words 24, 49, 74")
+
+
+def test_lines_match_word_lists():
+    """Subtitle lines and ASS output are identical for a timeline and a Word list."""
+    print("\n📝 Testing subtitle generation from a timeline...")
+
+    words = make_words(301)
+    timeline = WordTimeline.from_words(words)
+    for words_per_line in (1, 3, 4):
+        assert group_words_into_lines(timeline, words_per_line) == group_words_into_lines(words, words_per_line)
+        for offset_ms, end_ms in [(0, None), (30_000, 60_000), (100_000, None)]:
+            assert generate_ass_subtitle(
+                timeline, words_per_line=words_per_line, offset_ms=offset_ms, end_ms=end_ms
+            ) == generate_ass_subtitle(
+                words, words_per_line=words_per_line, offset_ms=offset_ms, end_ms=end_ms
+            )
+    assert group_words_into_lines(WordTimeline.from_words([])) == []
+    print("  ✅ Identical lines and events")
+
+
+def test_memory_and_grouping_speed():
+    """A long transcript takes a fraction of the memory and groups faster."""
+    print("\n📉 Testing memory and speed on a long transcript...")
+
+    count = 50_000
+
+    tracemalloc.start()
+    words = make_words(count)
+    word_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    timeline = WordTimeline.from_words(words)
+    assert timeline.nbytes() < word_bytes / 10, (timeline.nbytes(), word_bytes)
+
+    started = time.perf_counter()
+    from_list = group_words_into_lines(words)
+    list_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    from_timeline = group_words_into_lines(timeline)
+    timeline_seconds = time.perf_counter() - started
+
+    assert from_list == from_timeline
+    assert timeline_seconds < list_seconds
+    print(f"  ✅ {timeline.nbytes() / 1024:.0f} KiB vs {word_bytes / 1024:.0f} KiB; "
+          f"grouping {list_seconds * 1000:.1f} ms -> {timeline_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    test_round_trip_and_text_mapping()
+    test_shift_filter_and_gaps()
+    test_lines_match_word_lists()
+    test_memory_and_grouping_speed()
+    print("\n✅ All word timeline tests passed!")
@@ -1,9 +1,12 @@
 """AssemblyAI transcription integration."""
 import asyncio
-import httpx
-from typing import List, Optional
+import random
+from typing import AsyncIterator, Iterator, List, Optional, Union
 from models import Word, TranscriptResult
 from config import get_settings
+from http_clients import get_http_client, provider_timeout
+from provider_governor import get_governor
+from offload import iter_file
 
 ASSEMBLYAI_BASE_URL = "https://api.assemblyai.com/v2"
 
@@ -13,23 +16,153 @@ class TranscriptionError(Exception):
     pass
 
 
-async def upload_audio_to_assemblyai(audio_path: str) -> str:
-    """Upload local audio file to AssemblyAI and return the upload URL."""
-    settings = get_settings()
+def assemblyai_base_url() -> str:
+    return get_settings().assemblyai_base_url or ASSEMBLYAI_BASE_URL
+
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+# FFmpeg output options for compressing audio before upload (16kHz speech
+# shrinks ~2x as FLAC, lossless, and ~8x as 32kbps Opus)
+UPLOAD_CODECS = {
+    "flac": ["-c:a", "flac", "-compression_level", "5", "-f", "flac"],
+    "opus": ["-c:a", "libopus", "-b:a", "32k", "-application", "voip", "-f", "ogg"],
+}
+
+
+async def _read_chunks(audio: Union[str, bytes]) -> AsyncIterator[bytes]:
+    """Yield audio (file path or bytes) in upload-sized chunks."""
+    if isinstance(audio, bytes):
+        view = memoryview(audio)
+        for start in range(0, len(view), UPLOAD_CHUNK_SIZE):
+            yield bytes(view[start:start + UPLOAD_CHUNK_SIZE])
+        return
     
-    async with httpx.AsyncClient() as client:
-        with open(audio_path, "rb") as f:
-            response = await client.post(
-                f"{ASSEMBLYAI_BASE_URL}/upload",
-                headers={"Authorization": settings.assemblyai_api_key},
-                content=f.read(),
-                timeout=300.0,  # 5 min timeout for large files
-            )
-        
-        if response.status_code != 200:
-            raise TranscriptionError(f"Upload failed: {response.text}")
+    async for chunk in iter_file(audio, UPLOAD_CHUNK_SIZE):
+        yield chunk
+
+
+async def _encode_chunks(audio: Union[str, bytes], codec: str) -> AsyncIterator[bytes]:
+    """
+    Compress audio with FFmpeg, yielding encoded chunks as they are produced.
+    
+    Files are read by FFmpeg directly; bytes are fed through stdin. Either way
+    the encoded stream is never held in memory as a whole.
+    """
+    from_pipe = isinstance(audio, bytes)
+    process = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", "pipe:0" if from_pipe else audio,
+        *UPLOAD_CODECS[codec], "pipe:1",
+        stdin=asyncio.subprocess.PIPE if from_pipe else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    
+    async def feed():
+        try:
+            async for chunk in _read_chunks(audio):
+                process.stdin.write(chunk)
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # FFmpeg exited early; its stderr says why
+        finally:
+            process.stdin.close()
+    
+    feeder = asyncio.create_task(feed()) if from_pipe else None
+    stderr = asyncio.create_task(process.stderr.read())
+    
+    try:
+        while chunk := await process.stdout.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
         
-        return response.json()["upload_url"]
+        if feeder:
+            await feeder
+        if await process.wait() != 0:
+            raise TranscriptionError(f"Audio encoding failed: {(await stderr).decode(errors='replace')}")
+    finally:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        if feeder:
+            feeder.cancel()
+        stderr.cancel()
+
+
+# Header AssemblyAI echoes back on webhook calls, so the route can authenticate them
+WEBHOOK_AUTH_HEADER = "X-CaptionCraft-Webhook"
+
+# Transcripts being waited on, set by the webhook route when AssemblyAI is done
+transcript_events: dict[str, asyncio.Event] = {}
+
+
+def notify_transcript(transcript_id: str) -> bool:
+    """Wake the job waiting on a transcript. Returns False for unknown IDs."""
+    event = transcript_events.get(transcript_id)
+    if event is None:
+        return False
+    event.set()
+    return True
+
+
+def poll_delays(audio_duration: Optional[float] = None) -> Iterator[float]:
+    """
+    Seconds to wait between transcript status checks.
+
+    The first wait is sized to when the transcript is likely ready (a fraction
+    of the audio duration); after that the interval backs off geometrically.
+    With webhooks configured polling is only a safety net, so every wait is the
+    maximum interval. Each delay gets +/-20% jitter so jobs started together
+    don't poll in lockstep.
+    """
+    settings = get_settings()
+    min_interval = settings.assemblyai_poll_min_interval
+    max_interval = settings.assemblyai_poll_max_interval
+
+    def jitter(delay: float) -> float:
+        return delay * random.uniform(0.8, 1.2)
+
+    if settings.assemblyai_webhook_url:
+        while True:
+            yield jitter(max_interval)
+
+    if audio_duration:
+        expected = audio_duration * settings.assemblyai_expected_rtf
+        yield jitter(min(max(expected, min_interval), max_interval))
+
+    delay = min_interval
+    while True:
+        yield jitter(delay)
+        delay = min(delay * 1.5, max_interval)
+
+
+async def upload_audio_to_assemblyai(audio: Union[str, bytes]) -> str:
+    """
+    Upload audio (local file path or WAV bytes) to AssemblyAI and return the upload URL.
+    
+    The body is streamed in chunks, compressed first when
+    `assemblyai_upload_codec` is flac or opus.
+    """
+    settings = get_settings()
+    codec = settings.assemblyai_upload_codec
+    
+    def body():
+        if codec in UPLOAD_CODECS:
+            return _encode_chunks(audio, codec)
+        return _read_chunks(audio)
+    
+    client = get_http_client()
+    response = await get_governor("assemblyai").call(lambda: client.post(
+        f"{assemblyai_base_url()}/upload",
+        headers={"Authorization": settings.assemblyai_api_key},
+        content=body(),
+        timeout=provider_timeout("assemblyai", upload=True),
+    ))
+    
+    if response.status_code != 200:
+        raise TranscriptionError(f"Upload failed: {response.text}")
+    
+    return response.json()["upload_url"]
 
 
 async def start_transcription(
@@ -49,70 +182,104 @@ async def start_transcription(
     if word_boost:
         payload["word_boost"] = word_boost
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{ASSEMBLYAI_BASE_URL}/transcript",
-            headers={
-                "Authorization": settings.assemblyai_api_key,
-                "Content-Type": "application/json",
-            },
-            json=payload,
-            timeout=30.0,
-        )
-        
-        if response.status_code != 200:
-            raise TranscriptionError(f"Failed to start transcription: {response.text}")
-        
-        return response.json()["id"]
+    if settings.assemblyai_webhook_url:
+        payload["webhook_url"] = settings.assemblyai_webhook_url
+        if settings.assemblyai_webhook_secret:
+            payload["webhook_auth_header_name"] = WEBHOOK_AUTH_HEADER
+            payload["webhook_auth_header_value"] = settings.assemblyai_webhook_secret
+    
+    client = get_http_client()
+    response = await get_governor("assemblyai").call(lambda: client.post(
+        f"{assemblyai_base_url()}/transcript",
+        headers={
+            "Authorization": settings.assemblyai_api_key,
+            "Content-Type": "application/json",
+        },
+        json=payload,
+        timeout=provider_timeout("assemblyai"),
+    ))
+    
+    if response.status_code != 200:
+        raise TranscriptionError(f"Failed to start transcription: {response.text}")
+    
+    transcript_id = response.json()["id"]
+    # Register before returning so an early webhook isn't missed
+    transcript_events[transcript_id] = asyncio.Event()
+    
+    return transcript_id
+
+
+async def poll_transcription(transcript_id: str, audio_duration: Optional[float] = None) -> dict:
+    """
+    Wait for transcription completion.
+    
+    Wakes on the webhook when one arrives, otherwise checks status on the
+    adaptive `poll_delays` schedule.
+    """
+    event = transcript_events.setdefault(transcript_id, asyncio.Event())
+    delays = poll_delays(audio_duration)
+    
+    try:
+        return await _wait_for_transcript(transcript_id, event, delays)
+    finally:
+        transcript_events.pop(transcript_id, None)
 
 
-async def poll_transcription(transcript_id: str, poll_interval: float = 3.0) -> dict:
-    """Poll for transcription completion."""
+async def _wait_for_transcript(
+    transcript_id: str,
+    event: asyncio.Event,
+    delays: Iterator[float],
+) -> dict:
     settings = get_settings()
     
-    async with httpx.AsyncClient() as client:
-        while True:
-            response = await client.get(
-                f"{ASSEMBLYAI_BASE_URL}/transcript/{transcript_id}",
-                headers={"Authorization": settings.assemblyai_api_key},
-                timeout=30.0,
-            )
-            
-            if response.status_code != 200:
-                raise TranscriptionError(f"Failed to get transcript: {response.text}")
-            
-            result = response.json()
-            status = result["status"]
-            
-            if status == "completed":
-                return result
-            elif status == "error":
-                raise TranscriptionError(f"Transcription failed: {result.get('error', 'Unknown error')}")
-            
-            # Still processing, wait and poll again
-            await asyncio.sleep(poll_interval)
+    client = get_http_client()
+    while True:
+        response = await get_governor("assemblyai").call(lambda: client.get(
+            f"{assemblyai_base_url()}/transcript/{transcript_id}",
+            headers={"Authorization": settings.assemblyai_api_key},
+            timeout=provider_timeout("assemblyai"),
+        ))
+        
+        if response.status_code != 200:
+            raise TranscriptionError(f"Failed to get transcript: {response.text}")
+        
+        result = response.json()
+        status = result["status"]
+        
+        if status == "completed":
+            return result
+        elif status == "error":
+            raise TranscriptionError(f"Transcription failed: {result.get('error', 'Unknown error')}")
+        
+        # Still processing, wait for the webhook or the next poll
+        try:
+            await asyncio.wait_for(event.wait(), timeout=next(delays))
+        except asyncio.TimeoutError:
+            pass
+        event.clear()
 
 
 async def transcribe_audio(
-    audio_path: str,
+    audio: Union[str, bytes],
     language: str = "en",
     word_boost: Optional[List[str]] = None,
+    audio_duration: Optional[float] = None,
 ) -> TranscriptResult:
     """
-    Complete transcription pipeline:
+    Complete transcription pipeline (audio is a file path or WAV bytes):
     1. Upload audio to AssemblyAI
     2. Start transcription
     3. Poll for completion
     4. Return structured result with word timings
     """
     # Step 1: Upload audio
-    upload_url = await upload_audio_to_assemblyai(audio_path)
+    upload_url = await upload_audio_to_assemblyai(audio)
     
     # Step 2: Start transcription
     transcript_id = await start_transcription(upload_url, language, word_boost)
     
-    # Step 3: Poll for completion
-    result = await poll_transcription(transcript_id)
+    # Step 3: Wait for completion
+    result = await poll_transcription(transcript_id, audio_duration)
     
     # Step 4: Parse words
     words = []
@@ -135,13 +302,14 @@ async def transcribe_from_url(
     audio_url: str,
     language: str = "en",
     word_boost: Optional[List[str]] = None,
+    audio_duration: Optional[float] = None,
 ) -> TranscriptResult:
     """Transcribe audio from a URL (e.g., R2 presigned URL)."""
     # Start transcription directly with URL
     transcript_id = await start_transcription(audio_url, language, word_boost)
     
-    # Poll for completion
-    result = await poll_transcription(transcript_id)
+    # Wait for completion
+    result = await poll_transcription(transcript_id, audio_duration)
     
     # Parse words
     words = []
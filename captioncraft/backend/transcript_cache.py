@@ -0,0 +1,136 @@
+"""Content-addressed on-disk cache for transcription results."""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Optional
+
+from config import get_settings
+from models import TranscriptResult
+
+
+class TranscriptCache:
+    """
+    LRU cache of serialized TranscriptResults, bounded by total size on disk.
+
+    Entries are keyed by a hash of the extracted audio plus provider and
+    language, so re-running the same video with a different caption style
+    skips the transcription round trip entirely.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total_bytes = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(audio: bytes, provider: str, language: str) -> str:
+        """Cache key for a given audio payload, provider and language."""
+        digest = hashlib.sha256()
+        digest.update(f"{provider}\0{language}\0".encode("utf-8"))
+        digest.update(audio)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times."""
+        found = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            stat = os.stat(os.path.join(self.cache_dir, name))
+            found.append((stat.st_mtime, name[:-5], stat.st_size))
+
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def get(self, key: str) -> Optional[TranscriptResult]:
+        """Return the cached transcript, or None on a miss."""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                transcript = TranscriptResult.model_validate_json(f.read())
+            os.utime(path)  # Keep LRU order across restarts
+        except (OSError, ValueError):
+            # Missing or corrupt entry: drop it and treat as a miss
+            with self._lock:
+                self._discard(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return transcript
+
+    def put(self, key: str, transcript: TranscriptResult):
+        """Store a transcript and evict least-recently-used entries over the size limit."""
+        data = transcript.model_dump_json().encode("utf-8")
+        path = self._path(key)
+
+        # A temp file per writer: jobs with the same audio may store it at once
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = len(data)
+            self._total_bytes += len(data)
+
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                try:
+                    os.remove(self._path(oldest))
+                except OSError:
+                    pass
+
+    def _discard(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "size_bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+@lru_cache()
+def get_transcript_cache() -> TranscriptCache:
+    settings = get_settings()
+    return TranscriptCache(
+        cache_dir=settings.transcript_cache_dir,
+        max_bytes=settings.transcript_cache_max_mb * 1024 * 1024,
+    )
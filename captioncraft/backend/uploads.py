@@ -0,0 +1,172 @@
+"""Resumable chunked uploads: create a session, PUT byte ranges, finalize."""
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from config import get_settings
+from offload import run_io
+
+
+class UploadError(Exception):
+    """Error during a resumable upload."""
+    pass
+
+
+class UploadNotFoundError(UploadError):
+    """No such upload session."""
+    pass
+
+
+class UploadTooLargeError(UploadError):
+    """Declared or received size exceeds the limit."""
+    pass
+
+
+class UploadOffsetError(UploadError):
+    """A chunk does not continue from the received offset."""
+
+    def __init__(self, message: str, received: int):
+        super().__init__(message)
+        self.received = received
+
+
+class UploadSession:
+    """State of one resumable upload. Size is tracked in memory, never stat'ed."""
+
+    def __init__(self, filename: str, content_type: str, size: int):
+        settings = get_settings()
+
+        self.session_id = str(uuid.uuid4())
+        self.video_id = str(uuid.uuid4())
+        self.content_type = content_type
+        self.size = size
+        self.received = 0
+        self.created_at = datetime.utcnow()
+        self.updated_at = self.created_at
+        self.final_path = os.path.join(
+            settings.temp_dir,
+            f"{self.video_id}{Path(filename).suffix or '.mp4'}",
+        )
+        self.part_path = f"{self.final_path}.part"
+        self.lock = asyncio.Lock()
+
+    @property
+    def complete(self) -> bool:
+        return self.received == self.size
+
+    def to_dict(self) -> dict:
+        return {
+            "session_id": self.session_id,
+            "video_id": self.video_id,
+            "size": self.size,
+            "received": self.received,
+            "complete": self.complete,
+        }
+
+
+# In-memory session storage (use Redis in production)
+sessions: dict[str, UploadSession] = {}
+
+
+def max_upload_bytes() -> int:
+    return get_settings().max_file_size_mb * 1024 * 1024
+
+
+async def create_session(filename: str, content_type: str, size: int) -> UploadSession:
+    """Start a resumable upload, rejecting it up front if the declared size is too large."""
+    if size > max_upload_bytes():
+        raise UploadTooLargeError(
+            f"File too large. Max size: {get_settings().max_file_size_mb}MB"
+        )
+
+    expire_sessions()
+
+    session = UploadSession(filename, content_type, size)
+    # Pre-create the part file so every chunk can be written at its offset
+    f = await run_io(open, session.part_path, "wb")
+    await run_io(f.close)
+    sessions[session.session_id] = session
+    return session
+
+
+def get_session(session_id: str) -> UploadSession:
+    session = sessions.get(session_id)
+    if not session:
+        raise UploadNotFoundError("Upload session not found")
+    return session
+
+
+async def write_chunk(
+    session_id: str,
+    offset: int,
+    chunks: AsyncIterator[bytes],
+) -> UploadSession:
+    """
+    Write a streamed byte range starting at `offset`.
+
+    The offset may repeat bytes already received (a client resending after a
+    dropped connection) but may not leave a gap. Progress is recorded as each
+    piece is written, so an interrupted request still advances the offset.
+    """
+    session = get_session(session_id)
+
+    async with session.lock:
+        if offset < 0:
+            raise UploadOffsetError(f"Offset {offset} is negative", session.received)
+        if offset > session.received:
+            raise UploadOffsetError(
+                f"Offset {offset} is past the received offset {session.received}",
+                session.received,
+            )
+
+        position = offset
+        f = await run_io(open, session.part_path, "r+b")
+        try:
+            f.seek(position)
+            async for chunk in chunks:
+                if position + len(chunk) > session.size:
+                    raise UploadTooLargeError(
+                        f"Chunk exceeds declared size of {session.size} bytes"
+                    )
+                await run_io(f.write, chunk)
+                position += len(chunk)
+                session.received = max(session.received, position)
+                session.updated_at = datetime.utcnow()
+        finally:
+            await run_io(f.close)
+
+    return session
+
+
+def finalize_session(session_id: str) -> UploadSession:
+    """Move a fully received upload into place for processing."""
+    session = get_session(session_id)
+
+    if not session.complete:
+        raise UploadError(
+            f"Upload incomplete: received {session.received} of {session.size} bytes"
+        )
+
+    os.replace(session.part_path, session.final_path)
+    del sessions[session_id]
+    return session
+
+
+def delete_session(session_id: str):
+    """Abort an upload and remove its partial data."""
+    session = sessions.pop(session_id, None)
+    if session and os.path.exists(session.part_path):
+        os.remove(session.part_path)
+
+
+def expire_sessions(now: Optional[datetime] = None):
+    """Drop sessions idle for longer than the cleanup window."""
+    now = now or datetime.utcnow()
+    max_idle = timedelta(hours=get_settings().cleanup_after_hours)
+
+    for session_id, session in list(sessions.items()):
+        if now - session.updated_at > max_idle:
+            delete_session(session_id)
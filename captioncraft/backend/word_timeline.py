@@ -0,0 +1,147 @@
+"""Compact word-level transcript: NumPy timing columns and interned text."""
+import sys
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from models import Word
+
+
+class WordTimeline:
+    """
+    Word-level timings stored column-wise.
+
+    Start/end times (ms) are int32 arrays and confidences float32. Each
+    word's text is an index into a vocabulary of distinct strings, so a
+    transcript costs about 12 bytes per word plus its distinct words, and
+    text rewrites (corrections, transliteration) run once per distinct word.
+    Convert to Word lists only at the API boundary.
+    """
+
+    __slots__ = ("start", "end", "confidence", "text_ids", "vocabulary")
+
+    def __init__(
+        self,
+        start: np.ndarray,
+        end: np.ndarray,
+        confidence: np.ndarray,
+        text_ids: np.ndarray,
+        vocabulary: List[str],
+    ):
+        self.start = np.asarray(start, dtype=np.int32)
+        self.end = np.asarray(end, dtype=np.int32)
+        self.confidence = np.asarray(confidence, dtype=np.float32)
+        self.text_ids = np.asarray(text_ids, dtype=np.int32)
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_words(cls, words: Iterable[Word]) -> "WordTimeline":
+        index: dict[str, int] = {}
+        vocabulary, text_ids, starts, ends, confidences = [], [], [], [], []
+        for word in words:
+            text_id = index.get(word.text)
+            if text_id is None:
+                text_id = index[word.text] = len(vocabulary)
+                vocabulary.append(sys.intern(word.text))
+            text_ids.append(text_id)
+            starts.append(word.start)
+            ends.append(word.end)
+            confidences.append(word.confidence)
+        return cls(starts, ends, confidences, text_ids, vocabulary)
+
+    def __len__(self) -> int:
+        return len(self.text_ids)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WordTimeline):
+            return NotImplemented
+        return (
+            np.array_equal(self.start, other.start)
+            and np.array_equal(self.end, other.end)
+            and np.array_equal(self.confidence, other.confidence)
+            and self.texts == other.texts
+        )
+
+    @property
+    def texts(self) -> List[str]:
+        """Text of every word, in order."""
+        return np.array(self.vocabulary, dtype=object)[self.text_ids].tolist()
+
+    def to_words(self) -> List[Word]:
+        # Rounding undoes float32 noise (0.9 -> 0.8999999761...)
+        return [
+            Word(text=text, start=start, end=end, confidence=round(confidence, 6))
+            for text, start, end, confidence in zip(
+                self.texts, self.start.tolist(), self.end.tolist(), self.confidence.tolist()
+            )
+        ]
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the timeline."""
+        arrays = self.start.nbytes + self.end.nbytes + self.confidence.nbytes + self.text_ids.nbytes
+        return arrays + sum(sys.getsizeof(text) for text in self.vocabulary)
+
+    def _replace(self, **columns) -> "WordTimeline":
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(columns)
+        return WordTimeline(**values)
+
+    def map_text(self, convert: Callable[[List[str]], List[str]]) -> "WordTimeline":
+        """
+        Rewrite text with a batch function applied to the vocabulary only.
+
+        `convert` takes and returns a list of strings (e.g.
+        HinglishCorrector.correct_texts). Words that become equal share one
+        vocabulary entry again.
+        """
+        index: dict[str, int] = {}
+        vocabulary = []
+        remap = np.empty(len(self.vocabulary), dtype=np.int32)
+        for old_id, text in enumerate(convert(self.vocabulary)):
+            new_id = index.get(text)
+            if new_id is None:
+                new_id = index[text] = len(vocabulary)
+                vocabulary.append(sys.intern(text))
+            remap[old_id] = new_id
+        return self._replace(text_ids=remap[self.text_ids], vocabulary=vocabulary)
+
+    def shifted(self, offset_ms: int) -> "WordTimeline":
+        """All times moved by `offset_ms` (e.g. a chunk's position in the full audio)."""
+        return self._replace(start=self.start + offset_ms, end=self.end + offset_ms)
+
+    def select(self, which: Union[np.ndarray, slice]) -> "WordTimeline":
+        """Words picked by a boolean mask, index array or slice; the vocabulary is shared."""
+        return self._replace(
+            start=self.start[which],
+            end=self.end[which],
+            confidence=self.confidence[which],
+            text_ids=self.text_ids[which],
+        )
+
+    def between(self, start_ms: int, end_ms: Optional[int] = None) -> "WordTimeline":
+        """Words overlapping [start_ms, end_ms)."""
+        mask = self.end > start_ms
+        if end_ms is not None:
+            mask &= self.start < end_ms
+        return self.select(mask)
+
+    def gaps(self, min_gap_ms: int) -> np.ndarray:
+        """Indices of words followed by a pause of at least `min_gap_ms`."""
+        pauses = self.start[1:].astype(np.int64) - self.end[:-1]
+        return np.flatnonzero(pauses >= min_gap_ms)
+
+    def line_bounds(self, words_per_line: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Start and end (ms) of each line of `words_per_line` consecutive words."""
+        first = np.arange(0, len(self), words_per_line)
+        last = np.minimum(first + words_per_line, len(self)) - 1
+        return self.start[first], self.end[last]
+
+    def line_texts(self, words_per_line: int, lines: Optional[Iterable[int]] = None) -> List[str]:
+        """Text of each line (or of the given line numbers), words joined by spaces."""
+        texts = self.texts
+        if lines is None:
+            lines = range(0, -(-len(texts) // words_per_line))
+        return [
+            " ".join(texts[line * words_per_line:(line + 1) * words_per_line])
+            for line in lines
+        ]